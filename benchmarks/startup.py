@@ -0,0 +1,70 @@
+'''
+Measures the start up cost of every pycoreutils command
+
+For each command this reports the time taken to import it (in a fresh
+interpreter, so nothing is cached) and the wall time of running
+`pycoreutils COMMAND --help`, next to the cost of an empty interpreter.
+
+    $ python benchmarks/startup.py [-n RUNS] [COMMAND ...]
+'''
+from __future__ import print_function
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_TIMER = '''
+import time
+start = time.time()
+import pycoreutils.commands._{}
+print(time.time() - start)
+'''
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def run(args, env):
+    start = time.time()
+    with open(os.devnull, 'w') as devnull:
+        subprocess.check_call(args, env=env, stdout=devnull)
+    return time.time() - start
+
+
+def import_time(name, env):
+    output = subprocess.check_output([sys.executable, '-c', IMPORT_TIMER.format(name)], env=env)
+    return float(output)
+
+
+def main():
+    sys.path.insert(0, ROOT)
+    from pycoreutils.commands import commands
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-n', '--runs', type=int, default=10, help='runs per measurement (default %(default)s)')
+    parser.add_argument('commands', metavar='COMMAND', nargs='*', default=commands)
+    options = parser.parse_args()
+
+    env = dict(os.environ)
+    env['PYTHONPATH'] = ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    cli = [sys.executable, '-c', 'import pycoreutils; pycoreutils.cli()']
+
+    baseline = median([run([sys.executable, '-c', 'pass'], env) for _ in range(options.runs)])
+    print('{:<12} {:>10} {:>10}'.format('command', 'import ms', 'total ms'))
+    print('{:<12} {:>10} {:>10.1f}'.format('(python)', '-', baseline * 1000))
+
+    for name in options.commands:
+        imported = median([import_time(name, env) for _ in range(options.runs)])
+        total = median([run(cli + [name, '--help'], env) for _ in range(options.runs)])
+        print('{:<12} {:>10.1f} {:>10.1f}'.format(name, imported * 1000, total * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,43 @@
-commands = [
-    'base64',
-    'basename',
-    'false',
-    'sha1sum',
-    'sha224sum',
-    'sha256sum',
-    'sha384sum',
-    'sha512sum',
-    'tee',
-    'true',
-    'whoami',
-]
+# This file is generated by `python -m pycoreutils.commands.indexer`, do not edit
+# It maps every command to its short help, so that commands can be listed and
+#  dispatched without importing every one of them.
+
+index = {
+    'b2sum': 'Print or check BLAKE2b checksums',
+    'base64': 'Base64 encode or decode input',
+    'basename': 'Remove leading directory from names',
+    'cat': 'Concatenate files and print on the standard output',
+    'cksum': 'Print or check CRC checksums and byte counts',
+    'comm': 'Compare two sorted files line by line',
+    'cp': 'Copy files and directories',
+    'cut': 'Remove sections from each line of files',
+    'du': 'Estimate file space usage',
+    'false': 'Exit with a failure status code',
+    'hashsum': 'Print checksums using several algorithms',
+    'head': 'Output the first part of files',
+    'join': 'Join lines of two files on a common field',
+    'ls': 'List directory contents',
+    'md5sum': 'Print or check MD5 checksums',
+    'paste': 'Merge lines of files',
+    'seq': 'Print a sequence of numbers',
+    'serve': 'Serve commands from a warm process',
+    'sha1sum': 'Print or check SHA1 checksums',
+    'sha224sum': 'Print or check SHA224 checksums',
+    'sha256sum': 'Print or check SHA256 checksums',
+    'sha384sum': 'Print or check SHA384 checksums',
+    'sha512sum': 'Print or check SHA512 checksums',
+    'shuf': 'Generate random permutations',
+    'sort': 'Sort lines of text files',
+    'split': 'Split a file into pieces',
+    'sum': 'Checksum and count the blocks in a file',
+    'tail': 'Output the last part of files',
+    'tee': 'Copy standard input to each FILE and to...',
+    'tr': 'Translate or delete characters',
+    'true': 'Exit with a successful status code',
+    'uniq': 'Report or omit repeated lines',
+    'wc': 'Print newline, word, and byte counts for each file',
+    'whoami': 'Print the current user',
+    'yes': 'Output a string repeatedly until killed',
+}
+
+commands = sorted(index)
@@ -0,0 +1,68 @@
+import hashlib
+import sys
+
+from ..hasher import Blake2HasherCommand
+from ...utils import BLOCK_SIZE, parse_size
+from ...vendor import click
+
+
+# BLAKE2 stores the leaf size of a tree in 32 bits
+MAX_LEAF_SIZE = 2 ** 32 - 1
+
+
+def check_length(ctx, param, value):
+    if value % 8 != 0 or not 8 <= value <= 512:
+        raise click.BadParameter('the length must be a multiple of 8 between 8 and 512')
+    return value
+
+
+def check_leaf_size(ctx, param, value):
+    if value is None:
+        return None
+    try:
+        size = parse_size(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    if not 1 <= size <= MAX_LEAF_SIZE:
+        raise click.BadParameter('the leaf size must be between 1 and {}'.format(MAX_LEAF_SIZE))
+    return size
+
+
+@click.command(
+    help='Print or check BLAKE2b checksums. With no FILE, or when FILE is -, read standard input. '
+         'With --leaf-size each FILE is hashed as a BLAKE2 tree, whose leaves are hashed on -j threads; '
+         'its checksums only match those of other tree hashes with the same length and leaf size.',
+    short_help='Print or check BLAKE2b checksums',
+)
+@click.help_option('-h', '--help')
+@click.option('-c', '--check', is_flag=True, default=False, help='read BLAKE2b sums from the FILEs and check them')
+@click.option('-l', '--length', metavar='BITS', type=int, default=512, callback=check_length,
+              help='digest length in bits; must not exceed 512 and must be a multiple of 8')
+@click.option('--tag', is_flag=True, default=False, help='Output a BSD-style checksum file')
+@click.option('--quiet', is_flag=True, default=False, help="don't print OK for each successfully verified file")
+@click.option('--status', is_flag=True, default=False, help="don't output anything, status code shows success")
+@click.option('-j', '--jobs', metavar='N', type=click.IntRange(min=1), default=1,
+              help='hash up to N files, or with --leaf-size N leaves, concurrently')
+@click.option('--block-size', metavar='BYTES', type=click.IntRange(min=1), default=BLOCK_SIZE, help='read input BYTES at a time')
+@click.option('--leaf-size', metavar='SIZE', callback=check_leaf_size,
+              help='hash each FILE as a tree with leaves of SIZE bytes (not in GNU b2sum)')
+@click.option('--cache', metavar='FILE', type=click.Path(dir_okay=False), envvar='PYCOREUTILS_CHECKSUM_CACHE',
+              help='reuse checksums of unchanged files stored in FILE when checking')
+@click.option('--no-cache', is_flag=True, default=False, help='do not use a checksum cache, even if one is configured')
+@click.option('--refresh', is_flag=True, default=False, help='rehash every file and update the checksum cache')
+@click.argument('files', metavar='FILE', required=False, nargs=-1, type=click.File('rb'))
+def subcommand(check, length, tag, quiet, status, jobs, block_size, leaf_size, cache, no_cache, refresh, files):
+    if not hasattr(hashlib, 'blake2b'):
+        raise click.UsageError('BLAKE2 requires Python 3.6 or later')
+
+    if len(files) == 0:
+        files = (click.get_binary_stream('stdin'),)
+
+    if no_cache:
+        cache = None
+
+    hasher = Blake2HasherCommand(length, leaf_size, tag, quiet, status, jobs, block_size, cache, refresh)
+    success = hasher.process_files(files, check)
+
+    if not success:
+        sys.exit(1)
@@ -3,16 +3,23 @@ import binascii
 import functools
 import re
 import sys
-import textwrap
 
+try:
+    from math import gcd
+except ImportError:
+    # Python < 3.5
+    from fractions import gcd
+
+from ...utils import BLOCK_SIZE, ordered_imap, read_full_blocks
 from ...vendor import click
 
 
 COMMAND_NAME = 'base64'
 
-# Because every 3 bytes map to 4 base64 bytes, the buffer should be
-#  a multiple of 3. Conveniently, this is also a multiple of 4 for decoding
-BUFSIZE = 3 * 1024
+ALPHABET = b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/='
+
+# Every byte outside of the alphabet, deleted from the input by --ignore-garbage
+GARBAGE = bytes(bytearray(c for c in range(256) if c not in bytearray(ALPHABET)))
 
 
 @click.command(
@@ -21,16 +28,18 @@ BUFSIZE = 3 * 1024
 )
 @click.help_option('-h', '--help')
 @click.option('-d', '--decode', is_flag=True, default=False, help='decode data')
+@click.option('-i', '--ignore-garbage', is_flag=True, default=False, help='when decoding, ignore non-alphabet characters')
 @click.option('-w', '--wrap', metavar='COLS', default=76, help='wrap encoded lines after COLS character (default %(default)s). Use 0 to disable line wrapping')
+@click.option('-j', '--jobs', metavar='N', type=click.IntRange(min=1), default=1, help='encode up to N blocks concurrently')
 @click.argument('file', metavar='FILE', required=False, nargs=1, type=click.File('rb'))
-def subcommand(decode, wrap, file):
+def subcommand(decode, ignore_garbage, wrap, jobs, file):
     if not file:
         file = click.get_binary_stream('stdin')
 
     if decode:
-        decode_base64(file)
+        decode_base64(file, ignore_garbage)
     else:
-        encode_base64(file, wrap)
+        encode_base64(file, wrap, jobs)
 
 
 def _validated_b64decode(b64_buffer):
@@ -43,62 +52,64 @@ def _validated_b64decode(b64_buffer):
         return base64.b64decode(b64_buffer)
 
 
-def decode_base64(fd):
+def decode_base64(fd, ignore_garbage=False):
     """
     Base64 decode the contents of a file
-    """
-    inputbuffer = b''
 
-    for chunk in iter(functools.partial(fd.read, BUFSIZE), b''):
-        inputbuffer += chunk.replace(b'\n', b'')
+    Newlines are always ignored, any other non-alphabet bytes only
+    with `ignore_garbage`
+    """
+    deletechars = GARBAGE if ignore_garbage else b'\n'
+    inputbuffer = bytearray()
 
-        while len(inputbuffer) > BUFSIZE:
-            # Ensure we output a multiple of BUFSIZE b64 bytes
-            b64_to_output = inputbuffer[:BUFSIZE]
-            inputbuffer = inputbuffer[BUFSIZE:]
+    for chunk in iter(functools.partial(fd.read, BLOCK_SIZE), b''):
+        inputbuffer += chunk.translate(None, deletechars)
 
-            # Validate the base64 bytes, convert them to binary
-            # and output them
-            try:
-                click.echo(_validated_b64decode(b64_to_output), nl=False)
-            except (binascii.Error, TypeError):
-                click.echo('{}: invalid input'.format(COMMAND_NAME), err=True)
-                sys.exit(1)
+        # Decode every complete group of 4 base64 bytes. At most 3 bytes are
+        # left behind, so the buffer never grows or gets copied repeatedly
+        num_bytes = len(inputbuffer) // 4 * 4
+        if num_bytes:
+            _echo_decoded(bytes(inputbuffer[:num_bytes]))
+            del inputbuffer[:num_bytes]
 
     if len(inputbuffer) > 0:
         # output any remaining bytes
-        try:
-            click.echo(_validated_b64decode(inputbuffer), nl=False)
-        except (binascii.Error, TypeError):
-            click.echo('{}: invalid input'.format(COMMAND_NAME), err=True)
-            sys.exit(1)
+        _echo_decoded(bytes(inputbuffer))
+
+
+def _echo_decoded(b64_buffer):
+    # Validate the base64 bytes, convert them to binary and output them
+    try:
+        click.echo(_validated_b64decode(b64_buffer), nl=False)
+    except (binascii.Error, TypeError):
+        click.echo('{}: invalid input'.format(COMMAND_NAME), err=True)
+        sys.exit(1)
 
 
-def encode_base64(fd, wrap):
+def encode_base64(fd, wrap, jobs=1):
     """
     Base64 encode the contents of a file
 
     Wrap the results based on `wrap` number of columns
     """
-    outputbuffer = b''
-
-    for chunk in iter(functools.partial(fd.read, BUFSIZE), b''):
-        outputbuffer += base64.b64encode(chunk)
-
-        if wrap <= 0:
-            click.echo(outputbuffer, nl=False)
-            outputbuffer = b''
-        else:
-            # Use as many bytes from the outputbuffer as possible while maintaining
-            # that it is a multiple of `wrap`.
-            num_bytes = wrap * int(len(outputbuffer) / wrap)
-            text = outputbuffer[:num_bytes].decode('ascii')
-            outputbuffer = outputbuffer[num_bytes:]
-
-            # Wrap the results based on `wrap`
-            for line in textwrap.wrap(text, width=wrap):
-                click.echo(line.encode('ascii'))
-
-    if len(outputbuffer) > 0:
-        # print any remaining bytes
-        click.echo(outputbuffer)
+    # Every full block is a multiple of 3 bytes and encodes to a whole number
+    # of lines, so blocks can be encoded and wrapped independently
+    unit = 3
+    if wrap > 0:
+        unit *= wrap // gcd(wrap, 4)
+    block_size = max(unit, BLOCK_SIZE // unit * unit)
+
+    # binascii holds the GIL while it encodes, so blocks are spread over processes
+    encoder = functools.partial(_encode_block, wrap=wrap)
+    for output in ordered_imap(encoder, read_full_blocks(fd, block_size), jobs, processes=True):
+        click.echo(output, nl=False)
+
+
+def _encode_block(block, wrap):
+    encoded = base64.b64encode(block)
+    if wrap <= 0:
+        return encoded
+
+    lines = [encoded[i:i + wrap] for i in range(0, len(encoded), wrap)]
+    lines.append(b'')
+    return b'\n'.join(lines)
@@ -0,0 +1,247 @@
+import errno
+import os
+import re
+import stat
+import sys
+
+from ...utils import read_blocks
+from ...vendor import click
+
+
+COMMAND_NAME = 'cat'
+
+# The most asked of the kernel in one call. Linux copies at most 2G - 4K anyway.
+MAX_CHUNK = 1 << 30
+
+# Errors meaning a system call cannot be used for this pair of files, as
+#  opposed to the copy itself failing
+UNSUPPORTED = frozenset(
+    getattr(errno, name) for name in ('EINVAL', 'ENOSYS', 'EXDEV', 'EBADF', 'EOPNOTSUPP', 'ENOTSUP', 'ETXTBSY', 'ESPIPE')
+    if hasattr(errno, name)
+)
+
+
+@click.command(
+    help='Concatenate FILE(s) to standard output. With no FILE, or when FILE is -, read standard input.',
+    short_help='Concatenate files and print on the standard output',
+)
+@click.help_option('-h', '--help')
+@click.option('-A', '--show-all', is_flag=True, default=False, help='equivalent to -vET')
+@click.option('-b', '--number-nonblank', is_flag=True, default=False, help='number nonempty output lines, overrides -n')
+@click.option('-e', 'show_ends_nonprinting', is_flag=True, default=False, help='equivalent to -vE')
+@click.option('-E', '--show-ends', is_flag=True, default=False, help='display $ at end of each line')
+@click.option('-n', '--number', is_flag=True, default=False, help='number all output lines')
+@click.option('-s', '--squeeze-blank', is_flag=True, default=False, help='suppress repeated empty output lines')
+@click.option('-t', 'show_tabs_nonprinting', is_flag=True, default=False, help='equivalent to -vT')
+@click.option('-T', '--show-tabs', is_flag=True, default=False, help='display TAB characters as ^I')
+@click.option('-u', 'unbuffered', is_flag=True, default=False, help='(ignored)')
+@click.option('-v', '--show-nonprinting', is_flag=True, default=False, help='use ^ and M- notation, except for LFD and TAB')
+@click.argument('files', metavar='FILE', required=False, nargs=-1, type=click.Path(allow_dash=True))
+def subcommand(show_all, number_nonblank, show_ends_nonprinting, show_ends, number, squeeze_blank, show_tabs_nonprinting,
+               show_tabs, unbuffered, show_nonprinting, files):
+    if show_all:
+        show_nonprinting = show_ends = show_tabs = True
+    if show_ends_nonprinting:
+        show_nonprinting = show_ends = True
+    if show_tabs_nonprinting:
+        show_nonprinting = show_tabs = True
+
+    stdout = click.get_binary_stream('stdout')
+    if number or number_nonblank or squeeze_blank or show_ends or show_tabs or show_nonprinting:
+        formatter = LineFormatter(number, number_nonblank, squeeze_blank, show_ends, show_tabs, show_nonprinting)
+    else:
+        formatter = None
+
+    success = True
+    try:
+        for f in files or ('-',):
+            filepath = click.format_filename(f)
+            try:
+                if f == '-':
+                    cat_file(click.get_binary_stream('stdin'), stdout, formatter)
+                else:
+                    with open(f, 'rb') as fd:
+                        cat_file(fd, stdout, formatter)
+            except EnvironmentError as e:
+                if e.errno == errno.EPIPE:
+                    raise
+                click.echo('{}: {}: {}'.format(COMMAND_NAME, filepath, e.strerror), err=True)
+                success = False
+        stdout.flush()
+    except EnvironmentError as e:
+        if e.errno != errno.EPIPE:
+            raise
+        # Behave as if killed by SIGPIPE, like GNU cat
+        success = False
+
+    if not success:
+        sys.exit(1)
+
+
+def cat_file(fd, output, formatter=None):
+    """
+    Copies the rest of the binary file object `fd` to `output`
+
+    Without a `formatter` the kernel copies the data directly where it can,
+    so it never passes through Python objects.
+    """
+    if formatter is not None:
+        output.writelines(formatter.format(iter(fd.readline, b'')))
+        return
+
+    in_fd = _fileno(fd)
+    out_fd = _fileno(output)
+    if in_fd is not None and out_fd is not None:
+        in_st = os.fstat(in_fd)
+        out_st = os.fstat(out_fd)
+        if stat.S_ISREG(out_st.st_mode) and (in_st.st_dev, in_st.st_ino) == (out_st.st_dev, out_st.st_ino):
+            raise IOError(errno.EINVAL, 'input file is output file')
+
+        # Anything still buffered has to go out first
+        output.flush()
+        if copy_fd(in_fd, out_fd, in_st, out_st):
+            return
+
+    for view in read_blocks(fd):
+        if out_fd is None:
+            output.write(view)
+            continue
+
+        # Straight to the descriptor, since Python 2 files refuse memoryviews
+        while view:
+            view = view[os.write(out_fd, view):]
+
+
+def copy_fd(in_fd, out_fd, in_st, out_st):
+    """
+    Copies `in_fd` to `out_fd` from their current positions without going
+    through user space, using whichever system call suits the pair
+
+    Returns False if none of them could be used, leaving the rest of the data
+    to be copied some other way.
+    """
+    in_regular = stat.S_ISREG(in_st.st_mode)
+    out_regular = stat.S_ISREG(out_st.st_mode)
+    in_pipe = stat.S_ISFIFO(in_st.st_mode)
+    out_pipe = stat.S_ISFIFO(out_st.st_mode)
+
+    # Between regular files, the filesystem may share or reflink the extents
+    if in_regular and out_regular and hasattr(os, 'copy_file_range'):
+        if _copy_loop(lambda: os.copy_file_range(in_fd, out_fd, MAX_CHUNK)):
+            return True
+
+    # A pipe on either side lets the kernel move page references around
+    if (in_pipe or out_pipe) and hasattr(os, 'splice'):
+        if _copy_loop(lambda: os.splice(in_fd, out_fd, MAX_CHUNK)):
+            return True
+
+    if in_regular and hasattr(os, 'sendfile'):
+        if _copy_loop(lambda: _sendfile(in_fd, out_fd)):
+            return True
+
+    return False
+
+
+def _sendfile(in_fd, out_fd):
+    # An explicit offset works on every platform, unlike None
+    offset = os.lseek(in_fd, 0, os.SEEK_CUR)
+    sent = os.sendfile(out_fd, in_fd, offset, MAX_CHUNK)
+    os.lseek(in_fd, offset + sent, os.SEEK_SET)
+    return sent
+
+
+def _copy_loop(copy):
+    """
+    Calls `copy` until it returns 0 at the end of the input
+
+    Returns False if the system call turns out not to be usable, after which
+    the file positions still reflect whatever was copied.
+    """
+    while True:
+        try:
+            copied = copy()
+        except OSError as e:
+            if e.errno in UNSUPPORTED:
+                return False
+            if e.errno == errno.EINTR:
+                continue
+            raise
+        if not copied:
+            return True
+
+
+def _fileno(fd):
+    try:
+        return fd.fileno()
+    except (AttributeError, ValueError, EnvironmentError):
+        # eg. BytesIO
+        return None
+
+
+def _nonprinting(byte):
+    """
+    Returns `byte` in ^ and M- notation
+    """
+    prefix = b''
+    if byte >= 128:
+        prefix = b'M-'
+        byte -= 128
+    if byte < 32:
+        return prefix + b'^' + bytearray([byte + 64])
+    if byte == 127:
+        return prefix + b'^?'
+    return prefix + bytearray([byte])
+
+
+class LineFormatter(object):
+    def __init__(self, number=False, number_nonblank=False, squeeze_blank=False, show_ends=False, show_tabs=False,
+                 show_nonprinting=False):
+        """
+        Applies the line oriented options to a stream of lines
+
+        The state carries over from one file to the next, so numbering and
+        squeezing treat all the files as a single stream.
+        """
+        self.number = number or number_nonblank
+        self.number_nonblank = number_nonblank
+        self.squeeze_blank = squeeze_blank
+        self.show_ends = show_ends
+        self.line_number = 0
+        self.at_line_start = True
+        self.previous_blank = False
+
+        escaped = set()
+        if show_tabs:
+            escaped.add(ord('\t'))
+        if show_nonprinting:
+            escaped.update(i for i in range(256) if (i < 32 or i >= 127) and i not in (ord('\t'), ord('\n')))
+
+        self.escapes = None
+        if escaped:
+            self.table = dict((i, bytes(_nonprinting(i))) for i in escaped)
+            pattern = b'[' + b''.join(re.escape(bytes(bytearray([i]))) for i in sorted(escaped)) + b']'
+            self.escapes = re.compile(pattern)
+
+    def format(self, lines):
+        """
+        Yields the formatted version of each of `lines`, the last of which
+        may lack a newline
+        """
+        for line in lines:
+            if self.at_line_start:
+                blank = line == b'\n'
+                if blank and self.previous_blank and self.squeeze_blank:
+                    continue
+                self.previous_blank = blank
+
+                if self.number and not (blank and self.number_nonblank):
+                    self.line_number += 1
+                    yield '{:6d}\t'.format(self.line_number).encode('ascii')
+
+            self.at_line_start = line.endswith(b'\n')
+
+            if self.escapes is not None:
+                line = self.escapes.sub(lambda match: self.table[bytearray(match.group())[0]], line)
+            if self.show_ends and self.at_line_start:
+                line = line[:-1] + b'$\n'
+            yield line
@@ -0,0 +1,161 @@
+import sys
+
+from ...utils import read_records, write_lines
+from ...vendor import click
+
+
+COMMAND_NAME = 'comm'
+
+
+class CommError(Exception):
+    pass
+
+
+@click.command(
+    help='Compare sorted files FILE1 and FILE2 line by line. When FILE1 or FILE2 (not both) is -, read standard input. '
+         'With no options, produce three-column output. Column one contains lines unique to FILE1, '
+         'column two contains lines unique to FILE2, and column three contains lines common to both files.',
+    short_help='Compare two sorted files line by line',
+)
+@click.help_option('-h', '--help')
+@click.option('-1', 'suppress1', is_flag=True, default=False, help='suppress column 1 (lines unique to FILE1)')
+@click.option('-2', 'suppress2', is_flag=True, default=False, help='suppress column 2 (lines unique to FILE2)')
+@click.option('-3', 'suppress3', is_flag=True, default=False, help='suppress column 3 (lines that appear in both files)')
+@click.option('--check-order/--nocheck-order', default=None,
+              help='check that the input is correctly sorted, even if all input lines are pairable, or do not check')
+@click.option('--output-delimiter', metavar='STR', default='\t', help='separate columns with STR')
+@click.option('--total', is_flag=True, default=False, help='output a summary')
+@click.option('-z', '--zero-terminated', is_flag=True, default=False, help='line delimiter is NUL, not newline')
+@click.argument('file1', metavar='FILE1', type=click.Path(dir_okay=False, allow_dash=True))
+@click.argument('file2', metavar='FILE2', type=click.Path(dir_okay=False, allow_dash=True))
+def subcommand(suppress1, suppress2, suppress3, check_order, output_delimiter, total, zero_terminated, file1, file2):
+    if file1 == '-' and file2 == '-':
+        raise click.UsageError('both files cannot be standard input')
+
+    encoding = sys.getfilesystemencoding()
+    delimiter = click.format_filename(output_delimiter).encode(encoding)
+    if not delimiter:
+        # As with GNU comm, an empty delimiter is a NUL byte
+        delimiter = b'\0'
+    separator = b'\0' if zero_terminated else b'\n'
+
+    comparer = Comparer(check_order)
+    shown = (not suppress1, not suppress2, not suppress3)
+    # Each column is indented by a delimiter for every shown column before it
+    prefixes = [delimiter * sum(shown[:column]) for column in range(3)]
+
+    stdout = click.get_binary_stream('stdout')
+    fds = []
+    try:
+        for path in (file1, file2):
+            fds.append(click.get_binary_stream('stdin') if path == '-' else open(path, 'rb'))
+
+        lines = (
+            prefixes[column] + line
+            for column, line in comparer.compare(read_records(fds[0], separator), read_records(fds[1], separator))
+            if shown[column]
+        )
+        write_lines(stdout, lines, separator)
+    except CommError as e:
+        stdout.flush()
+        click.echo('{}: {}'.format(COMMAND_NAME, e), err=True)
+        sys.exit(1)
+    except EnvironmentError as e:
+        stdout.flush()
+        click.echo('{}: {}: {}'.format(COMMAND_NAME, click.format_filename(e.filename or '-'), e.strerror), err=True)
+        sys.exit(1)
+    finally:
+        for path, fd in zip((file1, file2), fds):
+            if path != '-':
+                fd.close()
+
+    if total:
+        counts = [str(count).encode('ascii') for count in comparer.counts]
+        stdout.write(delimiter.join(counts + [b'total']) + separator)
+
+    if comparer.disordered:
+        stdout.flush()
+        for message in comparer.disorders:
+            click.echo('{}: {}'.format(COMMAND_NAME, message), err=True)
+        click.echo('{}: input is not in sorted order'.format(COMMAND_NAME), err=True)
+        sys.exit(1)
+
+
+class Comparer(object):
+    def __init__(self, check_order=None):
+        """
+        Merges two sorted streams of lines
+
+        :param check_order: True to fail on unsorted input, False not to
+                            check, or None to only complain about it if
+                            there are unpairable lines, as GNU comm does
+        """
+        self.check_order = check_order
+        self.counts = [0, 0, 0]
+        self.seen_unpairable = False
+        # Files found out of order, which only matter once a line is unpairable
+        self.disorders = []
+
+    @property
+    def disordered(self):
+        return bool(self.disorders) and self.seen_unpairable
+
+    def checked(self, lines, number):
+        """
+        Yields `lines` of the `number`th file, checking that they are in order
+        """
+        if self.check_order is False:
+            for line in lines:
+                yield line
+            return
+
+        previous = None
+        for line in lines:
+            if previous is not None and line < previous:
+                message = 'file {} is not in sorted order'.format(number)
+                if self.check_order:
+                    raise CommError(message)
+                self.disorders.append(message)
+                # Each file is only reported once
+                yield line
+                for line in lines:
+                    yield line
+                return
+            previous = line
+            yield line
+
+    def compare(self, lines1, lines2):
+        """
+        Yields (column, line) for every line of `lines1` and `lines2`, where
+        column 0 holds lines only in the first, 1 lines only in the second
+        and 2 lines in both
+        """
+        lines1 = self.checked(lines1, 1)
+        lines2 = self.checked(lines2, 2)
+        counts = self.counts
+        line1 = next(lines1, None)
+        line2 = next(lines2, None)
+
+        while line1 is not None and line2 is not None:
+            if line1 < line2:
+                self.seen_unpairable = True
+                counts[0] += 1
+                yield 0, line1
+                line1 = next(lines1, None)
+            elif line1 > line2:
+                self.seen_unpairable = True
+                counts[1] += 1
+                yield 1, line2
+                line2 = next(lines2, None)
+            else:
+                counts[2] += 1
+                yield 2, line1
+                line1 = next(lines1, None)
+                line2 = next(lines2, None)
+
+        for column, line, lines in ((0, line1, lines1), (1, line2, lines2)):
+            while line is not None:
+                self.seen_unpairable = True
+                counts[column] += 1
+                yield column, line
+                line = next(lines, None)
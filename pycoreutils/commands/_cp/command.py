@@ -0,0 +1,510 @@
+import errno
+import os
+import stat
+import sys
+
+from ...utils import BLOCK_SIZE, mode2string, ordered_imap
+from ...vendor import click
+
+
+COMMAND_NAME = 'cp'
+
+SPARSE_MODES = ('auto', 'always', 'never')
+
+# Copying many small files is dominated by system calls that release the GIL,
+#  so a handful of threads overlap them well
+JOBS = 8
+
+# Tasks handed to a worker at a time, so that the pool's own overhead stays
+#  small next to copying small files
+BATCH_SIZE = 64
+
+# The granularity at which --sparse=always looks for runs of zeros
+SPARSE_CHUNK = 64 * 1024
+
+# The most asked of copy_file_range in one call. Linux copies at most 2G - 4K anyway.
+MAX_CHUNK = 1 << 30
+
+# Errors meaning copy_file_range cannot be used for this pair of files, as
+#  opposed to the copy itself failing
+UNSUPPORTED = frozenset(
+    getattr(errno, name) for name in ('EINVAL', 'ENOSYS', 'EXDEV', 'EBADF', 'EOPNOTSUPP', 'ENOTSUP', 'ETXTBSY')
+    if hasattr(errno, name)
+)
+
+
+@click.command(
+    help='Copy SOURCE to DEST, or multiple SOURCE(s) to DIRECTORY.',
+    short_help='Copy files and directories',
+)
+@click.help_option('-h', '--help')
+@click.option('-a', '--archive', is_flag=True, default=False, help='same as -P -R -p')
+@click.option('-P', '--no-dereference', is_flag=True, default=False, help='never follow symbolic links in SOURCE')
+@click.option('-p', '--preserve', is_flag=True, default=False, help='preserve mode, ownership and timestamps')
+@click.option('-r', '-R', '--recursive', is_flag=True, default=False, help='copy directories recursively, copying symbolic links as links')
+@click.option('--sparse', metavar='WHEN', type=click.Choice(SPARSE_MODES), default='auto',
+              help='control creation of sparse files: auto (keep the holes of the source), always (also turn runs of zeros into holes) '
+                   'or never')
+@click.option('-v', '--verbose', is_flag=True, default=False, help='explain what is being done')
+@click.option('-j', '--jobs', metavar='N', type=click.IntRange(min=1), default=JOBS, help='copy up to N files of a directory tree concurrently')
+@click.argument('paths', metavar='SOURCE... DEST', nargs=-1, type=click.Path())
+def subcommand(archive, no_dereference, preserve, recursive, sparse, verbose, jobs, paths):
+    if archive:
+        no_dereference = preserve = recursive = True
+
+    if not paths:
+        raise click.UsageError('missing file operand')
+    if len(paths) == 1:
+        raise click.UsageError("missing destination file operand after '{}'".format(click.format_filename(paths[0])))
+
+    sources = paths[:-1]
+    dest = paths[-1]
+    dest_is_dir = os.path.isdir(dest)
+    if len(sources) > 1 and not dest_is_dir:
+        click.echo("{}: target '{}' is not a directory".format(COMMAND_NAME, click.format_filename(dest)), err=True)
+        sys.exit(1)
+
+    copier = Copier(recursive, preserve, not (recursive or no_dereference), sparse)
+
+    def tasks():
+        for source in sources:
+            if dest_is_dir:
+                target = os.path.join(dest, os.path.basename(source.rstrip(os.sep)) or source)
+            else:
+                target = dest
+            for task in copier.plan(source, target):
+                yield task
+
+    success = True
+    # Directories are created while planning, in order, and everything else
+    #  is copied on the pool. Results come back in the order planned.
+    for results in ordered_imap(copier.copy_batch, batches(tasks(), BATCH_SIZE), jobs):
+        for src, dst, st, error in results:
+            if error is not None:
+                click.echo('{}: {}'.format(COMMAND_NAME, error), err=True)
+                success = False
+            elif verbose:
+                click.echo("'{}' -> '{}' ({})".format(click.format_filename(src), click.format_filename(dst), mode2string(st.st_mode)))
+
+    if not copier.finish():
+        success = False
+
+    if not success:
+        sys.exit(1)
+
+
+class Copier(object):
+    def __init__(self, recursive=False, preserve=False, dereference=True, sparse='auto'):
+        """
+        Copies files and directory trees
+
+        `plan` walks the sources, creating directories as it goes, and yields
+        a task for everything else. `copy` carries out a task and is safe to
+        call from several threads at once. `finish` then applies the
+        directory modes and timestamps, which copying into them would change.
+
+        :param dereference: copy what symbolic links point to rather than the links
+        :param sparse: one of SPARSE_MODES
+        """
+        self.recursive = recursive
+        self.preserve = preserve
+        self.dereference = dereference
+        self.sparse = sparse
+        self.directories = []
+
+        self.umask = os.umask(0)
+        os.umask(self.umask)
+
+    def plan(self, src, dst):
+        """
+        Yields (src, dst, st, error) tasks for `src` and, if it is a
+        directory, everything below it
+
+        `st` is None when the worker should stat the source itself, and
+        `error` is set when planning already failed.
+        """
+        try:
+            st = os.stat(src) if self.dereference else os.lstat(src)
+        except EnvironmentError as e:
+            yield src, dst, None, "cannot stat '{}': {}".format(click.format_filename(src), e.strerror)
+            return
+
+        if not stat.S_ISDIR(st.st_mode):
+            try:
+                if os.path.samefile(src, dst):
+                    yield src, dst, st, "'{}' and '{}' are the same file".format(click.format_filename(src), click.format_filename(dst))
+                    return
+            except EnvironmentError:
+                pass
+            yield src, dst, st, None
+            return
+
+        if not self.recursive:
+            yield src, dst, st, "-r not specified; omitting directory '{}'".format(click.format_filename(src))
+            return
+
+        real_src = os.path.realpath(src)
+        real_dst = os.path.realpath(dst)
+        if real_dst == real_src or real_dst.startswith(real_src.rstrip(os.sep) + os.sep):
+            yield src, dst, st, "cannot copy a directory, '{}', into itself, '{}'".format(click.format_filename(src), click.format_filename(dst))
+            return
+
+        for task in self._plan_directory(src, dst, st):
+            yield task
+
+    def _plan_directory(self, src, dst, st):
+        # Writable while its contents are copied, whatever the final mode
+        created = False
+        try:
+            os.mkdir(dst, stat.S_IMODE(st.st_mode) | stat.S_IRWXU)
+            created = True
+        except EnvironmentError as e:
+            if e.errno != errno.EEXIST or not os.path.isdir(dst):
+                yield src, dst, st, "cannot create directory '{}': {}".format(click.format_filename(dst), e.strerror)
+                return
+
+        self.directories.append((dst, st, created))
+        yield src, dst, st, None
+
+        try:
+            entries = _list_directory(src)
+        except EnvironmentError as e:
+            yield src, dst, st, "cannot access '{}': {}".format(click.format_filename(src), e.strerror)
+            return
+
+        for name, is_dir in entries:
+            child_src = os.path.join(src, name)
+            child_dst = os.path.join(dst, name)
+            if not is_dir:
+                # Stat on the pool, where it overlaps with other copies
+                yield child_src, child_dst, None, None
+                continue
+
+            try:
+                child_st = os.lstat(child_src)
+            except EnvironmentError as e:
+                yield child_src, child_dst, None, "cannot stat '{}': {}".format(click.format_filename(child_src), e.strerror)
+                continue
+            for task in self._plan_directory(child_src, child_dst, child_st):
+                yield task
+
+    def copy(self, task):
+        """
+        Carries out a task from `plan`, returning it with any error set
+        """
+        src, dst, st, error = task
+        if error is not None:
+            return task
+
+        try:
+            if st is None:
+                st = os.lstat(src)
+        except EnvironmentError as e:
+            return src, dst, st, "cannot stat '{}': {}".format(click.format_filename(src), e.strerror)
+
+        try:
+            if stat.S_ISDIR(st.st_mode):
+                # Created by plan already
+                return src, dst, st, None
+            elif stat.S_ISLNK(st.st_mode):
+                self._copy_symlink(src, dst)
+            elif self.recursive and not stat.S_ISREG(st.st_mode):
+                self._copy_special(dst, st)
+            else:
+                self._copy_file(src, dst, st)
+        except CopyError as e:
+            return src, dst, st, str(e)
+
+        return src, dst, st, None
+
+    def copy_batch(self, tasks):
+        return [self.copy(task) for task in tasks]
+
+    def finish(self):
+        """
+        Sets the mode and timestamps of the copied directories, deepest first
+
+        Returns False if any of them could not be set.
+        """
+        success = True
+        for dst, st, created in reversed(self.directories):
+            try:
+                if self.preserve:
+                    self._preserve(dst, st)
+                elif created:
+                    os.chmod(dst, stat.S_IMODE(st.st_mode) & ~self.umask)
+            except CopyError as e:
+                click.echo('{}: {}'.format(COMMAND_NAME, e), err=True)
+                success = False
+            except EnvironmentError as e:
+                click.echo("{}: cannot set permissions of '{}': {}".format(COMMAND_NAME, click.format_filename(dst), e.strerror), err=True)
+                success = False
+        self.directories = []
+        return success
+
+    def _copy_file(self, src, dst, st):
+        try:
+            src_fd = os.open(src, os.O_RDONLY)
+        except EnvironmentError as e:
+            raise CopyError("cannot open '{}' for reading: {}".format(click.format_filename(src), e.strerror))
+
+        try:
+            try:
+                dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, stat.S_IMODE(st.st_mode))
+            except EnvironmentError as e:
+                raise CopyError("cannot create regular file '{}': {}".format(click.format_filename(dst), e.strerror))
+
+            try:
+                copy_data(src_fd, dst_fd, os.fstat(src_fd), self.sparse)
+            except EnvironmentError as e:
+                raise CopyError("error copying '{}' to '{}': {}".format(click.format_filename(src), click.format_filename(dst), e.strerror))
+            finally:
+                os.close(dst_fd)
+        finally:
+            os.close(src_fd)
+
+        if self.preserve:
+            self._preserve(dst, st)
+
+    def _copy_symlink(self, src, dst):
+        try:
+            target = os.readlink(src)
+            if os.path.lexists(dst):
+                os.unlink(dst)
+            os.symlink(target, dst)
+        except EnvironmentError as e:
+            raise CopyError("cannot create symbolic link '{}': {}".format(click.format_filename(dst), e.strerror))
+
+        if self.preserve:
+            self._preserve(dst, os.lstat(src))
+
+    def _copy_special(self, dst, st):
+        try:
+            if stat.S_ISFIFO(st.st_mode):
+                os.mkfifo(dst, stat.S_IMODE(st.st_mode))
+            else:
+                os.mknod(dst, st.st_mode, st.st_rdev)
+        except (AttributeError, EnvironmentError) as e:
+            raise CopyError("cannot create special file '{}': {}".format(click.format_filename(dst), getattr(e, 'strerror', e)))
+
+        if self.preserve:
+            self._preserve(dst, st)
+
+    def _preserve(self, dst, st):
+        """
+        Gives `dst` the ownership, mode and timestamps in `st`
+        """
+        is_link = stat.S_ISLNK(st.st_mode)
+        try:
+            if is_link:
+                if hasattr(os, 'lchown'):
+                    os.lchown(dst, st.st_uid, st.st_gid)
+            else:
+                os.chown(dst, st.st_uid, st.st_gid)
+        except EnvironmentError as e:
+            # Like GNU cp, only root is expected to be able to give files away
+            if e.errno != errno.EPERM:
+                raise CopyError("failed to preserve ownership for '{}': {}".format(click.format_filename(dst), e.strerror))
+
+        try:
+            if not is_link:
+                os.chmod(dst, stat.S_IMODE(st.st_mode))
+            _copy_times(dst, st, is_link)
+        except EnvironmentError as e:
+            raise CopyError("failed to preserve times for '{}': {}".format(click.format_filename(dst), e.strerror))
+
+
+class CopyError(Exception):
+    pass
+
+
+def batches(iterable, size):
+    """
+    Yields lists of up to `size` consecutive items of `iterable`
+    """
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def copy_data(src_fd, dst_fd, st, sparse='auto'):
+    """
+    Copies the contents of `src_fd` to the empty file `dst_fd`
+
+    The data is copied by the kernel where possible. Holes in the source are
+    skipped unless `sparse` is 'never', and with 'always' runs of zeros are
+    turned into holes too.
+
+    Anything but a regular file with a size, such as a pipe or a file of
+    /proc, is read until the end whatever its size says, see `copy_stream`.
+    """
+    if not stat.S_ISREG(st.st_mode) or st.st_size == 0:
+        end = copy_stream(src_fd, dst_fd, holes=sparse == 'always')
+        if sparse == 'always':
+            # A trailing run of zeros was skipped rather than written
+            os.ftruncate(dst_fd, end)
+        return
+
+    if sparse == 'never':
+        regions = [(0, None)]
+    elif sparse == 'always' or _looks_sparse(st):
+        regions = data_regions(src_fd, st.st_size)
+    else:
+        regions = [(0, None)]
+
+    end = 0
+    for start, stop in regions:
+        if sparse == 'always':
+            end = _copy_nonzero(src_fd, dst_fd, start, stop)
+        else:
+            end = _copy_range(src_fd, dst_fd, start, stop)
+
+    # Any trailing hole, or zeros left unwritten, still count towards the size
+    if sparse != 'never':
+        os.ftruncate(dst_fd, max(end, st.st_size))
+
+
+def copy_stream(src_fd, dst_fd, holes=False):
+    """
+    Copies `src_fd` from its current position until the end of file to
+    `dst_fd`, without seeking in the source, returning how much was copied
+
+    With `holes`, a whole SPARSE_CHUNK of zeros is skipped over in `dst_fd`
+    rather than written, leaving a hole.
+    """
+    zeros = b'\0' * SPARSE_CHUNK
+    copied = 0
+    while True:
+        data = os.read(src_fd, SPARSE_CHUNK if holes else BLOCK_SIZE)
+        if not data:
+            return copied
+        if holes and data == zeros[:len(data)]:
+            os.lseek(dst_fd, len(data), os.SEEK_CUR)
+        else:
+            _write_all(dst_fd, data)
+        copied += len(data)
+
+
+def data_regions(fd, size):
+    """
+    Yields the (start, stop) offsets of the parts of `fd` that are not holes
+
+    Where the platform cannot tell, the whole file is one region.
+    """
+    if not hasattr(os, 'SEEK_DATA'):
+        yield 0, size
+        return
+
+    offset = 0
+    while offset < size:
+        try:
+            start = os.lseek(fd, offset, os.SEEK_DATA)
+        except EnvironmentError as e:
+            if e.errno == errno.ENXIO:
+                # Only a hole is left
+                return
+            if offset == 0:
+                # Not supported by the filesystem
+                yield 0, size
+                return
+            raise
+        stop = os.lseek(fd, start, os.SEEK_HOLE)
+        yield start, stop
+        offset = stop
+
+
+def _looks_sparse(st):
+    # Fewer blocks than the size needs means there are holes
+    return hasattr(st, 'st_blocks') and st.st_blocks * 512 < st.st_size
+
+
+def _copy_range(src_fd, dst_fd, start, stop):
+    """
+    Copies `src_fd` from `start` to `stop` (or the end, if None) to the same
+    offsets of `dst_fd`, returning the offset reached
+    """
+    offset = start
+    if hasattr(os, 'copy_file_range'):
+        while stop is None or offset < stop:
+            count = MAX_CHUNK if stop is None else min(MAX_CHUNK, stop - offset)
+            try:
+                copied = os.copy_file_range(src_fd, dst_fd, count, offset, offset)
+            except OSError as e:
+                if e.errno in UNSUPPORTED:
+                    break
+                if e.errno == errno.EINTR:
+                    continue
+                raise
+            if not copied:
+                return offset
+            offset += copied
+        else:
+            return offset
+
+    # Read and write whatever copy_file_range did not
+    os.lseek(src_fd, offset, os.SEEK_SET)
+    os.lseek(dst_fd, offset, os.SEEK_SET)
+    while stop is None or offset < stop:
+        data = os.read(src_fd, BLOCK_SIZE if stop is None else min(BLOCK_SIZE, stop - offset))
+        if not data:
+            break
+        _write_all(dst_fd, data)
+        offset += len(data)
+    return offset
+
+
+def _copy_nonzero(src_fd, dst_fd, start, stop):
+    """
+    Like `_copy_range`, but leaves a hole wherever a whole SPARSE_CHUNK of
+    the source is zeros
+    """
+    zeros = b'\0' * SPARSE_CHUNK
+    offset = start
+    os.lseek(src_fd, offset, os.SEEK_SET)
+    while offset < stop:
+        data = os.read(src_fd, min(SPARSE_CHUNK, stop - offset))
+        if not data:
+            break
+        if data != zeros[:len(data)]:
+            os.lseek(dst_fd, offset, os.SEEK_SET)
+            _write_all(dst_fd, data)
+        offset += len(data)
+    return offset
+
+
+def _write_all(fd, data):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _copy_times(path, st, is_link=False):
+    if is_link:
+        # Not every platform can set the times of a link itself
+        if getattr(os, 'supports_follow_symlinks', None) is None or os.utime not in os.supports_follow_symlinks:
+            return
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns), follow_symlinks=False)
+    elif hasattr(st, 'st_mtime_ns'):
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    else:
+        os.utime(path, (st.st_atime, st.st_mtime))
+
+
+def _list_directory(path):
+    """
+    Returns the sorted (name, is_dir) of the entries of `path`, without
+    following symbolic links
+
+    scandir gets the types from the directory itself, so the files need no
+    separate stat.
+    """
+    if hasattr(os, 'scandir'):
+        entries = [(entry.name, entry.is_dir(follow_symlinks=False)) for entry in os.scandir(path)]
+    else:
+        entries = [(name, stat.S_ISDIR(os.lstat(os.path.join(path, name)).st_mode)) for name in os.listdir(path)]
+    return sorted(entries)
@@ -0,0 +1,224 @@
+import functools
+import re
+import sys
+
+from ...utils import BLOCK_SIZE
+from ...vendor import click
+
+
+COMMAND_NAME = 'cut'
+
+RANGE_REGEX = re.compile(r'^(\d*)(-?)(\d*)$')
+
+
+@click.command(
+    help='Print selected parts of lines from each FILE to standard output. With no FILE, or when FILE is -, read standard input. '
+         'LIST is made up of one or more ranges separated by commas, each one of N, N-, N-M or -M, counted from 1. '
+         'Lines are split as bytes, so -c selects the same as -b.',
+    short_help='Remove sections from each line of files',
+)
+@click.help_option('-h', '--help')
+@click.option('-b', '--bytes', 'byte_list', metavar='LIST', help='select only these bytes')
+@click.option('-c', '--characters', 'character_list', metavar='LIST', help='select only these characters')
+@click.option('-f', '--fields', 'field_list', metavar='LIST',
+              help='select only these fields; also print any line that contains no delimiter character, unless the -s option is specified')
+@click.option('-d', '--delimiter', metavar='DELIM', help='use DELIM instead of TAB for field delimiter')
+@click.option('-n', 'ignored', is_flag=True, default=False, help='(ignored)')
+@click.option('--complement', is_flag=True, default=False, help='complement the set of selected bytes, characters or fields')
+@click.option('-s', '--only-delimited', is_flag=True, default=False, help='do not print lines not containing delimiters')
+@click.option('--output-delimiter', metavar='STRING', help='use STRING as the output delimiter; the default is to use the input delimiter')
+@click.argument('files', metavar='FILE', required=False, nargs=-1, type=click.Path(dir_okay=False, allow_dash=True))
+def subcommand(byte_list, character_list, field_list, delimiter, ignored, complement, only_delimited, output_delimiter, files):
+    lists = [value for value in (byte_list, character_list, field_list) if value is not None]
+    if not lists:
+        raise click.UsageError('you must specify a list of bytes, characters, or fields')
+    if len(lists) > 1:
+        raise click.UsageError('only one list may be specified')
+    if field_list is None:
+        if delimiter is not None:
+            raise click.UsageError('an input delimiter may be specified only when operating on fields')
+        if only_delimited:
+            raise click.UsageError('suppressing non-delimited lines makes sense only when operating on fields')
+
+    encoding = sys.getfilesystemencoding()
+    ranges = parse_list(lists[0], 'fields' if field_list is not None else 'byte/character positions')
+    if complement:
+        ranges = complement_ranges(ranges)
+    if output_delimiter is not None:
+        output_delimiter = click.format_filename(output_delimiter).encode(encoding)
+
+    if field_list is not None:
+        if delimiter is None:
+            delimiter = b'\t'
+        else:
+            delimiter = click.format_filename(delimiter).encode(encoding)
+            if len(delimiter) != 1:
+                raise click.BadParameter('the delimiter must be a single character', param_hint='"-d"')
+        cutter = FieldCutter(ranges, delimiter, output_delimiter, only_delimited)
+    else:
+        cutter = ByteCutter(ranges, output_delimiter)
+
+    stdout = click.get_binary_stream('stdout')
+    success = True
+    for path in files or ('-',):
+        try:
+            if path == '-':
+                stdout.writelines(cutter.cut(click.get_binary_stream('stdin')))
+            else:
+                with open(path, 'rb') as fd:
+                    stdout.writelines(cutter.cut(fd))
+        except IOError as e:
+            click.echo('{}: {}: {}'.format(COMMAND_NAME, click.format_filename(path), e.strerror), err=True)
+            success = False
+
+    if not success:
+        sys.exit(1)
+
+
+def parse_list(value, kind):
+    """
+    Parses a LIST into sorted (start, end) ranges of zero based slice indexes
+
+    Overlapping ranges are merged. An end of None means the end of the line.
+    """
+    ranges = []
+    for part in value.split(','):
+        match = RANGE_REGEX.match(part)
+        if part == '-':
+            raise click.UsageError('invalid range with no endpoint: -')
+        if not match or not (match.group(1) or match.group(3)):
+            raise click.UsageError("invalid {} '{}'".format('field value' if kind == 'fields' else 'byte/character position', part))
+
+        first, dash, last = match.groups()
+        start = int(first) if first else 1
+        end = int(last) if last else (None if dash else start)
+        if start == 0 or end == 0:
+            raise click.UsageError('{} are numbered from 1'.format(kind))
+        if end is not None and end < start:
+            raise click.UsageError('invalid decreasing range')
+        ranges.append((start - 1, end))
+
+    ranges.sort(key=lambda r: r[0])
+    merged = [ranges[0]]
+    for start, end in ranges[1:]:
+        previous_start, previous_end = merged[-1]
+        if previous_end is None or start < previous_end:
+            if previous_end is not None and (end is None or end > previous_end):
+                merged[-1] = (previous_start, end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def complement_ranges(ranges):
+    """
+    Returns the ranges covering everything not covered by `ranges`
+
+    >>> complement_ranges([(1, 3), (5, None)])
+    [(0, 1), (3, 5)]
+    """
+    complement = []
+    position = 0
+    for start, end in ranges:
+        if start > position:
+            complement.append((position, start))
+        position = end
+        if position is None:
+            return complement
+    complement.append((position, None))
+    return complement
+
+
+class ByteCutter(object):
+    def __init__(self, ranges, output_delimiter=None):
+        """
+        Selects byte ranges of each line
+
+        :param ranges: sorted ranges as returned by `parse_list`
+        :param output_delimiter: bytes written between ranges, or None for nothing
+        """
+        self.slices = [slice(start, end) for start, end in ranges]
+        self.output_delimiter = output_delimiter or b''
+
+    def cut(self, fd):
+        """
+        Yields the selected parts of lines of `fd` in chunks, each line with a newline
+        """
+        slices = self.slices
+        output_delimiter = self.output_delimiter
+        only = slices[0] if len(slices) == 1 else None
+
+        for lines in line_batches(fd):
+            if only is not None:
+                selected = [line.rstrip(b'\n')[only] for line in lines]
+            else:
+                selected = []
+                for line in lines:
+                    line = line.rstrip(b'\n')
+                    selected.append(output_delimiter.join([part for part in [line[s] for s in slices] if part]))
+            yield b'\n'.join(selected) + b'\n'
+
+
+class FieldCutter(object):
+    def __init__(self, ranges, delimiter=b'\t', output_delimiter=None, only_delimited=False):
+        """
+        Selects fields of each line, splitting on the byte `delimiter`
+
+        Lines are split with `bytes.split`, no further than the last selected
+        field, and never decoded.
+
+        :param ranges: sorted ranges as returned by `parse_list`
+        :param output_delimiter: bytes written between fields, by default `delimiter`
+        :param only_delimited: drop lines without any delimiter, rather than printing them whole
+        """
+        self.slices = [slice(start, end) for start, end in ranges]
+        self.delimiter = delimiter
+        self.output_delimiter = delimiter if output_delimiter is None else output_delimiter
+        self.only_delimited = only_delimited
+
+        # A line split this many times has every selected field as a part of its own.
+        #  With no fields selected, as with --complement of everything, a line is
+        #  still split once to tell whether it has a delimiter at all.
+        last = ranges[-1][1] if ranges else 1
+        self.max_split = -1 if last is None else last
+
+    def cut(self, fd):
+        """
+        Yields the selected fields of lines of `fd` in chunks, each line with a newline
+        """
+        delimiter = self.delimiter
+        output_delimiter = self.output_delimiter
+        only_delimited = self.only_delimited
+        max_split = self.max_split
+        slices = self.slices
+        only = slices[0] if len(slices) == 1 else None
+
+        for lines in line_batches(fd):
+            selected = []
+            append = selected.append
+            for line in lines:
+                line = line.rstrip(b'\n')
+                fields = line.split(delimiter, max_split)
+                if len(fields) == 1:
+                    if not only_delimited:
+                        append(line)
+                elif only is not None:
+                    append(output_delimiter.join(fields[only]))
+                else:
+                    chosen = []
+                    for s in slices:
+                        chosen.extend(fields[s])
+                    append(output_delimiter.join(chosen))
+
+            if selected:
+                yield b'\n'.join(selected) + b'\n'
+
+
+def line_batches(fd, size=BLOCK_SIZE):
+    """
+    Yields lists of the lines of `fd`, about `size` bytes at a time
+
+    Whole batches are cut and written at once, which saves a write per line
+    when the output is unbuffered.
+    """
+    return iter(functools.partial(fd.readlines, size), [])
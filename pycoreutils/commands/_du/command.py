@@ -0,0 +1,296 @@
+import array
+import bisect
+import collections
+import heapq
+import os
+import stat
+import sys
+
+from ...utils import ReadyResult, human_size
+from ...vendor import click
+
+
+COMMAND_NAME = 'du'
+
+# Directories scanned concurrently. On network filesystems the walk waits on
+#  stat far more than it computes, and stat releases the GIL.
+JOBS = 8
+
+# Subdirectories of each directory on the current path that are scanned ahead
+#  of being reached, per job
+LOOKAHEAD = 4
+
+# Inodes kept in a plain set before they are moved into a sorted array
+PENDING_INODES = 64 * 1024
+
+try:
+    array.array('Q')
+    INODE_TYPECODE = 'Q'
+except ValueError:
+    # Python 2, where an unsigned long is 64 bits on the platforms with inodes that large
+    INODE_TYPECODE = 'L'
+
+
+class InodeSet(object):
+    def __init__(self):
+        """
+        A set of (dev, ino) pairs taking about 8 bytes per inode
+
+        New inodes go into a small set. When that fills up it is sorted into
+        an array, and arrays of similar size are merged, so there are only
+        ever a logarithmic number of them to binary search.
+        """
+        self.devices = {}
+
+    def add(self, dev, ino):
+        """
+        Adds (dev, ino), returning False if it was already present
+        """
+        pending, runs = self.devices.setdefault(dev, (set(), []))
+        if ino in pending:
+            return False
+        for run in runs:
+            index = bisect.bisect_left(run, ino)
+            if index < len(run) and run[index] == ino:
+                return False
+
+        pending.add(ino)
+        if len(pending) >= PENDING_INODES:
+            run = array.array(INODE_TYPECODE, sorted(pending))
+            pending.clear()
+            while runs and len(runs[-1]) <= len(run):
+                # Merged straight into a new array, never as a list of ints
+                run = array.array(INODE_TYPECODE, heapq.merge(runs.pop(), run))
+            runs.append(run)
+        return True
+
+    def __len__(self):
+        return sum(len(pending) + sum(len(run) for run in runs) for pending, runs in self.devices.values())
+
+
+class Frame(object):
+    __slots__ = ('path', 'depth', 'entries', 'index', 'total', 'subdirectories', 'ahead')
+
+    def __init__(self, path, depth, entries, total):
+        """
+        A directory being totalled, whose entries are visited in order
+        """
+        self.path = path
+        self.depth = depth
+        self.entries = entries
+        self.index = 0
+        self.total = total
+        self.subdirectories = None
+        self.ahead = collections.deque()
+
+
+@click.command(
+    help='Summarize disk usage of the set of FILEs, recursively for directories. Sizes are in units of 1024 bytes.',
+    short_help='Estimate file space usage',
+)
+@click.help_option('--help')
+@click.option('-a', '--all', 'all_files', is_flag=True, default=False, help='write counts for all files, not just directories')
+@click.option('--apparent-size', is_flag=True, default=False, help='print apparent sizes, rather than disk usage')
+@click.option('-b', '--bytes', 'in_bytes', is_flag=True, default=False, help='equivalent to --apparent-size, counting bytes')
+@click.option('-c', '--total', is_flag=True, default=False, help='produce a grand total')
+@click.option('-d', '--max-depth', metavar='N', type=click.IntRange(min=0),
+              help='print the total for a directory only if it is N or fewer levels below the command line argument')
+@click.option('-h', '--human-readable', is_flag=True, default=False, help='print sizes in human readable format (e.g., 1K 234M 2G)')
+@click.option('-s', '--summarize', is_flag=True, default=False, help='display only a total for each argument')
+@click.option('-x', '--one-file-system', is_flag=True, default=False, help='skip directories on different file systems')
+@click.option('-j', '--jobs', metavar='N', type=click.IntRange(min=1), default=JOBS, help='scan up to N directories concurrently')
+@click.argument('files', metavar='FILE', required=False, nargs=-1, type=click.Path())
+def subcommand(all_files, apparent_size, in_bytes, total, max_depth, human_readable, summarize, one_file_system, jobs, files):
+    if summarize:
+        if all_files:
+            raise click.UsageError('cannot both summarize and show all entries')
+        if max_depth not in (None, 0):
+            raise click.UsageError('warning: summarizing conflicts with --max-depth={}'.format(max_depth))
+        max_depth = 0
+
+    if in_bytes:
+        apparent_size = True
+
+    def format_size(size):
+        if human_readable:
+            return human_size(size)
+        if in_bytes:
+            return str(size)
+        return str(-(-size // 1024))
+
+    files = files or ('.',)
+    # Like GNU du, with several arguments nothing is counted twice even when
+    #  the arguments overlap, which means remembering every inode
+    usage = DiskUsage(all_files, apparent_size, max_depth, one_file_system, jobs, format_size, track_all=len(files) > 1)
+    try:
+        grand_total = 0
+        for f in files:
+            grand_total += usage.measure(f)
+    finally:
+        usage.close()
+
+    if total:
+        usage.report(grand_total, 'total')
+
+    if not usage.success:
+        sys.exit(1)
+
+
+class DiskUsage(object):
+    def __init__(self, all_files=False, apparent_size=False, max_depth=None, one_file_system=False, jobs=JOBS, format_size=str,
+                 track_all=False):
+        """
+        Walks directory trees, printing their sizes
+
+        Directories are scanned with scandir and every entry is stat'ed on a
+        thread pool, ahead of the walk reaching them. The walk itself is in
+        directory order and single threaded, so the output is the same
+        whatever the number of jobs.
+
+        Files with several hard links are only counted once. With
+        `track_all`, so is everything else.
+        """
+        self.all_files = all_files
+        self.apparent_size = apparent_size
+        self.max_depth = max_depth
+        self.one_file_system = one_file_system
+        self.lookahead = jobs * LOOKAHEAD
+        self.format_size = format_size
+        self.track_all = track_all
+        self.inodes = InodeSet()
+        self.success = True
+
+        if jobs > 1:
+            # multiprocessing is slow to import, so only pay for it when it's used
+            from multiprocessing.pool import ThreadPool
+            self.pool = ThreadPool(jobs)
+        else:
+            self.pool = None
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.terminate()
+
+    def report(self, size, path):
+        click.echo('{}\t{}'.format(self.format_size(size), click.format_filename(path)))
+
+    def error(self, message):
+        click.echo('{}: {}'.format(COMMAND_NAME, message), err=True)
+        self.success = False
+
+    def size(self, st):
+        """
+        Returns the size of `st` to count, or None if its inode was already counted
+        """
+        if self.track_all or (st.st_nlink > 1 and not stat.S_ISDIR(st.st_mode)):
+            if not self.inodes.add(st.st_dev, st.st_ino):
+                return None
+        if self.apparent_size:
+            return st.st_size
+        return getattr(st, 'st_blocks', (st.st_size + 511) // 512) * 512
+
+    def measure(self, path):
+        """
+        Prints the sizes within `path`, returning its total
+        """
+        try:
+            st = os.lstat(path)
+        except EnvironmentError as e:
+            self.error("cannot access '{}': {}".format(click.format_filename(path), e.strerror))
+            return 0
+
+        size = self.size(st)
+        if size is None:
+            return 0
+        if not stat.S_ISDIR(st.st_mode):
+            self.report(size, path)
+            return size
+
+        root_dev = st.st_dev
+        stack = [self._frame(path, 0, self._submit(path), size, root_dev)]
+        while stack:
+            frame = stack[-1]
+            if frame.index == len(frame.entries):
+                stack.pop()
+                if self.max_depth is None or frame.depth <= self.max_depth:
+                    self.report(frame.total, frame.path)
+                if stack:
+                    stack[-1].total += frame.total
+                else:
+                    return frame.total
+                continue
+
+            entry_path, st = frame.entries[frame.index]
+            frame.index += 1
+            if self.one_file_system and st.st_dev != root_dev:
+                continue
+
+            is_directory = stat.S_ISDIR(st.st_mode)
+            if is_directory:
+                # The scans ahead are in the order of the subdirectories, so
+                #  this one's is taken even if the directory is then skipped
+                pending = frame.ahead.popleft()
+                self._scan_ahead(frame)
+
+            size = self.size(st)
+            if size is None:
+                continue
+
+            if is_directory:
+                stack.append(self._frame(entry_path, frame.depth + 1, pending, size, root_dev))
+                continue
+
+            frame.total += size
+            if self.all_files and (self.max_depth is None or frame.depth + 1 <= self.max_depth):
+                self.report(size, entry_path)
+
+    def _frame(self, path, depth, pending, size, root_dev):
+        entries, errors = pending.get()
+        for message in errors:
+            self.error(message)
+
+        frame = Frame(path, depth, entries, size)
+        frame.subdirectories = iter([
+            entry_path for entry_path, st in entries
+            if stat.S_ISDIR(st.st_mode) and not (self.one_file_system and st.st_dev != root_dev)
+        ])
+        self._scan_ahead(frame)
+        return frame
+
+    def _scan_ahead(self, frame):
+        while len(frame.ahead) < self.lookahead:
+            subdirectory = next(frame.subdirectories, None)
+            if subdirectory is None:
+                break
+            frame.ahead.append(self._submit(subdirectory))
+
+    def _submit(self, path):
+        if self.pool is None:
+            return ReadyResult(scan(path))
+        return self.pool.apply_async(scan, (path,))
+
+
+def scan(path):
+    """
+    Returns the (path, lstat result) of every entry of the directory `path`,
+    in directory order, along with any error messages
+    """
+    entries = []
+    errors = []
+    try:
+        if hasattr(os, 'scandir'):
+            iterator = ((entry.path, entry) for entry in os.scandir(path))
+        else:
+            iterator = ((os.path.join(path, name), None) for name in os.listdir(path))
+
+        for entry_path, entry in iterator:
+            try:
+                st = entry.stat(follow_symlinks=False) if entry is not None else os.lstat(entry_path)
+            except EnvironmentError as e:
+                errors.append("cannot access '{}': {}".format(click.format_filename(entry_path), e.strerror))
+                continue
+            entries.append((entry_path, st))
+    except EnvironmentError as e:
+        errors.append("cannot read directory '{}': {}".format(click.format_filename(path), e.strerror))
+
+    return entries, errors
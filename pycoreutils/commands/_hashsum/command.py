@@ -0,0 +1,62 @@
+import hashlib
+import os
+import sys
+
+from ..hasher import MultiHasherCommand
+from ...utils import BLOCK_SIZE
+from ...vendor import click
+
+
+def validate_algorithms(ctx, param, value):
+    algorithms = []
+    for a in value.split(','):
+        algorithm = a.strip().lower()
+        if algorithm and algorithm not in algorithms:
+            algorithms.append(algorithm)
+    if not algorithms:
+        raise click.BadParameter('at least one algorithm is required')
+
+    for algorithm in algorithms:
+        try:
+            digest_size = hashlib.new(algorithm).digest_size
+        except ValueError:
+            raise click.BadParameter('unsupported algorithm "{}"'.format(algorithm))
+        # Variable length digests, like shake_128, need a length to be printed
+        if not digest_size:
+            raise click.BadParameter('unsupported variable length algorithm "{}"'.format(algorithm))
+
+    return algorithms
+
+
+@click.command(
+    help='Print checksums of each FILE using several algorithms, reading it only once',
+    short_help='Print checksums using several algorithms',
+)
+@click.help_option('-h', '--help')
+@click.option('-a', '--algorithms', metavar='LIST', default='md5,sha1,sha256', callback=validate_algorithms,
+              help='comma separated hashing algorithms (default md5,sha1,sha256)')
+@click.option('-o', '--output-dir', metavar='DIR', type=click.Path(file_okay=False, exists=True),
+              help='write a manifest per algorithm (eg. DIR/SHA256SUMS) instead of printing a combined one')
+@click.option('--tag', is_flag=True, default=False, help='Output BSD-style manifests when using --output-dir')
+@click.option('-j', '--jobs', metavar='N', type=click.IntRange(min=1), default=1, help='hash up to N files concurrently')
+@click.option('--block-size', metavar='BYTES', type=click.IntRange(min=1), default=BLOCK_SIZE, help='read input BYTES at a time')
+@click.argument('files', metavar='FILE', required=False, nargs=-1, type=click.File('rb'))
+def subcommand(algorithms, output_dir, tag, jobs, block_size, files):
+    if len(files) == 0:
+        files = (click.get_binary_stream('stdin'),)
+
+    manifests = {}
+    if output_dir:
+        for algorithm in algorithms:
+            path = os.path.join(output_dir, '{}SUMS'.format(algorithm.upper()))
+            manifests[algorithm] = click.open_file(path, 'w')
+
+    try:
+        hasher = MultiHasherCommand(algorithms, tag, jobs, block_size, manifests)
+        success = hasher.process_files(files)
+    finally:
+        for fd in manifests.values():
+            fd.close()
+
+    if not success:
+        sys.exit(1)
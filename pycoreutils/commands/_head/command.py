@@ -0,0 +1,210 @@
+import collections
+import errno
+import os
+import stat
+import sys
+
+from ...utils import parse_size
+from ...vendor import click
+
+
+COMMAND_NAME = 'head'
+
+BUFSIZE = 64 * 1024
+
+
+def parse_count(ctx, param, value):
+    """
+    Parses a count like '10', '+10', '-10' or '2K' into (all_but_last, number)
+    """
+    if value is None:
+        return None
+
+    all_but_last = value.startswith('-')
+    try:
+        return all_but_last, parse_size(value[1:] if value[:1] in ('-', '+') else value)
+    except ValueError:
+        raise click.BadParameter("invalid number of {}: '{}'".format('bytes' if param.name == 'count_bytes' else 'lines', value))
+
+
+@click.command(
+    help='Print the first 10 lines of each FILE to standard output. With more than one FILE, precede each with a header '
+         'giving the file name. With no FILE, or when FILE is -, read standard input.',
+    short_help='Output the first part of files',
+)
+@click.help_option('-h', '--help')
+@click.option('-c', '--bytes', 'count_bytes', metavar='[-]NUM', callback=parse_count,
+              help='print the first NUM bytes of each file; with the leading \'-\', print all but the last NUM bytes of each file')
+@click.option('-n', '--lines', 'count_lines', metavar='[-]NUM', callback=parse_count,
+              help='print the first NUM lines instead of the first 10; with the leading \'-\', print all but the last NUM lines of each file')
+@click.option('-q', '--quiet', '--silent', 'quiet', is_flag=True, default=False, help='never print headers giving file names')
+@click.option('-v', '--verbose', is_flag=True, default=False, help='always print headers giving file names')
+@click.argument('files', metavar='FILE', required=False, nargs=-1, type=click.Path(allow_dash=True))
+def subcommand(count_bytes, count_lines, quiet, verbose, files):
+    if count_bytes is not None and count_lines is not None:
+        raise click.UsageError('cannot specify both --bytes and --lines')
+
+    files = files or ('-',)
+    headers = verbose or (len(files) > 1 and not quiet)
+    stdout = Output(click.get_binary_stream('stdout'))
+    try:
+        success = head_files(files, stdout, count_bytes, count_lines, headers)
+        stdout.flush()
+    except OutputError as e:
+        if e.errno != errno.EPIPE:
+            click.echo('{}: write error: {}'.format(COMMAND_NAME, e.strerror), err=True)
+        # Otherwise behave as if killed by SIGPIPE, like GNU head
+        sys.exit(1)
+
+    if not success:
+        sys.exit(1)
+
+
+def head_files(files, stdout, count_bytes, count_lines, headers):
+    """
+    Copies the head of each of `files` to the `Output` `stdout`, returning
+    whether they could all be read
+    """
+    success = True
+    first = True
+    for f in files:
+        filepath = click.format_filename(f)
+        try:
+            if f == '-':
+                fd = click.get_binary_stream('stdin')
+                filepath = 'standard input'
+            else:
+                fd = open(f, 'rb')
+        except EnvironmentError as e:
+            click.echo("{}: cannot open '{}' for reading: {}".format(COMMAND_NAME, filepath, e.strerror), err=True)
+            success = False
+            continue
+
+        try:
+            if headers:
+                stdout.write('{}==> {} <==\n'.format('' if first else '\n', filepath).encode('utf-8'))
+                first = False
+
+            if count_bytes is not None:
+                all_but_last, number = count_bytes
+                if all_but_last:
+                    head_all_but_last_bytes(fd, stdout, number)
+                else:
+                    head_bytes(fd, stdout, number)
+            else:
+                all_but_last, number = count_lines or (False, 10)
+                if all_but_last:
+                    head_all_but_last_lines(fd, stdout, number)
+                else:
+                    head_lines(fd, stdout, number)
+        except EnvironmentError as e:
+            click.echo("{}: error reading '{}': {}".format(COMMAND_NAME, filepath, e.strerror), err=True)
+            success = False
+        finally:
+            if f != '-':
+                fd.close()
+    return success
+
+
+class OutputError(Exception):
+    def __init__(self, error):
+        Exception.__init__(self, error.strerror)
+        self.errno = error.errno
+        self.strerror = error.strerror
+
+
+class Output(object):
+    def __init__(self, stream):
+        """
+        Standard output, whose write errors are raised as `OutputError` so
+        they are not taken for errors reading the input
+        """
+        self.stream = stream
+
+    def write(self, data):
+        try:
+            self.stream.write(data)
+        except EnvironmentError as e:
+            raise OutputError(e)
+
+    def flush(self):
+        try:
+            self.stream.flush()
+        except EnvironmentError as e:
+            raise OutputError(e)
+
+
+def head_bytes(fd, output, number):
+    """
+    Copies the first `number` bytes of `fd`, never reading past them
+    """
+    while number > 0:
+        data = fd.read(min(number, BUFSIZE))
+        if not data:
+            break
+        output.write(data)
+        number -= len(data)
+
+
+def head_lines(fd, output, number):
+    """
+    Copies the first `number` lines of `fd`
+
+    Input is read a block at a time and newlines are counted in bulk. Reading
+    stops at the block holding the last line, and where the input is
+    seekable its position is moved back to just after that line, so another
+    process can carry on from there.
+    """
+    read = getattr(fd, 'read1', fd.read)
+    while number > 0:
+        data = read(BUFSIZE)
+        if not data:
+            break
+
+        count = data.count(b'\n')
+        if count < number:
+            output.write(data)
+            number -= count
+            continue
+
+        end = -1
+        for _ in range(number):
+            end = data.find(b'\n', end + 1)
+        output.write(data[:end + 1])
+        _unread(fd, len(data) - end - 1)
+        break
+
+
+def head_all_but_last_bytes(fd, output, number):
+    pending = bytearray()
+    read = getattr(fd, 'read1', fd.read)
+    while True:
+        data = read(BUFSIZE)
+        if not data:
+            break
+        pending += data
+        if len(pending) > number:
+            output.write(bytes(pending[:len(pending) - number]))
+            del pending[:len(pending) - number]
+
+
+def head_all_but_last_lines(fd, output, number):
+    # Only whole lines can be released, so hold back the last `number`
+    pending = collections.deque()
+    for line in iter(fd.readline, b''):
+        pending.append(line)
+        if len(pending) > number:
+            output.write(pending.popleft())
+
+
+def _unread(fd, size):
+    """
+    Moves the position of a regular file back by `size` bytes
+    """
+    if not size:
+        return
+    try:
+        if stat.S_ISREG(os.fstat(fd.fileno()).st_mode):
+            fd.seek(-size, os.SEEK_CUR)
+    except (AttributeError, ValueError, EnvironmentError):
+        pass
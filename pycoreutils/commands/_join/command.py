@@ -0,0 +1,338 @@
+import collections
+import itertools
+import operator
+import os
+import re
+import stat
+import sys
+
+from ...utils import write_lines
+from ...vendor import click
+
+
+COMMAND_NAME = 'join'
+
+FIELD_SPEC_REGEX = re.compile(r'^(?:0|([12])\.(\d+))$')
+
+
+class JoinError(Exception):
+    pass
+
+
+def parse_format(ctx, param, values):
+    """
+    Parses every -o FORMAT into a single list of (file, field) pairs, with
+    fields counted from 0 and (0, None) for the join field
+    """
+    specs = []
+    for value in values:
+        for part in re.split(r'[ ,]+', value.strip()):
+            match = FIELD_SPEC_REGEX.match(part)
+            if not match or (match.group(2) is not None and int(match.group(2)) == 0):
+                raise click.BadParameter("invalid field specifier: '{}'".format(part))
+            if match.group(1) is None:
+                specs.append((0, None))
+            else:
+                specs.append((int(match.group(1)), int(match.group(2)) - 1))
+    return specs or None
+
+
+@click.command(
+    help='For each pair of input lines with identical join fields, write a line to standard output. '
+         'The default join field is the first, delimited by blanks. When FILE1 or FILE2 (not both) is -, read standard input. '
+         'Both files must be sorted on the join fields, unless --hash is given.',
+    short_help='Join lines of two files on a common field',
+)
+@click.help_option('-h', '--help')
+@click.option('-a', 'unpaired', metavar='FILENUM', type=click.Choice(['1', '2']), multiple=True,
+              help='also print unpairable lines from file FILENUM, where FILENUM is 1 or 2')
+@click.option('-e', 'empty', metavar='EMPTY', help='replace missing input fields with EMPTY')
+@click.option('-i', '--ignore-case', is_flag=True, default=False, help='ignore differences in case when comparing fields')
+@click.option('-j', 'field', metavar='FIELD', type=click.IntRange(min=1), help='equivalent to "-1 FIELD -2 FIELD"')
+@click.option('-o', 'output_format', metavar='FORMAT', multiple=True, callback=parse_format,
+              help='obey FORMAT while constructing output line')
+@click.option('-t', 'separator', metavar='CHAR', help='use CHAR as input and output field separator')
+@click.option('-v', 'only_unpaired', metavar='FILENUM', type=click.Choice(['1', '2']), multiple=True,
+              help='like -a FILENUM, but suppress joined output lines')
+@click.option('-1', 'field1', metavar='FIELD', type=click.IntRange(min=1), help='join on this FIELD of file 1')
+@click.option('-2', 'field2', metavar='FIELD', type=click.IntRange(min=1), help='join on this FIELD of file 2')
+@click.option('--check-order/--nocheck-order', default=None,
+              help='check that the input is correctly sorted, even if all input lines are pairable, or do not check')
+@click.option('--hash', 'use_hash', is_flag=True, default=False,
+              help='index the smaller file in memory, so that neither file needs to be sorted (not in GNU join)')
+@click.argument('file1', metavar='FILE1', type=click.Path(dir_okay=False, allow_dash=True))
+@click.argument('file2', metavar='FILE2', type=click.Path(dir_okay=False, allow_dash=True))
+def subcommand(unpaired, empty, ignore_case, field, output_format, separator, only_unpaired, field1, field2, check_order,
+               use_hash, file1, file2):
+    if file1 == '-' and file2 == '-':
+        raise click.UsageError('both files cannot be standard input')
+    if field is not None:
+        if (field1 is not None and field1 != field) or (field2 is not None and field2 != field):
+            raise click.UsageError('conflicting join fields')
+        field1 = field2 = field
+
+    encoding = sys.getfilesystemencoding()
+    if separator is not None:
+        separator = click.format_filename(separator).encode(encoding)
+        if len(separator) != 1:
+            raise click.BadParameter('the separator must be a single character', param_hint='"-t"')
+    if empty is not None:
+        empty = click.format_filename(empty).encode(encoding)
+
+    joiner = Joiner(
+        fields=((field1 or 1) - 1, (field2 or 1) - 1),
+        separator=separator,
+        unpaired=set(int(n) for n in unpaired + only_unpaired),
+        paired=not only_unpaired,
+        output_format=output_format,
+        empty=empty,
+        ignore_case=ignore_case,
+        # Order does not matter to a hash join
+        check_order=False if use_hash else check_order,
+    )
+
+    stdout = click.get_binary_stream('stdout')
+    fds = []
+    try:
+        for path in (file1, file2):
+            fds.append(click.get_binary_stream('stdin') if path == '-' else open(path, 'rb'))
+        names = (click.format_filename(file1), click.format_filename(file2))
+
+        if use_hash:
+            lines = joiner.hash_join(fds, names, _indexed_file(fds))
+        else:
+            lines = joiner.merge_join(fds, names)
+        write_lines(stdout, lines)
+    except JoinError as e:
+        stdout.flush()
+        click.echo('{}: {}'.format(COMMAND_NAME, e), err=True)
+        sys.exit(1)
+    except EnvironmentError as e:
+        stdout.flush()
+        click.echo('{}: {}: {}'.format(COMMAND_NAME, click.format_filename(e.filename or '-'), e.strerror), err=True)
+        sys.exit(1)
+    finally:
+        for path, fd in zip((file1, file2), fds):
+            if path != '-':
+                fd.close()
+
+    if joiner.disordered:
+        for message in joiner.disorders:
+            click.echo('{}: {}'.format(COMMAND_NAME, message), err=True)
+        click.echo('{}: input is not in sorted order'.format(COMMAND_NAME), err=True)
+        sys.exit(1)
+
+
+class Joiner(object):
+    def __init__(self, fields=(0, 0), separator=None, unpaired=(), paired=True, output_format=None, empty=None,
+                 ignore_case=False, check_order=None):
+        """
+        Joins the lines of two files, as bytes
+
+        :param fields: the join field of each file, counted from 0
+        :param separator: the field separator, or None for runs of blanks
+        :param unpaired: the files (1 and/or 2) whose unpairable lines are printed
+        :param paired: whether to print joined lines
+        :param output_format: a list of (file, field) as returned by `parse_format`, or None
+        :param empty: what missing or empty fields are replaced with, or None
+        :param check_order: True to fail on unsorted input, False not to
+                            check, or None to only complain about it if
+                            there are unpairable lines, as GNU join does
+        """
+        self.fields = fields
+        self.separator = separator
+        self.output_separator = b' ' if separator is None else separator
+        self.unpaired = unpaired
+        self.paired = paired
+        self.output_format = output_format
+        self.empty = empty
+        self.ignore_case = ignore_case
+        self.check_order = check_order
+
+        self.seen_unpairable = False
+        # Lines found out of order, which only matter once a line is unpairable
+        self.disorders = []
+        # The files, 1 and/or 2, found out of order
+        self.warned = set()
+
+    @property
+    def disordered(self):
+        return bool(self.disorders) and self.seen_unpairable
+
+    def records(self, fd, number, name):
+        """
+        Yields (key, fields) for each line of `fd`, the `number`th file
+
+        Unless disabled, the keys are checked to be in order as they are read.
+        """
+        field = self.fields[number - 1]
+        separator = self.separator
+        ignore_case = self.ignore_case
+        check = self.check_order is not False
+        previous = None
+
+        for lineno, line in enumerate(fd, 1):
+            fields = line.rstrip(b'\n').split(separator)
+            key = fields[field] if field < len(fields) else b''
+            if ignore_case:
+                key = key.lower()
+
+            if check and previous is not None and key < previous and number not in self.warned:
+                message = '{}:{}: is not sorted: {}'.format(name, lineno, click.format_filename(line.rstrip(b'\n')))
+                if self.check_order:
+                    raise JoinError(message)
+                self.disorders.append(message)
+                self.warned.add(number)
+            previous = key
+            yield key, fields
+
+    def merge_join(self, fds, names):
+        """
+        Yields the output lines for two files sorted on their join fields
+
+        Only the lines sharing a single key are held in memory at a time.
+        """
+        groups1 = self._groups(self.records(fds[0], 1, names[0]))
+        groups2 = self._groups(self.records(fds[1], 2, names[1]))
+        group1 = next(groups1, None)
+        group2 = next(groups2, None)
+
+        while group1 is not None and group2 is not None:
+            if group1[0] < group2[0]:
+                for line in self.unpaired_lines(1, group1[1]):
+                    yield line
+                group1 = next(groups1, None)
+            elif group1[0] > group2[0]:
+                for line in self.unpaired_lines(2, group2[1]):
+                    yield line
+                group2 = next(groups2, None)
+            else:
+                if self.paired:
+                    for fields1 in group1[1]:
+                        for fields2 in group2[1]:
+                            yield self.format_pair(fields1, fields2)
+                group1 = next(groups1, None)
+                group2 = next(groups2, None)
+
+        # Whatever is left is only read to be printed, or to check its order
+        #  until it is found unsorted. As with GNU join, these lines do not
+        #  count as unpairable when deciding whether to complain about order.
+        for number, group, groups in ((1, group1, groups1), (2, group2, groups2)):
+            printed = number in self.unpaired
+            if group is None or (not printed and (self.check_order is False or number in self.warned)):
+                continue
+            for _, records in itertools.chain([group], groups):
+                if printed:
+                    for fields in records:
+                        yield self.format_unpaired(number, fields)
+                elif number in self.warned:
+                    break
+
+    def hash_join(self, fds, names, indexed=1):
+        """
+        Yields the output lines for two files in any order
+
+        The `indexed` file, 1 or 2, is read into a dict of lines by key, and
+        the other is streamed past it, so joined lines come in the order of
+        the streamed file. Unpairable lines of the indexed file come last.
+        """
+        streamed = 3 - indexed
+        records = list(self.records(fds[indexed - 1], indexed, names[indexed - 1]))
+        index = collections.defaultdict(list)
+        for key, fields in records:
+            index[key].append(fields)
+
+        matched = set()
+        for key, fields in self.records(fds[streamed - 1], streamed, names[streamed - 1]):
+            others = index.get(key)
+            if others is None:
+                for line in self.unpaired_lines(streamed, [fields]):
+                    yield line
+                continue
+
+            matched.add(key)
+            if self.paired:
+                for other in others:
+                    if streamed == 1:
+                        yield self.format_pair(fields, other)
+                    else:
+                        yield self.format_pair(other, fields)
+
+        if indexed in self.unpaired:
+            for key, fields in records:
+                if key not in matched:
+                    yield self.format_unpaired(indexed, fields)
+
+    def unpaired_lines(self, number, records):
+        self.seen_unpairable = True
+        if number in self.unpaired:
+            for fields in records:
+                yield self.format_unpaired(number, fields)
+
+    def format_pair(self, fields1, fields2):
+        if self.output_format is not None:
+            return self._format(fields1[self.fields[0]] if self.fields[0] < len(fields1) else None, fields1, fields2)
+
+        field1, field2 = self.fields
+        parts = [fields1[field1] if field1 < len(fields1) else b'']
+        parts.extend(fields1[:field1])
+        parts.extend(fields1[field1 + 1:])
+        parts.extend(fields2[:field2])
+        parts.extend(fields2[field2 + 1:])
+        return self._join(parts)
+
+    def format_unpaired(self, number, fields):
+        field = self.fields[number - 1]
+        key = fields[field] if field < len(fields) else None
+        if self.output_format is not None:
+            return self._format(key, fields, None) if number == 1 else self._format(key, None, fields)
+
+        parts = [key if key is not None else b'']
+        parts.extend(fields[:field])
+        parts.extend(fields[field + 1:])
+        return self._join(parts)
+
+    def _format(self, key, fields1, fields2):
+        empty = self.empty if self.empty is not None else b''
+        parts = []
+        for number, field in self.output_format:
+            if number == 0:
+                value = key
+            else:
+                fields = fields1 if number == 1 else fields2
+                value = fields[field] if fields is not None and field < len(fields) else None
+            parts.append(value or empty)
+        return self.output_separator.join(parts)
+
+    def _join(self, parts):
+        if self.empty is not None:
+            # As with GNU join, fields that are there but empty are replaced too
+            parts = [part or self.empty for part in parts]
+        return self.output_separator.join(parts)
+
+    def _groups(self, records):
+        """
+        Yields (key, [fields, ...]) for each run of records with the same key
+        """
+        for key, group in itertools.groupby(records, operator.itemgetter(0)):
+            yield key, [fields for _, fields in group]
+
+
+def _indexed_file(fds):
+    """
+    Returns which of the two files, 1 or 2, to index for a hash join: the
+    smaller one if both are regular files, otherwise one that can be read
+    in full before the other is read at all
+    """
+    sizes = []
+    for fd in fds:
+        try:
+            st = os.fstat(fd.fileno())
+        except (AttributeError, ValueError, EnvironmentError):
+            # eg. BytesIO
+            sizes.append(None)
+        else:
+            sizes.append(st.st_size if stat.S_ISREG(st.st_mode) else None)
+    if sizes[0] is not None and sizes[1] is not None:
+        return 1 if sizes[0] <= sizes[1] else 2
+    return 2 if sizes[0] is None else 1
@@ -0,0 +1,363 @@
+import errno
+import os
+import stat
+import sys
+import time
+
+from ...utils import ReadyResult, human_size, mode2string
+from ...vendor import click
+
+
+COMMAND_NAME = 'ls'
+
+# Directories listed concurrently by -R. Listing is mostly system calls,
+#  which release the GIL.
+JOBS = 8
+
+# Timestamps older than this, or in the future, show the year instead of the time
+RECENT_SECONDS = 365.2425 * 24 * 60 * 60 / 2
+
+# The narrowest a column can be: a one character name and two spaces
+MIN_COLUMN_WIDTH = 3
+
+
+class Entry(object):
+    __slots__ = ('name', 'path', 'is_dir', 'st', 'target')
+
+    def __init__(self, name, path, is_dir, st=None, target=None):
+        """
+        A directory entry to be listed
+
+        :param is_dir: whether it is a directory, not following symbolic links
+        :param st: its lstat result, only fetched when it is needed
+        :param target: what it points to, for symbolic links in long listings
+        """
+        self.name = name
+        self.path = path
+        self.is_dir = is_dir
+        self.st = st
+        self.target = target
+
+
+@click.command(
+    help='List information about the FILEs (the current directory by default). Entries are sorted by name unless one of '
+         '-S, -t or -U is given.',
+    short_help='List directory contents',
+)
+@click.help_option('--help')
+@click.option('-a', '--all', 'show_all', is_flag=True, default=False, help='do not ignore entries starting with .')
+@click.option('-A', '--almost-all', is_flag=True, default=False, help='do not list implied . and ..')
+@click.option('-d', '--directory', is_flag=True, default=False, help='list directories themselves, not their contents')
+@click.option('-h', '--human-readable', is_flag=True, default=False, help='with -l, print sizes like 1K 234M 2G etc.')
+@click.option('-l', 'long_format', is_flag=True, default=False, help='use a long listing format')
+@click.option('-n', '--numeric-uid-gid', is_flag=True, default=False, help='like -l, but list numeric user and group IDs')
+@click.option('-r', '--reverse', is_flag=True, default=False, help='reverse order while sorting')
+@click.option('-R', '--recursive', is_flag=True, default=False, help='list subdirectories recursively')
+@click.option('-S', 'sort_size', is_flag=True, default=False, help='sort by file size, largest first')
+@click.option('-t', 'sort_time', is_flag=True, default=False, help='sort by modification time, newest first')
+@click.option('-U', 'unsorted', is_flag=True, default=False, help='do not sort; list entries in directory order')
+@click.option('-1', 'one_per_line', is_flag=True, default=False, help='list one file per line')
+@click.option('-C', 'force_columns', is_flag=True, default=False, help='list entries by columns, even when not writing to a terminal')
+@click.option('-w', '--width', metavar='COLS', type=click.IntRange(min=1), help='set output width to COLS')
+@click.option('-j', '--jobs', metavar='N', type=click.IntRange(min=1), default=JOBS, help='with -R, list up to N directories concurrently')
+@click.argument('files', metavar='FILE', required=False, nargs=-1, type=click.Path())
+def subcommand(show_all, almost_all, directory, human_readable, long_format, numeric_uid_gid, reverse, recursive, sort_size, sort_time,
+               unsorted, one_per_line, force_columns, width, jobs, files):
+    if numeric_uid_gid:
+        long_format = True
+
+    sort = 'name'
+    if unsorted:
+        sort = None
+    elif sort_size:
+        sort = 'size'
+    elif sort_time:
+        sort = 'time'
+
+    lister = Lister(show_all, almost_all, long_format, numeric_uid_gid, human_readable, sort, reverse)
+    if one_per_line or long_format or not (force_columns or sys.stdout.isatty()):
+        width = None
+    elif width is None:
+        width = click.get_terminal_size()[0]
+
+    # Operands that cannot be found are serious trouble, unreadable
+    #  subdirectories only minor trouble
+    status = 0
+    operands = []
+    for f in files or ('.',):
+        try:
+            # Like GNU ls, only follow links to directories when their contents are listed
+            if long_format or directory:
+                st = os.lstat(f)
+            else:
+                st = os.stat(f)
+        except EnvironmentError as e:
+            click.echo("{}: cannot access '{}': {}".format(COMMAND_NAME, click.format_filename(f), e.strerror), err=True)
+            status = 2
+            continue
+        operands.append(Entry(f, f, stat.S_ISDIR(st.st_mode) and not directory, st, lister.link_target(f, st)))
+
+    plain = lister.sorted([entry for entry in operands if not entry.is_dir])
+    directories = lister.sorted([entry for entry in operands if entry.is_dir])
+
+    headers = recursive or len(operands) > 1 or status != 0
+    walker = lister.walk([entry.path for entry in directories], recursive, jobs)
+    try:
+        printed = False
+        if plain:
+            lister.print_entries(plain, width, total=False)
+            printed = True
+
+        for path, entries, error in walker:
+            if error is not None:
+                click.echo("{}: cannot open directory '{}': {}".format(COMMAND_NAME, click.format_filename(path), error), err=True)
+                status = status or (2 if path in files else 1)
+                continue
+
+            if printed:
+                click.echo('')
+            if headers:
+                click.echo('{}:'.format(click.format_filename(path)))
+            lister.print_entries(entries, width)
+            printed = True
+        sys.stdout.flush()
+    except EnvironmentError as e:
+        if e.errno != errno.EPIPE:
+            raise
+        # Behave as if killed by SIGPIPE, like GNU ls
+        status = 1
+    finally:
+        walker.close()
+
+    sys.exit(status)
+
+
+class Lister(object):
+    def __init__(self, show_all=False, almost_all=False, long_format=False, numeric_ids=False, human_readable=False, sort='name',
+                 reverse=False):
+        """
+        Reads and formats directory listings
+
+        Entries are only stat'ed when the long format or the sort order needs
+        it. Otherwise scandir's file types are all that is used.
+
+        :param sort: one of 'name', 'size', 'time' or None for directory order
+        """
+        self.show_all = show_all
+        self.almost_all = almost_all
+        self.long_format = long_format
+        self.numeric_ids = numeric_ids
+        self.human_readable = human_readable
+        self.sort = sort
+        self.reverse = reverse
+        self.needs_stat = long_format or sort in ('size', 'time')
+        self.users = {}
+        self.groups = {}
+        self.times = {}
+        self.now = time.time()
+
+    def walk(self, paths, recursive=False, jobs=JOBS):
+        """
+        Yields (path, entries, error) for each of `paths` and, if `recursive`,
+        their subdirectories, depth first in sorted order
+
+        Subdirectories are listed on a thread pool as soon as their parent
+        has been, so they are usually ready by the time they are printed.
+        """
+        if not recursive or jobs <= 1:
+            pool = None
+        else:
+            # multiprocessing is slow to import, so only pay for it when it's used
+            from multiprocessing.pool import ThreadPool
+            pool = ThreadPool(jobs)
+
+        def submit(path):
+            if pool is None:
+                return ReadyResult(self.list_directory(path))
+            return pool.apply_async(self.list_directory, (path,))
+
+        try:
+            # The next directory to print is at the end
+            stack = [(path, submit(path)) for path in reversed(paths)]
+            while stack:
+                path, pending = stack.pop()
+                entries, error = pending.get()
+                yield path, entries, error
+
+                if recursive and entries:
+                    subdirectories = [entry.path for entry in entries if entry.is_dir and entry.name not in ('.', '..')]
+                    stack.extend((subdirectory, submit(subdirectory)) for subdirectory in reversed(subdirectories))
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+    def list_directory(self, path):
+        """
+        Returns the sorted entries of `path` and None, or None and an error
+        """
+        entries = []
+        try:
+            if self.show_all:
+                for name in ('.', '..'):
+                    entry_path = os.path.join(path, name)
+                    entries.append(Entry(name, entry_path, True, os.lstat(entry_path) if self.needs_stat else None))
+
+            for name, entry_path, is_dir, st in _scan(path, self.needs_stat):
+                if name.startswith('.') and not (self.show_all or self.almost_all):
+                    continue
+                entries.append(Entry(name, entry_path, is_dir, st, self.link_target(entry_path, st)))
+        except EnvironmentError as e:
+            return None, e.strerror
+
+        return self.sorted(entries), None
+
+    def link_target(self, path, st):
+        if not self.long_format or st is None or not stat.S_ISLNK(st.st_mode):
+            return None
+        try:
+            return os.readlink(path)
+        except EnvironmentError:
+            return ''
+
+    def sorted(self, entries):
+        if self.sort is None:
+            return entries
+
+        entries.sort(key=lambda entry: entry.name)
+        if self.sort == 'size':
+            entries.sort(key=lambda entry: entry.st.st_size, reverse=True)
+        elif self.sort == 'time':
+            entries.sort(key=lambda entry: entry.st.st_mtime, reverse=True)
+
+        if self.reverse:
+            entries.reverse()
+        return entries
+
+    def print_entries(self, entries, width=None, total=True):
+        if self.long_format:
+            lines = self.long_lines(entries)
+            if total:
+                blocks = sum(getattr(entry.st, 'st_blocks', 0) for entry in entries)
+                lines.insert(0, 'total {}'.format(self.format_size(blocks * 512, blocks=True)))
+        elif width is None:
+            lines = [entry.name for entry in entries]
+        else:
+            lines = columns([entry.name for entry in entries], width)
+
+        if lines:
+            click.echo(click.format_filename('\n'.join(lines)))
+
+    def long_lines(self, entries):
+        rows = []
+        for entry in entries:
+            st = entry.st
+            if stat.S_ISCHR(st.st_mode) or stat.S_ISBLK(st.st_mode):
+                size = '{}, {}'.format(os.major(st.st_rdev), os.minor(st.st_rdev))
+            else:
+                size = self.format_size(st.st_size)
+
+            name = entry.name
+            if entry.target is not None:
+                name = '{} -> {}'.format(name, entry.target)
+
+            rows.append((mode2string(st.st_mode), str(st.st_nlink), self.user(st.st_uid), self.group(st.st_gid), size,
+                         self.format_time(st.st_mtime), name))
+
+        if not rows:
+            return []
+
+        widths = [max(len(row[i]) for row in rows) for i in range(5)]
+        return [
+            '{} {:>{}} {:<{}} {:<{}} {:>{}} {} {}'.format(
+                mode, nlink, widths[1], user, widths[2], group, widths[3], size, widths[4], mtime, name)
+            for mode, nlink, user, group, size, mtime, name in rows
+        ]
+
+    def format_size(self, size, blocks=False):
+        """
+        Formats a size in bytes, in 1K blocks when `blocks` is set
+        """
+        if not self.human_readable:
+            return str(-(-size // 1024) if blocks else size)
+        return human_size(size)
+
+    def format_time(self, mtime):
+        recent = not (mtime > self.now or self.now - mtime > RECENT_SECONDS)
+        # Files in a directory tend to share their minute, so the formatted
+        #  times are cached per minute
+        key = (recent, int(mtime) // 60)
+        formatted = self.times.get(key)
+        if formatted is None:
+            formatted = time.strftime('%b %e %H:%M' if recent else '%b %e  %Y', time.localtime(mtime))
+            self.times[key] = formatted
+        return formatted
+
+    def user(self, uid):
+        if uid not in self.users:
+            self.users[uid] = str(uid) if self.numeric_ids else _user_name(uid)
+        return self.users[uid]
+
+    def group(self, gid):
+        if gid not in self.groups:
+            self.groups[gid] = str(gid) if self.numeric_ids else _group_name(gid)
+        return self.groups[gid]
+
+
+def _scan(path, needs_stat):
+    """
+    Yields (name, path, is_dir, st) for the entries of the directory `path`
+
+    `st` is None unless `needs_stat`, in which case it is the lstat result.
+    """
+    if hasattr(os, 'scandir'):
+        for entry in os.scandir(path):
+            st = entry.stat(follow_symlinks=False) if needs_stat else None
+            yield entry.name, entry.path, entry.is_dir(follow_symlinks=False), st
+        return
+
+    for name in os.listdir(path):
+        entry_path = os.path.join(path, name)
+        st = os.lstat(entry_path)
+        yield name, entry_path, stat.S_ISDIR(st.st_mode), st if needs_stat else None
+
+
+def columns(names, width):
+    """
+    Lays out `names` in as many columns as fit in `width`, filled top to
+    bottom, choosing the same layout as GNU ls
+    """
+    if not names:
+        return []
+
+    lengths = [len(name) for name in names]
+    for count in range(min(max(width // MIN_COLUMN_WIDTH, 1), len(names)), 0, -1):
+        rows = -(-len(names) // count)
+        widths = []
+        for c in range(count):
+            # Every column is padded by two spaces, except the last
+            padding = 0 if c == count - 1 else 2
+            widths.append(max([MIN_COLUMN_WIDTH] + [length + padding for length in lengths[c * rows:(c + 1) * rows]]))
+        if count == 1 or sum(widths) < width:
+            break
+
+    lines = []
+    for row in range(rows):
+        cells = names[row::rows]
+        lines.append(''.join(cell.ljust(widths[c]) for c, cell in enumerate(cells[:-1])) + cells[-1])
+    return lines
+
+
+def _user_name(uid):
+    try:
+        import pwd
+        return pwd.getpwuid(uid).pw_name
+    except (ImportError, KeyError):
+        return str(uid)
+
+
+def _group_name(gid):
+    try:
+        import grp
+        return grp.getgrgid(gid).gr_name
+    except (ImportError, KeyError):
+        return str(gid)
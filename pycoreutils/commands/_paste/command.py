@@ -0,0 +1,155 @@
+import itertools
+import sys
+
+try:
+    from itertools import zip_longest
+except ImportError:
+    # Python 2
+    from itertools import izip_longest as zip_longest
+
+from ...utils import BLOCK_SIZE, LINE_BATCH_SIZE, read_records
+from ...vendor import click
+
+
+COMMAND_NAME = 'paste'
+
+# The read buffers of all files together are kept to about this size, but
+#  each file still gets at least MIN_BUFFER_SIZE
+BUFFER_SIZE = 16 * BLOCK_SIZE
+MIN_BUFFER_SIZE = 64 * 1024
+
+ESCAPES = {
+    '\\': b'\\',
+    '0': b'',
+    'b': b'\b',
+    'f': b'\f',
+    'n': b'\n',
+    'r': b'\r',
+    't': b'\t',
+    'v': b'\v',
+}
+
+
+def parse_delimiters(ctx, param, value):
+    """
+    Returns the list of delimiters in LIST, where '\\0' is no delimiter
+    """
+    encoding = sys.getfilesystemencoding()
+    delimiters = []
+    chars = iter(value)
+    for char in chars:
+        if char == '\\':
+            escaped = next(chars, None)
+            if escaped is None:
+                raise click.BadParameter('delimiter list ends with an unescaped backslash: {}'.format(value))
+            delimiters.append(ESCAPES.get(escaped, click.format_filename(escaped).encode(encoding)))
+        else:
+            delimiters.append(click.format_filename(char).encode(encoding))
+    return delimiters or [b'']
+
+
+@click.command(
+    help='Write lines consisting of the sequentially corresponding lines from each FILE, separated by TABs, '
+         'to standard output. With no FILE, or when FILE is -, read standard input. '
+         'Every FILE is read through a single buffer, so any number of files of any size can be pasted.',
+    short_help='Merge lines of files',
+)
+@click.help_option('-h', '--help')
+@click.option('-d', '--delimiters', metavar='LIST', default='\t', callback=parse_delimiters,
+              help='reuse characters from LIST instead of TABs')
+@click.option('-s', '--serial', is_flag=True, default=False, help='paste one file at a time instead of in parallel')
+@click.option('-z', '--zero-terminated', is_flag=True, default=False, help='line delimiter is NUL, not newline')
+@click.argument('files', metavar='FILE', required=False, nargs=-1, type=click.Path(dir_okay=False, allow_dash=True))
+def subcommand(delimiters, serial, zero_terminated, files):
+    files = files or ('-',)
+    separator = b'\0' if zero_terminated else b'\n'
+    block_size = max(MIN_BUFFER_SIZE, min(BLOCK_SIZE, BUFFER_SIZE // len(files)))
+
+    stdout = click.get_binary_stream('stdout')
+    fds = []
+    try:
+        for path in files:
+            fds.append(click.get_binary_stream('stdin') if path == '-' else open(path, 'rb'))
+
+        if serial:
+            for fd in fds:
+                paste_serial(stdout, read_records(fd, separator, block_size), delimiters, separator)
+        else:
+            # Every - reads from the same standard input, taking turns line by line
+            stdin = None
+            columns = []
+            for path, fd in zip(files, fds):
+                if path != '-':
+                    columns.append(read_records(fd, separator, block_size))
+                    continue
+                if stdin is None:
+                    stdin = read_records(fd, separator, block_size)
+                columns.append(stdin)
+            paste_parallel(stdout, columns, delimiters, separator)
+    except EnvironmentError as e:
+        click.echo('{}: {}: {}'.format(COMMAND_NAME, click.format_filename(e.filename or '-'), e.strerror), err=True)
+        sys.exit(1)
+    finally:
+        for path, fd in zip(files, fds):
+            if path != '-':
+                fd.close()
+
+
+def paste_parallel(output, columns, delimiters, separator=b'\n'):
+    """
+    Writes a line made of the next line of each of `columns` until they are
+    all exhausted, `LINE_BATCH_SIZE` lines per write
+
+    A column appearing several times in `columns` is dealt out among them
+    in turn.
+    """
+    # The delimiters used on every line, after each column but the last
+    between = [delimiters[i % len(delimiters)] for i in range(len(columns) - 1)] + [b'']
+    single = delimiters[0] if len(set(between[:-1])) <= 1 else None
+
+    positions = {}
+    for index, column in enumerate(columns):
+        positions.setdefault(id(column), (column, []))[1].append(index)
+
+    while True:
+        batch = [None] * len(columns)
+        for column, indexes in positions.values():
+            lines = list(itertools.islice(column, LINE_BATCH_SIZE * len(indexes)))
+            for turn, index in enumerate(indexes):
+                batch[index] = lines[turn::len(indexes)]
+        if not any(batch):
+            return
+
+        rows = zip_longest(*batch, fillvalue=b'')
+        if single is not None:
+            lines = [single.join(row) for row in rows]
+        else:
+            lines = [b''.join(itertools.chain.from_iterable(zip(row, between))) for row in rows]
+        lines.append(b'')
+        output.write(separator.join(lines))
+
+
+def paste_serial(output, lines, delimiters, separator=b'\n'):
+    """
+    Writes all of `lines` as a single line, joined by the cycled `delimiters`
+    """
+    count = 0
+    while True:
+        batch = list(itertools.islice(lines, LINE_BATCH_SIZE))
+        if not batch:
+            break
+
+        if len(delimiters) == 1:
+            chunk = delimiters[0].join(batch)
+            if count:
+                chunk = delimiters[0] + chunk
+        else:
+            parts = []
+            for offset, line in enumerate(batch, count):
+                if offset:
+                    parts.append(delimiters[(offset - 1) % len(delimiters)])
+                parts.append(line)
+            chunk = b''.join(parts)
+        output.write(chunk)
+        count += len(batch)
+    output.write(separator)
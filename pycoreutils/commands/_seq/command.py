@@ -0,0 +1,145 @@
+import decimal
+import errno
+import re
+import sys
+
+from ...vendor import click
+
+
+COMMAND_NAME = 'seq'
+
+# Numbers formatted and joined into a single write
+BATCH_SIZE = 64 * 1024
+
+INTEGER_REGEX = re.compile(r'^[+-]?\d+$')
+
+NUMBER_REGEX = re.compile(r'^[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE]([+-]?\d+))?$')
+
+# A FORMAT must have exactly one floating point conversion, and any other % must be %%
+FORMAT_REGEX = re.compile(r"^(?:[^%]|%%)*%[-+ #0]*\d*(?:\.\d*)?[eEfFgG](?:[^%]|%%)*$")
+
+
+def parse_number(value):
+    """
+    Returns (number, precision) for an argument, where number is an int if
+    the argument is one and an exact Decimal otherwise, and precision is its
+    number of decimal places
+    """
+    if INTEGER_REGEX.match(value):
+        return int(value), 0
+
+    match = NUMBER_REGEX.match(value)
+    if not match:
+        raise click.UsageError("invalid floating point argument: '{}'".format(value))
+
+    mantissa = value.lower().split('e')[0]
+    precision = len(mantissa.partition('.')[2])
+    if match.group(1):
+        precision = max(0, precision - int(match.group(1)))
+    return decimal.Decimal(value), precision
+
+
+@click.command(
+    help='Print numbers from FIRST to LAST, in steps of INCREMENT. If FIRST or INCREMENT is omitted, it defaults to 1. '
+         'FIRST, INCREMENT, and LAST are interpreted as floating point values, unless they are all integers. '
+         'FORMAT must be suitable for printing one argument of type double, eg. %.3f or %g.',
+    short_help='Print a sequence of numbers',
+    context_settings=dict(ignore_unknown_options=True),
+)
+@click.help_option('-h', '--help')
+@click.option('-f', '--format', 'number_format', metavar='FORMAT', help='use printf style floating-point FORMAT')
+@click.option('-s', '--separator', metavar='STRING', default='\n', help='use STRING to separate numbers (default: \\n)')
+@click.option('-w', '--equal-width', is_flag=True, default=False, help='equalize width by padding with leading zeroes')
+@click.argument('numbers', metavar='[FIRST [INCREMENT]] LAST', nargs=-1)
+def subcommand(number_format, separator, equal_width, numbers):
+    if not numbers:
+        raise click.UsageError('missing operand')
+    if len(numbers) > 3:
+        raise click.UsageError("extra operand '{}'".format(numbers[3]))
+    if number_format is not None and equal_width:
+        raise click.UsageError('format string may not be specified when printing equal width strings')
+    if number_format is not None:
+        number_format = click.format_filename(number_format)
+        if not FORMAT_REGEX.match(number_format):
+            raise click.UsageError("invalid format string: '{}'".format(number_format))
+
+    parsed = [parse_number(number) for number in numbers]
+    first, precision = parsed[0] if len(parsed) > 1 else (1, 0)
+    step, step_precision = parsed[1] if len(parsed) == 3 else (1, 0)
+    last = parsed[-1][0]
+    if step == 0:
+        raise click.UsageError("invalid Zero increment value: '{}'".format(numbers[1]))
+
+    if all(isinstance(n, int) for n in (first, step, last)) and number_format is None:
+        width = max(len(str(first)), len(str(last))) if equal_width else 0
+        blocks = integer_blocks(first, step, last, width)
+    else:
+        if number_format is None:
+            places = max(precision, step_precision)
+            if equal_width:
+                # The width of the widest number, with as many decimals as printed
+                width = max(len('{:.{}f}'.format(n, places)) for n in (first, last))
+                number_format = '%0{}.{}f'.format(width, places)
+            else:
+                number_format = '%.{}f'.format(places)
+        blocks = float_blocks(first, step, last, number_format)
+
+    stdout = click.get_binary_stream('stdout')
+    try:
+        write_blocks(stdout, blocks, click.format_filename(separator), sys.getfilesystemencoding())
+        stdout.flush()
+    except EnvironmentError as e:
+        if e.errno != errno.EPIPE:
+            raise
+        # Behave as if killed by SIGPIPE, like GNU seq
+        sys.exit(1)
+
+
+def integer_blocks(first, step, last, width=0):
+    """
+    Yields lists of the formatted integers from `first` to `last`, `BATCH_SIZE` at a time
+
+    The numbers of a block are formatted by a single `map` over a slice of
+    a range, so no Python code runs per number.
+    """
+    numbers = range(first, last + (1 if step > 0 else -1), step)
+    if width:
+        # Zero padding goes after the sign, as with GNU seq
+        formatter = '{{:0{}d}}'.format(width).format
+    else:
+        formatter = str
+    for start in range(0, len(numbers), BATCH_SIZE):
+        yield list(map(formatter, numbers[start:start + BATCH_SIZE]))
+
+
+def float_blocks(first, step, last, number_format):
+    """
+    Yields lists of the numbers from `first` to `last` formatted with the
+    printf style `number_format`, `BATCH_SIZE` at a time
+
+    The number of terms is worked out from the exact arguments, so that
+    binary rounding does not drop the last one, as it would for
+    0.1 + 2 * 0.1 > 0.3. Each number is then computed as `first + i * step`,
+    so that rounding errors do not add up over a long sequence.
+    """
+    terms = max(0, int(((decimal.Decimal(last) - first) / step).to_integral_value(rounding=decimal.ROUND_FLOOR)) + 1)
+    first = float(first)
+    step = float(step)
+    for start in range(0, terms, BATCH_SIZE):
+        yield [number_format % (first + i * step) for i in range(start, min(start + BATCH_SIZE, terms))]
+
+
+def write_blocks(fd, blocks, separator, encoding):
+    """
+    Writes the numbers of `blocks` to `fd`, separated by the text
+    `separator` and followed by a newline, with a single write per block
+    """
+    blocks = iter(blocks)
+    block = next(blocks, None)
+    if block is None:
+        return
+
+    fd.write(separator.join(block).encode(encoding))
+    for block in blocks:
+        fd.write((separator + separator.join(block)).encode(encoding))
+    fd.write(b'\n')
@@ -0,0 +1,21 @@
+import multiprocessing
+
+from ... import server
+from ...vendor import click
+
+
+@click.command(
+    help='Run commands for scripts/pycoreutils-client from a warm process listening on SOCKET. '
+         'This avoids starting a new interpreter for every command.',
+    short_help='Serve commands from a warm process',
+)
+@click.help_option('-h', '--help')
+@click.option('-s', '--socket', 'socket_path', metavar='SOCKET', type=click.Path(dir_okay=False),
+              help='the Unix domain socket to listen on [default: $PYCOREUTILS_SOCKET or one in $XDG_RUNTIME_DIR]')
+@click.option('-w', '--workers', metavar='N', type=click.IntRange(min=1), default=multiprocessing.cpu_count(),
+              help='the number of requests handled concurrently [default: number of CPUs]')
+def subcommand(socket_path, workers):
+    if not server.is_supported():
+        raise click.UsageError('serving requires Unix domain sockets and Python 3.3+')
+
+    server.serve(socket_path or server.default_socket_path(), workers)
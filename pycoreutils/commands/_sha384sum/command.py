@@ -1,6 +1,7 @@
 import sys
 
 from ..hasher import HasherCommand
+from ...utils import BLOCK_SIZE
 from ...vendor import click
 
 
@@ -12,12 +13,21 @@ from ...vendor import click
 @click.option('--tag', is_flag=True, default=False, help='Output a BSD-style checksum file')
 @click.option('--quiet', is_flag=True, default=False, help="don't print OK for each successfully verified file")
 @click.option('--status', is_flag=True, default=False, help="don't output anything, status code shows success")
+@click.option('-j', '--jobs', metavar='N', type=click.IntRange(min=1), default=1, help='hash up to N files concurrently')
+@click.option('--block-size', metavar='BYTES', type=click.IntRange(min=1), default=BLOCK_SIZE, help='read input BYTES at a time')
+@click.option('--cache', metavar='FILE', type=click.Path(dir_okay=False), envvar='PYCOREUTILS_CHECKSUM_CACHE',
+              help='reuse checksums of unchanged files stored in FILE when checking')
+@click.option('--no-cache', is_flag=True, default=False, help='do not use a checksum cache, even if one is configured')
+@click.option('--refresh', is_flag=True, default=False, help='rehash every file and update the checksum cache')
 @click.argument('files', metavar='FILE', required=False, nargs=-1, type=click.File('rb'))
-def subcommand(check, tag, quiet, status, files):
+def subcommand(check, tag, quiet, status, jobs, block_size, cache, no_cache, refresh, files):
     if len(files) == 0:
         files = (click.get_binary_stream('stdin'),)
 
-    hasher = HasherCommand('sha384', tag, quiet, status)
+    if no_cache:
+        cache = None
+
+    hasher = HasherCommand('sha384', tag, quiet, status, jobs, block_size, cache, refresh)
     success = hasher.process_files(files, check)
 
     if not success:
@@ -0,0 +1,289 @@
+import array
+import itertools
+import math
+import mmap
+import os
+import random
+import re
+import stat
+import sys
+
+from ...utils import read_records, write_lines
+from ...vendor import click
+
+
+COMMAND_NAME = 'shuf'
+
+RANGE_REGEX = re.compile(r'^(\d+)-(\d+)$')
+
+try:
+    array.array('Q')
+    OFFSET_TYPECODE = 'Q'
+except ValueError:
+    # Python 2, where an unsigned long is 64 bits on the platforms with files that large
+    OFFSET_TYPECODE = 'L'
+
+
+class ShufError(Exception):
+    pass
+
+
+def check_range(ctx, param, value):
+    if value is None:
+        return None
+    match = RANGE_REGEX.match(value)
+    if not match or int(match.group(2)) + 1 < int(match.group(1)):
+        raise click.BadParameter("invalid input range: '{}'".format(value))
+    return int(match.group(1)), int(match.group(2))
+
+
+@click.command(
+    help='Write a random permutation of the input lines to standard output. With no FILE, or when FILE is -, read standard input. '
+         'With -n and input that is not a regular file, lines are picked by reservoir sampling, so only COUNT of them '
+         'are held in memory.',
+    short_help='Generate random permutations',
+)
+@click.help_option('-h', '--help')
+@click.option('-e', '--echo', is_flag=True, default=False, help='treat each ARG as an input line')
+@click.option('-i', '--input-range', metavar='LO-HI', callback=check_range, help='treat each number LO through HI as an input line')
+@click.option('-n', '--head-count', metavar='COUNT', type=click.IntRange(min=0), help='output at most COUNT lines')
+@click.option('-o', '--output', metavar='FILE', default='-', help='write result to FILE instead of standard output')
+@click.option('--random-source', metavar='FILE', type=click.File('rb'), help='get random bytes from FILE')
+@click.option('-r', '--repeat', is_flag=True, default=False, help='output lines can be repeated')
+@click.option('-z', '--zero-terminated', is_flag=True, default=False, help='line delimiter is NUL, not newline')
+@click.argument('args', metavar='[FILE]', required=False, nargs=-1)
+def subcommand(echo, input_range, head_count, output, random_source, repeat, zero_terminated, args):
+    separator = b'\0' if zero_terminated else b'\n'
+    if echo and input_range is not None:
+        raise click.UsageError('cannot combine -e and -i options')
+    if not echo and len(args) > (0 if input_range is not None else 1):
+        raise click.UsageError("extra operand '{}'".format(args[-1 if input_range is None else 0]))
+
+    rng = RandomSource(random_source) if random_source is not None else random.Random()
+    count = head_count
+    if count is None and not repeat:
+        count = sys.maxsize
+
+    try:
+        if count == 0:
+            lines = []
+        elif echo:
+            encoding = sys.getfilesystemencoding()
+            lines = [click.format_filename(arg).encode(encoding) for arg in args]
+        elif input_range is not None:
+            lines = NumberLines(*input_range)
+        else:
+            path = args[0] if args else '-'
+            lines = read_input(path, separator, count, repeat, rng, output)
+
+        if repeat:
+            if count != 0 and not len(lines):
+                raise ShufError('no lines to repeat')
+            selected = repeated_lines(lines, count, rng)
+        else:
+            selected = shuffled_lines(lines, count, rng)
+
+        with click.open_file(output, 'wb') as fd:
+            write_lines(fd, selected, separator)
+    except ShufError as e:
+        click.echo('{}: {}'.format(COMMAND_NAME, e), err=True)
+        sys.exit(1)
+    except EnvironmentError as e:
+        click.echo('{}: {}: {}'.format(COMMAND_NAME, click.format_filename(e.filename or output), e.strerror), err=True)
+        sys.exit(1)
+
+
+def read_input(path, separator, count, repeat, rng, output='-'):
+    """
+    Returns the lines of the file at `path` as a sequence, or only a random
+    sample of `count` of them when only that many are needed
+
+    Regular files are indexed in place, see `LineIndex`. Anything else is
+    read in blocks, and only a reservoir of `count` lines is kept when
+    neither every line nor repeats are needed.
+    """
+    fd = click.get_binary_stream('stdin') if path == '-' else open(path, 'rb')
+    try:
+        mapped = _map_file(fd, output)
+        if mapped is not None:
+            return LineIndex(mapped[0], separator, mapped[1])
+
+        records = read_records(fd, separator)
+        if repeat or count == sys.maxsize:
+            return list(records)
+        # The reservoir is in input order at first, so it is shuffled on output
+        return reservoir_sample(records, count, rng)
+    finally:
+        if path != '-':
+            fd.close()
+
+
+def shuffled_lines(lines, count, rng):
+    """
+    Yields up to `count` of `lines` in a random order
+
+    Only indexes into `lines` are shuffled, or sampled when few lines are
+    picked, so that no line is read before it is output.
+    """
+    total = len(lines)
+    if count >= total:
+        order = array.array(OFFSET_TYPECODE, range(total))
+        rng.shuffle(order)
+    else:
+        order = rng.sample(range(total), count)
+    for index in order:
+        yield lines[index]
+
+
+def repeated_lines(lines, count, rng):
+    """
+    Yields `count` lines picked at random from `lines`, forever when `count` is None
+    """
+    total = len(lines)
+    randbelow = rng.randrange
+    picks = itertools.repeat(None) if count is None else itertools.repeat(None, count)
+    for _ in picks:
+        yield lines[randbelow(total)]
+
+
+def reservoir_sample(items, k, rng):
+    """
+    Returns a uniform random sample of `k` of `items`, or all of them if
+    there are fewer, holding only `k` at a time
+
+    This is Li's algorithm L: rather than drawing a random number for every
+    item, the number of items to skip before the next replacement is drawn,
+    so skipped items are just consumed.
+    """
+    items = iter(items)
+    reservoir = list(itertools.islice(items, k))
+    if len(reservoir) < k:
+        return reservoir
+
+    weight = math.exp(math.log(_open_uniform(rng)) / k)
+    missing = object()
+    while True:
+        # A weight that rounds to 1 would skip forever
+        weight = min(weight, 1 - 2.0 ** -53)
+        skip = int(math.log(_open_uniform(rng)) / math.log1p(-weight))
+        item = next(itertools.islice(items, skip, None), missing)
+        if item is missing:
+            return reservoir
+        reservoir[rng.randrange(k)] = item
+        weight *= math.exp(math.log(_open_uniform(rng)) / k)
+
+
+def _open_uniform(rng):
+    """
+    Returns a random float strictly between 0 and 1
+    """
+    while True:
+        value = rng.random()
+        if value > 0:
+            return value
+
+
+class LineIndex(object):
+    def __init__(self, data, separator=b'\n', start=0):
+        """
+        The lines of `data` from `start`, a memory map or bytes, by number
+
+        Only the offset of each line is kept, found with a single pass of
+        `find` over `data`, so shuffling a huge file costs 8 bytes a line
+        rather than a bytes object per line.
+        """
+        self.data = data
+        offsets = array.array(OFFSET_TYPECODE, [start])
+        append = offsets.append
+        find = data.find
+        position = find(separator, start)
+        while position != -1:
+            append(position + 1)
+            position = find(separator, position + 1)
+        # Every line is followed by a separator, so an unterminated last line
+        #  ends just past the end of the data
+        if offsets[-1] != len(data):
+            append(len(data) + 1)
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        return self.data[self.offsets[index]:self.offsets[index + 1] - 1]
+
+
+class NumberLines(object):
+    def __init__(self, low, high):
+        """
+        The numbers `low` through `high` as lines, formatted when they are read
+        """
+        self.low = low
+        self.size = high - low + 1
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        return str(self.low + index).encode('ascii')
+
+
+class RandomSource(random.Random):
+    def __init__(self, fd):
+        """
+        A random number generator taking its randomness from the bytes of
+        `fd`, so that the same source gives the same output
+        """
+        self.fd = fd
+        random.Random.__init__(self)
+
+    def read(self, size):
+        data = self.fd.read(size)
+        if len(data) < size:
+            raise ShufError('{}: end of file'.format(click.format_filename(self.fd.name)))
+        return data
+
+    def getrandbits(self, k):
+        value = 0
+        for byte in bytearray(self.read((k + 7) // 8)):
+            value = value << 8 | byte
+        return value >> (-k % 8)
+
+    def random(self):
+        return self.getrandbits(53) * 2.0 ** -53
+
+
+def _map_file(fd, output='-'):
+    """
+    Returns (data, start) for the rest of `fd` if it is a regular file
+
+    The data is a memory map of the whole file, or bytes read from the
+    current position when it is also `output`, which is truncated before
+    the lines are written. Returns None for anything else.
+    """
+    try:
+        fileno = fd.fileno()
+        st = os.fstat(fileno)
+    except (AttributeError, ValueError, EnvironmentError):
+        # eg. BytesIO
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+
+    if output != '-':
+        try:
+            out_st = os.stat(output)
+        except OSError:
+            pass
+        else:
+            if (out_st.st_dev, out_st.st_ino) == (st.st_dev, st.st_ino):
+                return fd.read(), 0
+
+    if st.st_size == 0:
+        return fd.read(), 0
+    try:
+        mapped = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    except (EnvironmentError, mmap.error):
+        return fd.read(), 0
+    # Start wherever the file position is, as for a redirected standard input
+    return mapped, min(fd.tell(), len(mapped))
@@ -0,0 +1,416 @@
+import errno
+import heapq
+import itertools
+import os
+import re
+import sys
+import tempfile
+
+from ...utils import ordered_imap, parse_size
+from ...vendor import click
+
+
+COMMAND_NAME = 'sort'
+
+# The default amount of line data kept in memory before spilling to disk
+BUFFER_SIZE = 128 * 1024 * 1024
+
+# Python's per-line overhead (the bytes object and its slot in a list)
+LINE_OVERHEAD = 64
+
+# The most temporary files merged at once. More are merged in several passes.
+MERGE_BATCH = 64
+
+KEYDEF_REGEX = re.compile(r'^(\d+)(?:\.(\d+))?([bfnr]*)(?:,(\d+)(?:\.(\d+))?([bfnr]*))?$')
+
+# Without -t a field is a run of non-blanks along with the blanks before it
+BLANK_FIELD_REGEX = re.compile(br'[ \t]*[^ \t\n]+')
+
+NUMBER_REGEX = re.compile(br'^[ \t]*(-?[0-9]*(?:\.[0-9]*)?)')
+
+
+class KeySpec(object):
+    def __init__(self, start_field, start_char=1, end_field=None, end_char=0, options=''):
+        """
+        A sort key as given to -k, see `parse_keydef`
+
+        Fields and characters are counted from 1. An `end_char` of 0 means the
+        end of `end_field`, and an `end_field` of None the end of the line.
+
+        :param options: any of 'b' (ignore leading blanks), 'f' (fold lower
+                        case to upper case), 'n' (numeric) and 'r' (reverse)
+        """
+        self.start_field = start_field
+        self.start_char = start_char
+        self.end_field = end_field
+        self.end_char = end_char
+        self.options = options
+        self.blanks = 'b' in options
+        self.fold = 'f' in options
+        self.numeric = 'n' in options
+        self.reverse = 'r' in options
+
+    def extract(self, line, separator):
+        """
+        Returns the part of `line` this key compares, as bytes
+        """
+        if self.start_field == 1 and self.start_char == 1 and self.end_field is None:
+            return line.rstrip(b'\n')
+
+        if separator is None:
+            spans = [m.span() for m in BLANK_FIELD_REGEX.finditer(line)]
+        else:
+            spans = []
+            start = 0
+            while True:
+                end = line.find(separator, start)
+                if end == -1:
+                    spans.append((start, len(line.rstrip(b'\n'))))
+                    break
+                spans.append((start, end))
+                start = end + len(separator)
+
+        if self.start_field > len(spans):
+            return b''
+        start = self._offset(line, spans[self.start_field - 1], self.start_char)
+
+        if self.end_field is None or self.end_field > len(spans):
+            end = len(line.rstrip(b'\n'))
+        elif self.end_char == 0:
+            end = spans[self.end_field - 1][1]
+        else:
+            end = self._offset(line, spans[self.end_field - 1], self.end_char + 1)
+
+        return line[start:end]
+
+    def _offset(self, line, span, char):
+        offset = span[0]
+        if self.blanks:
+            while offset < span[1] and line[offset:offset + 1] in (b' ', b'\t'):
+                offset += 1
+        return min(offset + char - 1, span[1])
+
+
+class SortKey(object):
+    def __init__(self, keyspecs, separator=None, reverse=False, last_resort=True):
+        """
+        A picklable key function for sorting lines of bytes
+
+        :param keyspecs: a list of `KeySpec`, compared in order
+        :param separator: the field separator, or None for blank separated fields
+        :param reverse: whether the sort as a whole is reversed
+        :param last_resort: whether to compare whole lines when all keys are equal
+        """
+        self.keyspecs = keyspecs
+        self.separator = separator
+        self.reverse = reverse
+        self.last_resort = last_resort
+
+    def __call__(self, line):
+        key = []
+        for keyspec in self.keyspecs:
+            value = keyspec.extract(line, self.separator)
+            if keyspec.blanks:
+                value = value.lstrip(b' \t')
+            if keyspec.fold:
+                value = value.upper()
+            if keyspec.numeric:
+                value = parse_number(value)
+            # The whole sort is reversed, so keys that are reversed on their
+            # own must be flipped back
+            if keyspec.reverse != self.reverse:
+                value = Reversed(value)
+            key.append(value)
+
+        if self.last_resort:
+            key.append(line)
+        return tuple(key)
+
+    def without_last_resort(self):
+        return SortKey(self.keyspecs, self.separator, self.reverse, last_resort=False)
+
+
+class Reversed(object):
+    """
+    Wraps a value so that it compares in the opposite order
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __gt__(self, other):
+        return other.value > self.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __ne__(self, other):
+        return self.value != other.value
+
+    def __getstate__(self):
+        return self.value
+
+    def __setstate__(self, state):
+        self.value = state
+
+
+def parse_number(value):
+    """
+    Returns the leading number of `value` as a float, or 0 if there is none
+    """
+    number = NUMBER_REGEX.match(value).group(1)
+    if not number.strip(b'-.'):
+        return 0.0
+    return float(number)
+
+
+def parse_keydef(ctx, param, values):
+    keyspecs = []
+    for value in values:
+        match = KEYDEF_REGEX.match(value)
+        if not match:
+            raise click.BadParameter('invalid key definition "{}"'.format(value))
+
+        start_field, start_char, start_options, end_field, end_char, end_options = match.groups()
+        if int(start_field) == 0 or (start_char is not None and int(start_char) == 0):
+            raise click.BadParameter('field and character positions start at 1 in "{}"'.format(value))
+        if end_field is not None and int(end_field) == 0:
+            raise click.BadParameter('field positions start at 1 in "{}"'.format(value))
+
+        keyspecs.append(KeySpec(
+            int(start_field),
+            int(start_char or 1),
+            int(end_field) if end_field else None,
+            int(end_char or 0),
+            start_options + (end_options or ''),
+        ))
+    return keyspecs
+
+
+def parse_buffer_size(ctx, param, value):
+    if value is None:
+        return BUFFER_SIZE
+    try:
+        # Like GNU sort, a bare number is in kibibytes
+        return max(1, parse_size(value, default_unit='K'))
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+
+@click.command(
+    help='Write the sorted concatenation of all FILEs to standard output. With no FILE, read standard input. '
+         'Input larger than the buffer size is sorted in runs that are spilled to temporary files and merged.',
+    short_help='Sort lines of text files',
+)
+@click.help_option('-h', '--help')
+@click.option('-b', '--ignore-leading-blanks', is_flag=True, default=False, help='ignore leading blanks')
+@click.option('-f', '--ignore-case', is_flag=True, default=False, help='fold lower case to upper case characters')
+@click.option('-n', '--numeric-sort', is_flag=True, default=False, help='compare according to string numerical value')
+@click.option('-r', '--reverse', is_flag=True, default=False, help='reverse the result of comparisons')
+@click.option('-k', '--key', 'keyspecs', metavar='KEYDEF', multiple=True, callback=parse_keydef,
+              help='sort via a key; KEYDEF is F[.C][OPTS][,F[.C][OPTS]] with OPTS from "bfnr"')
+@click.option('-t', '--field-separator', metavar='SEP', help='use SEP instead of non-blank to blank transition')
+@click.option('-s', '--stable', is_flag=True, default=False, help='stabilize sort by disabling last-resort comparison')
+@click.option('-u', '--unique', is_flag=True, default=False, help='output only the first of an equal run')
+@click.option('-o', '--output', metavar='FILE', default='-', help='write result to FILE instead of standard output')
+@click.option('-S', '--buffer-size', metavar='SIZE', callback=parse_buffer_size, help='use SIZE for the main memory buffer (default 128M)')
+@click.option('-T', '--temporary-directory', metavar='DIR', type=click.Path(file_okay=False, exists=True),
+              help='use DIR for temporaries, not $TMPDIR or /tmp')
+@click.option('--parallel', metavar='N', type=click.IntRange(min=1), default=1, help='sort up to N runs concurrently')
+@click.argument('files', metavar='FILE', required=False, nargs=-1, type=click.File('rb'))
+def subcommand(ignore_leading_blanks, ignore_case, numeric_sort, reverse, keyspecs, field_separator, stable, unique,
+               output, buffer_size, temporary_directory, parallel, files):
+    if len(files) == 0:
+        files = (click.get_binary_stream('stdin'),)
+
+    separator = None
+    if field_separator is not None:
+        separator = click.format_filename(field_separator).encode(sys.getfilesystemencoding())
+        if len(separator) != 1:
+            raise click.BadParameter('the separator must be a single character', param_hint='"-t"')
+
+    # The global ordering options apply to keys that don't set any of their own
+    options = ''.join(flag for flag, enabled in zip('bfnr', (ignore_leading_blanks, ignore_case, numeric_sort, reverse)) if enabled)
+    keyspecs = [
+        k if k.options else KeySpec(k.start_field, k.start_char, k.end_field, k.end_char, options)
+        for k in keyspecs
+    ]
+
+    if not keyspecs and (ignore_leading_blanks or ignore_case or numeric_sort):
+        keyspecs = [KeySpec(1, options=options)]
+
+    key = None
+    if keyspecs:
+        key = SortKey(keyspecs, separator, reverse, last_resort=not (stable or unique))
+
+    sorter = ExternalSorter(key, reverse, buffer_size, parallel, temporary_directory)
+    lines = sorter.sort(files)
+
+    if unique:
+        lines = unique_lines(lines, key.without_last_resort() if key else None)
+
+    # The output is only opened once all input has been read, so it can safely
+    # be one of the input files
+    try:
+        with click.open_file(output, 'wb') as fd:
+            fd.writelines(lines)
+            fd.flush()
+    except EnvironmentError as e:
+        if e.errno != errno.EPIPE:
+            raise
+        # Behave as if killed by SIGPIPE, like GNU sort
+        sys.exit(1)
+
+
+class ExternalSorter(object):
+    def __init__(self, key=None, reverse=False, buffer_size=BUFFER_SIZE, parallel=1, tmpdir=None):
+        """
+        Sorts lines of bytes using a bounded amount of memory
+
+        Input is split into runs that fit the buffer. If there is more than
+        one, each run is sorted (on `parallel` processes) and written to a
+        temporary file, and the files are then merged.
+
+        :param key: a picklable key function like `SortKey`, or None to compare whole lines
+        """
+        self.key = key
+        self.reverse = reverse
+        self.parallel = parallel
+        self.tmpdir = tmpdir
+        self.paths = []
+
+        # The run being read, the runs being sorted and the next run's lines
+        #  all need to fit within the buffer
+        self.run_size = max(1, buffer_size // (parallel + 2))
+
+    def sort(self, files):
+        """
+        Reads all of `files` and returns an iterator over their lines in sorted order
+        """
+        runs = self.read_runs(files)
+        first = next(runs, [])
+        second = next(runs, None)
+        if second is None:
+            first.sort(key=self.key, reverse=self.reverse)
+            return iter(first)
+
+        # Hand runs over without keeping references to them here, so each one
+        #  is freed as soon as it has been written out
+        runs = itertools.chain(consume([first, second]), runs)
+        del first, second
+
+        try:
+            jobs = ((run, self.key, self.reverse, self.tmpdir) for run in runs)
+            for path in ordered_imap(sort_run, jobs, self.parallel, backlog=1, processes=True):
+                self.paths.append(path)
+
+            # Merge neighbouring runs, so that equal lines stay in input order
+            while len(self.paths) > MERGE_BATCH:
+                paths, self.paths = self.paths, []
+                for i in range(0, len(paths), MERGE_BATCH):
+                    batch = paths[i:i + MERGE_BATCH]
+                    self.paths.append(write_run(self.merge(batch), self.tmpdir))
+                    self.remove(batch)
+        except BaseException:
+            self.remove(self.paths)
+            raise
+
+        return self.merge(self.paths, remove=True)
+
+    def read_runs(self, files):
+        """
+        Yields lists of lines whose total size is about `run_size`
+        """
+        run = []
+        size = 0
+        for fd in files:
+            for line in fd:
+                if not line.endswith(b'\n'):
+                    line += b'\n'
+                run.append(line)
+                size += len(line) + LINE_OVERHEAD
+                if size >= self.run_size:
+                    yield run
+                    run = []
+                    size = 0
+        yield run
+
+    def merge(self, paths, remove=False):
+        """
+        Yields the lines of the sorted files at `paths` in sorted order
+
+        :param remove: remove the files once done
+        """
+        fds = []
+        try:
+            fds = [open(path, 'rb') for path in paths]
+            heap = []
+            for index, fd in enumerate(fds):
+                self._push(heap, fd, index)
+
+            while heap:
+                _, index, line = heapq.heappop(heap)
+                yield line
+                self._push(heap, fds[index], index)
+        finally:
+            for fd in fds:
+                fd.close()
+            if remove:
+                self.remove(paths)
+
+    def _push(self, heap, fd, index):
+        line = fd.readline()
+        if not line:
+            return
+
+        key = self.key(line) if self.key else line
+        if self.reverse:
+            key = Reversed(key)
+        # The index breaks ties, keeping equal lines in input order
+        heapq.heappush(heap, (key, index, line))
+
+    def remove(self, paths):
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def consume(items):
+    while items:
+        yield items.pop(0)
+
+
+def sort_run(job):
+    """
+    Sorts a run of lines into a temporary file and returns its path
+
+    This runs in a worker process with --parallel.
+    """
+    lines, key, reverse, tmpdir = job
+    lines.sort(key=key, reverse=reverse)
+    return write_run(lines, tmpdir)
+
+
+def write_run(lines, tmpdir):
+    fd, path = tempfile.mkstemp(prefix='pycoreutils-sort-', dir=tmpdir)
+    with os.fdopen(fd, 'wb') as f:
+        f.writelines(lines)
+    return path
+
+
+def unique_lines(lines, key):
+    """
+    Yields the first of each run of lines that compare equal
+    """
+    previous = object()
+    for line in lines:
+        current = key(line) if key else line
+        if current != previous:
+            yield line
+        previous = current
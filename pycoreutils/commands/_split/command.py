@@ -0,0 +1,623 @@
+import contextlib
+import errno
+import itertools
+import os
+import stat
+import string
+import subprocess
+import sys
+
+from ...utils import BLOCK_SIZE, parse_size, read_blocks
+from ...vendor import click
+
+
+COMMAND_NAME = 'split'
+
+LINES = 1000
+
+SUFFIX_LENGTH = 2
+
+# How much is read at a time when looking for a newline near a cut point
+SEARCH_SIZE = 64 * 1024
+
+# The most asked of copy_file_range or sendfile in one call
+MAX_CHUNK = 1 << 30
+
+# Errors meaning a system call cannot copy between this pair of files, as
+#  opposed to the copy itself failing
+UNSUPPORTED = frozenset(
+    getattr(errno, name) for name in ('EINVAL', 'ENOSYS', 'EXDEV', 'EBADF', 'EOPNOTSUPP', 'ENOTSUP', 'ETXTBSY')
+    if hasattr(errno, name)
+)
+
+
+def check_size(ctx, param, value):
+    if value is None:
+        return None
+    try:
+        size = parse_size(value)
+    except ValueError:
+        size = 0
+    if size < 1:
+        raise click.BadParameter("invalid number of bytes: '{}'".format(value))
+    return size
+
+
+def check_chunks(ctx, param, value):
+    """
+    Parses CHUNKS into (kind, k, n), where kind is 'bytes', 'lines' or
+    'round' and k is None when every chunk is written
+    """
+    if value is None:
+        return None
+
+    parts = value.split('/')
+    kind = {'l': 'lines', 'r': 'round'}.get(parts[0])
+    if kind is not None:
+        parts = parts[1:]
+    else:
+        kind = 'bytes'
+
+    if not 1 <= len(parts) <= 2 or not all(part.isdigit() for part in parts):
+        raise click.BadParameter("invalid number of chunks: '{}'".format(value))
+
+    n = int(parts[-1])
+    k = int(parts[0]) if len(parts) == 2 else None
+    if n == 0:
+        raise click.BadParameter("invalid number of chunks: '{}'".format(value))
+    if k is not None and not 1 <= k <= n:
+        raise click.BadParameter("invalid chunk number: '{}'".format(parts[0]))
+    return kind, k, n
+
+
+@click.command(
+    help='Output pieces of FILE to PREFIXaa, PREFIXab, ...; default size is 1000 lines, and default PREFIX is "x". '
+         'With no FILE, or when FILE is -, read standard input. '
+         'CHUNKS may be N (split into N files based on size of input), K/N (output Kth of N to stdout), '
+         'l/N (split into N files without splitting lines), l/K/N (output Kth of N to stdout without splitting lines), '
+         'r/N (like l but use round robin distribution) or r/K/N (likewise but only output Kth of N to stdout). '
+         'Pieces of regular files are copied by the kernel where it can, without passing through Python.',
+    short_help='Split a file into pieces',
+)
+@click.help_option('-h', '--help')
+@click.option('-a', '--suffix-length', metavar='N', type=click.IntRange(min=1),
+              help='generate suffixes of length N (default {})'.format(SUFFIX_LENGTH))
+@click.option('-b', '--bytes', 'byte_size', metavar='SIZE', callback=check_size, help='put SIZE bytes per output file')
+@click.option('-C', '--line-bytes', metavar='SIZE', callback=check_size, help='put at most SIZE bytes of records per output file')
+@click.option('-d', '--numeric-suffixes', is_flag=True, default=False, help='use numeric suffixes instead of alphabetic')
+@click.option('-e', '--elide-empty-files', is_flag=True, default=False, help='do not generate empty output files with "-n"')
+@click.option('--filter', 'filter_command', metavar='COMMAND', help='write to shell COMMAND; file name is $FILE')
+@click.option('-l', '--lines', metavar='NUMBER', type=click.IntRange(min=1), help='put NUMBER lines per output file')
+@click.option('-n', '--number', 'chunks', metavar='CHUNKS', callback=check_chunks, help='generate CHUNKS output files; see explanation below')
+@click.option('--verbose', is_flag=True, default=False, help='print a diagnostic just before each output file is opened')
+@click.argument('input', metavar='[FILE', required=False, default='-', type=click.Path(allow_dash=True))
+@click.argument('prefix', metavar='[PREFIX]]', required=False, default='x')
+def subcommand(suffix_length, byte_size, line_bytes, numeric_suffixes, elide_empty_files, filter_command, lines, chunks, verbose,
+               input, prefix):
+    if sum(value is not None for value in (byte_size, line_bytes, lines, chunks)) > 1:
+        raise click.UsageError('cannot split in more than one way')
+    if byte_size is None and line_bytes is None and chunks is None and lines is None:
+        lines = LINES
+
+    alphabet = string.digits if numeric_suffixes else string.ascii_lowercase
+    widen = suffix_length is None
+    if chunks is not None:
+        # The number of outputs is known, so suffixes are made long enough up front
+        widen = False
+        needed = 1
+        while len(alphabet) ** needed < chunks[2]:
+            needed += 1
+        if suffix_length is not None and suffix_length < needed:
+            raise click.UsageError('the suffix length needs to be at least {}'.format(needed))
+        suffix_length = max(suffix_length or SUFFIX_LENGTH, needed)
+    suffix_length = suffix_length or SUFFIX_LENGTH
+
+    try:
+        if input == '-':
+            fd = click.get_binary_stream('stdin')
+        else:
+            fd = open(input, 'rb')
+    except IOError as e:
+        click.echo("{}: cannot open '{}' for reading: {}".format(COMMAND_NAME, click.format_filename(input), e.strerror), err=True)
+        sys.exit(1)
+
+    in_fd = _fileno(fd)
+    in_st = os.fstat(in_fd) if in_fd is not None else None
+    names = (prefix + suffix for suffix in suffixes(alphabet, suffix_length, widen))
+    outputs = Outputs(names, filter_command, verbose, in_st)
+
+    try:
+        if chunks is not None and chunks[0] == 'round':
+            split_round_robin(fd, outputs, chunks[1], chunks[2], elide_empty_files)
+        elif in_st is not None and (stat.S_ISREG(in_st.st_mode) or (chunks is not None and _is_seekable(in_fd))):
+            # Start wherever the file position is, as for a redirected standard input
+            start = os.lseek(in_fd, 0, os.SEEK_CUR)
+            if stat.S_ISREG(in_st.st_mode):
+                end = max(start, in_st.st_size)
+            else:
+                # eg. /dev/null, whose size is only known by seeking
+                end = max(start, os.lseek(in_fd, 0, os.SEEK_END))
+            if chunks is not None:
+                kind, k, n = chunks
+                if kind == 'bytes':
+                    pieces = chunk_pieces(start, end, n)
+                else:
+                    pieces = line_chunk_pieces(in_fd, start, end, n)
+                if k is not None:
+                    piece_start, piece_end = next(itertools.islice(pieces, k - 1, None))
+                    copy_range(in_fd, click.get_binary_stream('stdout'), piece_start, piece_end - piece_start)
+                    return
+            elif byte_size is not None:
+                pieces = byte_pieces(start, end, byte_size)
+            elif line_bytes is not None:
+                pieces = line_byte_pieces(in_fd, start, end, line_bytes)
+            else:
+                pieces = line_pieces(in_fd, start, end, lines)
+            split_regular(in_fd, pieces, outputs, elide_empty_files)
+        elif chunks is not None:
+            raise SplitError('{}: cannot determine file size'.format(click.format_filename(input)))
+        else:
+            blocks = read_blocks(fd)
+            if byte_size is not None:
+                parts = stream_byte_parts(blocks, byte_size)
+            elif line_bytes is not None:
+                parts = stream_line_byte_parts(blocks, line_bytes)
+            else:
+                parts = stream_line_parts(blocks, lines)
+            split_stream(parts, outputs)
+    except SplitError as e:
+        click.echo('{}: {}'.format(COMMAND_NAME, e), err=True)
+        sys.exit(1)
+    except EnvironmentError as e:
+        click.echo('{}: {}'.format(COMMAND_NAME, e.strerror or e), err=True)
+        sys.exit(1)
+    finally:
+        try:
+            outputs.close()
+        finally:
+            if input != '-':
+                fd.close()
+
+
+class SplitError(Exception):
+    pass
+
+
+def suffixes(alphabet, length, widen=False):
+    """
+    Yields the suffixes of output files in order
+
+    When widening, as GNU split does when no suffix length is given, the
+    suffixes starting with the last letter of `alphabet` are skipped and
+    that letter is instead added to the suffixes after them, which are one
+    longer. So 'yz' is followed by 'zaaa', and '89' by '9000'.
+
+    >>> list(suffixes('01', 2, widen=True))[:5]
+    ['00', '01', '1000', '1001', '1010']
+    """
+    prefix = ''
+    while True:
+        for letters in itertools.product(alphabet, repeat=length):
+            if widen and letters[0] == alphabet[-1]:
+                break
+            yield prefix + ''.join(letters)
+        else:
+            return
+
+        prefix += alphabet[-1]
+        length += 1
+
+
+class Outputs(object):
+    def __init__(self, names, filter_command=None, verbose=False, input_st=None):
+        """
+        Hands out outputs named after `names` in order
+
+        :param names: an iterator over the names of the output files
+        :param filter_command: a shell command to run per output, with the
+                               name in $FILE, that is written to instead
+        :param input_st: the stat of the input, which is never overwritten
+        """
+        self.names = names
+        self.filter_command = filter_command
+        self.verbose = verbose
+        self.input_st = input_st
+        self.current = None
+
+    def create(self):
+        """
+        Returns the next `Output`
+        """
+        name = next(self.names, None)
+        if name is None:
+            raise SplitError('output file suffixes exhausted')
+        return Output(name, self.filter_command, self.verbose, self.input_st)
+
+    def open(self):
+        """
+        Closes the current output and returns the next one
+        """
+        self.close()
+        self.current = self.create()
+        return self.current
+
+    def close(self):
+        if self.current is not None:
+            current, self.current = self.current, None
+            current.close()
+
+
+class Output(object):
+    def __init__(self, name, filter_command=None, verbose=False, input_st=None):
+        """
+        An output file, or a pipe to a filter command, see `Outputs`
+        """
+        self.name = name
+        self.filter_command = filter_command
+        self.process = None
+
+        if filter_command is not None:
+            if verbose:
+                click.echo('executing with FILE={}'.format(name))
+            env = dict(os.environ, FILE=name)
+            self.process = subprocess.Popen(filter_command, shell=True, stdin=subprocess.PIPE, env=env)
+            self.file = self.process.stdin
+            return
+
+        if verbose:
+            click.echo("creating file '{}'".format(name))
+        if input_st is not None and stat.S_ISREG(input_st.st_mode):
+            try:
+                st = os.stat(name)
+            except OSError:
+                pass
+            else:
+                if (st.st_dev, st.st_ino) == (input_st.st_dev, input_st.st_ino):
+                    raise SplitError("'{}' would overwrite input; aborting".format(name))
+        self.file = open(name, 'wb')
+
+    def write(self, data):
+        with self.ignore_closed_filter():
+            self.file.write(data)
+
+    def copy_range(self, in_fd, offset, count):
+        with self.ignore_closed_filter():
+            copy_range(in_fd, self.file, offset, count)
+
+    @contextlib.contextmanager
+    def ignore_closed_filter(self):
+        """
+        Ignores write errors due to a filter that stopped reading early, as GNU split does
+        """
+        try:
+            yield
+        except EnvironmentError as e:
+            if self.process is None or e.errno != errno.EPIPE:
+                raise
+
+    def close(self):
+        with self.ignore_closed_filter():
+            self.file.close()
+
+        if self.process is not None:
+            status = self.process.wait()
+            if status != 0:
+                raise SplitError('with FILE={}, exit {} from command: {}'.format(self.name, status, self.filter_command))
+
+
+def split_regular(in_fd, pieces, outputs, elide_empty=False):
+    """
+    Copies each (start, end) range of `in_fd` in `pieces` to its own output
+    """
+    for start, end in pieces:
+        if elide_empty and start == end:
+            continue
+        outputs.open().copy_range(in_fd, start, end - start)
+    outputs.close()
+
+
+def split_stream(parts, outputs):
+    """
+    Writes the (data, last) pairs of `parts` to outputs, moving to the next
+    one after each part marked as the last of its piece
+    """
+    output = None
+    for data, last in parts:
+        if output is None:
+            output = outputs.open()
+        output.write(data)
+        if last:
+            outputs.close()
+            output = None
+    outputs.close()
+
+
+def split_round_robin(fd, outputs, k, n, elide_empty=False):
+    """
+    Deals the lines of `fd` out to `n` outputs in turn, or writes only the
+    lines that fall to output `k` to standard output
+    """
+    if k is not None:
+        stdout = click.get_binary_stream('stdout')
+        stdout.writelines(itertools.islice(fd, k - 1, None, n))
+        return
+
+    # Outputs are first written in order, so opening them lazily still
+    #  names them in order, and leaves out the empty ones
+    files = [None] * n
+    try:
+        if not elide_empty:
+            files = [outputs.create() for _ in range(n)]
+        for index, line in enumerate(fd):
+            output = files[index % n]
+            if output is None:
+                output = files[index % n] = outputs.create()
+            output.write(line)
+    finally:
+        for output in files:
+            if output is not None:
+                output.close()
+
+
+def byte_pieces(start, end, size):
+    while start < end:
+        yield start, min(start + size, end)
+        start += size
+
+
+def line_pieces(fd, start, end, count):
+    """
+    Yields pieces of `count` lines, reading the input once in `SEARCH_SIZE` blocks
+    """
+    remaining = count
+    previous = offset = start
+    while offset < end:
+        data = _pread(fd, min(SEARCH_SIZE, end - offset), offset)
+        if not data:
+            break
+        cuts, remaining = line_cuts(data, count, remaining)
+        for cut in cuts:
+            yield previous, offset + cut
+            previous = offset + cut
+        offset += len(data)
+    if previous < end:
+        yield previous, end
+
+
+def line_byte_pieces(fd, start, end, size):
+    """
+    Yields pieces of up to `size` bytes that end at a newline, unless a
+    single line is longer than that
+    """
+    while start < end:
+        if end - start <= size:
+            yield start, end
+            return
+        piece_end = last_line_end(fd, start, start + size) or start + size
+        yield start, piece_end
+        start = piece_end
+
+
+def chunk_pieces(start, end, n):
+    """
+    Yields `n` pieces of equal size, apart from the last one taking the remainder
+
+    As with GNU split, pieces are at least a byte, so with fewer bytes than
+    pieces the last ones are empty.
+    """
+    size = max(1, (end - start) // n)
+    for k in range(n):
+        yield min(end, start + k * size), min(end, start + (k + 1) * size) if k < n - 1 else end
+
+
+def line_chunk_pieces(fd, start, end, n):
+    """
+    Like `chunk_pieces`, but moves every cut to just past the end of the line
+    it falls in, which is found by reading only around the cut
+
+    A piece is empty when a long line swallows its cut point, as with GNU split.
+    """
+    size = max(1, (end - start) // n)
+    previous = start
+    for k in range(1, n):
+        cut = max(previous, next_line_end(fd, min(end, start + k * size - 1), end))
+        yield previous, cut
+        previous = cut
+    yield previous, end
+
+
+def next_line_end(fd, offset, limit):
+    """
+    Returns the offset just past the first newline at or after `offset`, or `limit`
+    """
+    while offset < limit:
+        data = _pread(fd, min(SEARCH_SIZE, limit - offset), offset)
+        if not data:
+            break
+        index = data.find(b'\n')
+        if index != -1:
+            return offset + index + 1
+        offset += len(data)
+    return limit
+
+
+def last_line_end(fd, start, end):
+    """
+    Returns the offset just past the last newline between `start` and `end`, or None
+    """
+    while end > start:
+        offset = max(start, end - SEARCH_SIZE)
+        index = _pread(fd, end - offset, offset).rfind(b'\n')
+        if index != -1:
+            return offset + index + 1
+        end = offset
+    return None
+
+
+def line_cuts(data, count, remaining):
+    """
+    Returns the offsets just past every `count`th newline of `data`, the
+    first being the `remaining`th, and how many newlines past the end of
+    `data` the next cut is
+
+    The data is split once and the cuts are found by summing the lengths
+    of the lines between them, so no Python code runs per line.
+
+    >>> line_cuts(b'a\\nb\\nc\\nd', 2, 1)
+    ([2, 6], 2)
+    """
+    found = data.count(b'\n')
+    if found < remaining:
+        return [], remaining - found
+
+    lines = data.split(b'\n')
+    cuts = []
+    position = 0
+    # The index of the newline of the next cut, and of the first line after the last cut
+    index = remaining - 1
+    consumed = 0
+    while index < found:
+        position += sum(map(len, lines[consumed:index + 1])) + index + 1 - consumed
+        cuts.append(position)
+        consumed = index + 1
+        index += count
+    return cuts, index - found + 1
+
+
+def stream_byte_parts(blocks, size):
+    """
+    Yields (data, last) for pieces of `size` bytes of a stream
+    """
+    remaining = size
+    for view in blocks:
+        data = view.tobytes()
+        position = 0
+        while position < len(data):
+            taken = min(remaining, len(data) - position)
+            remaining -= taken
+            yield data[position:position + taken], remaining == 0
+            position += taken
+            if remaining == 0:
+                remaining = size
+
+
+def stream_line_parts(blocks, count):
+    """
+    Yields (data, last) for pieces of `count` lines of a stream
+    """
+    remaining = count
+    for view in blocks:
+        data = view.tobytes()
+        cuts, remaining = line_cuts(data, count, remaining)
+        position = 0
+        for cut in cuts:
+            yield data[position:cut], True
+            position = cut
+        if position < len(data):
+            yield data[position:], False
+
+
+def stream_line_byte_parts(blocks, size):
+    """
+    Yields (data, last) for the pieces `line_byte_pieces` would give for a stream
+
+    Only the part of the input that has yet to be cut is kept, so at most
+    `size` bytes and a block are held at a time.
+    """
+    pending = b''
+    for view in blocks:
+        data = pending + view.tobytes()
+        position = 0
+        while len(data) - position >= size:
+            index = data.rfind(b'\n', position, position + size)
+            end = position + size if index == -1 else index + 1
+            yield data[position:end], True
+            position = end
+        pending = data[position:]
+
+    if pending:
+        yield pending, True
+
+
+def copy_range(in_fd, output, offset, count):
+    """
+    Copies `count` bytes of `in_fd` from `offset` to the binary file object `output`
+
+    The kernel copies the data where it can: copy_file_range to regular
+    files, which may share extents on filesystems that support it, and
+    sendfile to anything else, such as the pipe to a filter.
+    """
+    out_fd = _fileno(output)
+    if out_fd is not None:
+        output.flush()
+        for method in (_copy_file_range, _sendfile):
+            copied = method(in_fd, out_fd, offset, count)
+            offset += copied
+            count -= copied
+            if count == 0:
+                return
+
+    while count > 0:
+        data = _pread(in_fd, min(BLOCK_SIZE, count), offset)
+        if not data:
+            break
+        output.write(data)
+        offset += len(data)
+        count -= len(data)
+    output.flush()
+
+
+def _copy_file_range(in_fd, out_fd, offset, count):
+    if not hasattr(os, 'copy_file_range'):
+        return 0
+    return _copy_loop(lambda offset, count: os.copy_file_range(in_fd, out_fd, count, offset), offset, count)
+
+
+def _sendfile(in_fd, out_fd, offset, count):
+    if not hasattr(os, 'sendfile'):
+        return 0
+    return _copy_loop(lambda offset, count: os.sendfile(out_fd, in_fd, offset, count), offset, count)
+
+
+def _copy_loop(copy, offset, count):
+    """
+    Calls `copy(offset, count)` until `count` bytes are copied, returning
+    how many were, which is fewer if the system call is not usable
+    """
+    copied = 0
+    while copied < count:
+        try:
+            result = copy(offset + copied, min(MAX_CHUNK, count - copied))
+        except OSError as e:
+            if e.errno in UNSUPPORTED:
+                break
+            if e.errno == errno.EINTR:
+                continue
+            raise
+        if not result:
+            break
+        copied += result
+    return copied
+
+
+def _pread(fd, count, offset):
+    if hasattr(os, 'pread'):
+        return os.pread(fd, count, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, count)
+
+
+def _is_seekable(fd):
+    try:
+        os.lseek(fd, 0, os.SEEK_CUR)
+    except OSError:
+        return False
+    return True
+
+
+def _fileno(fd):
+    try:
+        return fd.fileno()
+    except (AttributeError, ValueError, EnvironmentError):
+        # eg. BytesIO
+        return None
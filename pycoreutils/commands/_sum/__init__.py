@@ -0,0 +1 @@
+from .command import subcommand  # noqa
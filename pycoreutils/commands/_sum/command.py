@@ -0,0 +1,39 @@
+import sys
+
+from ..hasher import SumHasherCommand
+from ...utils import BLOCK_SIZE
+from ...vendor import click
+
+
+@click.command(
+    help='Print or check checksums and block counts. With no FILE, or when FILE is -, read standard input. '
+         'The BSD algorithm counts 1024 byte blocks, and the System V one 512 byte blocks.',
+    short_help='Checksum and count the blocks in a file',
+)
+@click.help_option('-h', '--help')
+@click.option('-r', 'algorithm', flag_value='bsd', default=True, help='use BSD sum algorithm (the default)')
+@click.option('-s', '--sysv', 'algorithm', flag_value='sysv', help='use System V sum algorithm')
+@click.option('-c', '--check', is_flag=True, default=False, help='read checksums from the FILEs and check them')
+@click.option('--tag', is_flag=True, default=False, help='Output a BSD-style checksum file')
+@click.option('--quiet', is_flag=True, default=False, help="don't print OK for each successfully verified file")
+@click.option('--status', is_flag=True, default=False, help="don't output anything, status code shows success")
+@click.option('-j', '--jobs', metavar='N', type=click.IntRange(min=1), default=1, help='hash up to N files concurrently')
+@click.option('--block-size', metavar='BYTES', type=click.IntRange(min=1), default=BLOCK_SIZE, help='read input BYTES at a time')
+@click.option('--cache', metavar='FILE', type=click.Path(dir_okay=False), envvar='PYCOREUTILS_CHECKSUM_CACHE',
+              help='reuse checksums of unchanged files stored in FILE when checking')
+@click.option('--no-cache', is_flag=True, default=False, help='do not use a checksum cache, even if one is configured')
+@click.option('--refresh', is_flag=True, default=False, help='rehash every file and update the checksum cache')
+@click.argument('files', metavar='FILE', required=False, nargs=-1, type=click.File('rb'))
+def subcommand(algorithm, check, tag, quiet, status, jobs, block_size, cache, no_cache, refresh, files):
+    print_names = len(files) > 0
+    if len(files) == 0:
+        files = (click.get_binary_stream('stdin'),)
+
+    if no_cache:
+        cache = None
+
+    hasher = SumHasherCommand(algorithm, tag, quiet, status, jobs, block_size, cache, refresh, print_names=print_names)
+    success = hasher.process_files(files, check)
+
+    if not success:
+        sys.exit(1)
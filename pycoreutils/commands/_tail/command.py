@@ -0,0 +1,441 @@
+import errno
+import os
+import stat
+import sys
+import time
+
+from ...utils import BLOCK_SIZE, parse_size
+from ...vendor import click
+
+
+COMMAND_NAME = 'tail'
+
+BUFSIZE = 64 * 1024
+
+# While following, the first sleep after new data is this short. Every idle
+#  poll doubles it, up to --sleep-interval.
+MIN_SLEEP = 0.01
+
+
+def parse_count(ctx, param, value):
+    """
+    Parses a count like '10', '+10' or '2K' into (from_start, number)
+    """
+    if value is None:
+        return None
+
+    from_start = value.startswith('+')
+    try:
+        return from_start, parse_size(value.lstrip('+-'))
+    except ValueError:
+        raise click.BadParameter("invalid number of {}: '{}'".format('bytes' if param.name == 'count_bytes' else 'lines', value))
+
+
+def check_interval(ctx, param, value):
+    if value < 0:
+        raise click.BadParameter("invalid number of seconds: '{}'".format(value))
+    return value
+
+
+@click.command(
+    help='Print the last 10 lines of each FILE to standard output. With more than one FILE, precede each with a header '
+         'giving the file name. With no FILE, or when FILE is -, read standard input.',
+    short_help='Output the last part of files',
+)
+@click.help_option('-h', '--help')
+@click.option('-c', '--bytes', 'count_bytes', metavar='[+]NUM', callback=parse_count,
+              help='output the last NUM bytes; or use -c +NUM to output starting with byte NUM of each file')
+@click.option('-n', '--lines', 'count_lines', metavar='[+]NUM', callback=parse_count,
+              help='output the last NUM lines, instead of the last 10; or use -n +NUM to output starting with line NUM')
+@click.option('-f', 'follow_descriptor', is_flag=True, default=False, help='output appended data as the file grows')
+@click.option('--follow', metavar='HOW', type=click.Choice(('name', 'descriptor')),
+              help='follow the file by name, reopening it when it is replaced, or by descriptor, like -f')
+@click.option('-F', 'follow_name', is_flag=True, default=False, help='same as --follow name --retry')
+@click.option('--retry', is_flag=True, default=False, help='keep trying to open a file if it is inaccessible')
+@click.option('--pid', metavar='PID', type=int, help='with -f, terminate after process ID, PID dies')
+@click.option('-s', '--sleep-interval', metavar='N', type=float, default=1.0, callback=check_interval,
+              help='with -f, sleep for at most N seconds between polls, less while the file is growing')
+@click.option('-q', '--quiet', '--silent', 'quiet', is_flag=True, default=False, help='never output headers giving file names')
+@click.option('-v', '--verbose', is_flag=True, default=False, help='always output headers giving file names')
+@click.argument('files', metavar='FILE', required=False, nargs=-1, type=click.Path(allow_dash=True))
+def subcommand(count_bytes, count_lines, follow_descriptor, follow, follow_name, retry, pid, sleep_interval, quiet, verbose, files):
+    if count_bytes is not None and count_lines is not None:
+        raise click.UsageError('cannot specify both --bytes and --lines')
+
+    if follow_name:
+        follow = 'name'
+        retry = True
+    elif follow_descriptor and not follow:
+        follow = 'descriptor'
+
+    # Like GNU tail, there is nothing to do, not even to open the files
+    from_start, number = count_bytes or count_lines or (False, 10)
+    if number == 0 and not from_start and not follow:
+        return
+
+    files = files or ('-',)
+    output = Output(click.get_binary_stream('stdout'), verbose or (len(files) > 1 and not quiet))
+
+    success = True
+    followers = []
+    for f in files:
+        filepath = 'standard input' if f == '-' else click.format_filename(f)
+        follower = Follower(f, filepath, output, by_name=follow == 'name' and f != '-', retry=retry)
+        try:
+            follower.open()
+        except EnvironmentError as e:
+            click.echo("{}: cannot open '{}' for reading: {}".format(COMMAND_NAME, filepath, e.strerror), err=True)
+            success = False
+            if follow and retry and follower.by_name:
+                followers.append(follower)
+            continue
+
+        try:
+            output.header(filepath)
+            if count_bytes is not None:
+                from_start, number = count_bytes
+                tail_bytes(follower.fd, output.stream, number, from_start)
+            else:
+                from_start, number = count_lines or (False, 10)
+                tail_lines(follower.fd, output.stream, number, from_start)
+        except EnvironmentError as e:
+            click.echo("{}: error reading '{}': {}".format(COMMAND_NAME, filepath, e.strerror), err=True)
+            success = False
+            follower.close()
+            continue
+
+        if follow and follower.can_follow():
+            followers.append(follower)
+        else:
+            follower.close()
+
+    output.stream.flush()
+    if followers:
+        follow_files(followers, output, sleep_interval, pid)
+
+    if not success:
+        sys.exit(1)
+
+
+def tail_lines(fd, output, number, from_start=False):
+    if from_start:
+        output.write(_skip_lines(fd, number - 1))
+        _copy_rest(fd, output)
+    elif _is_regular(fd):
+        output.write(_last_lines_seekable(fd, number))
+    else:
+        output.write(_last_lines_stream(fd, number))
+
+
+def tail_bytes(fd, output, number, from_start=False):
+    if from_start:
+        skip = max(number - 1, 0)
+        if _is_regular(fd):
+            fd.seek(skip, os.SEEK_CUR)
+        else:
+            while skip > 0:
+                data = fd.read(min(skip, BUFSIZE))
+                if not data:
+                    break
+                skip -= len(data)
+    elif _is_regular(fd):
+        start = fd.tell()
+        fd.seek(0, os.SEEK_END)
+        fd.seek(max(start, fd.tell() - number))
+    else:
+        pending = bytearray()
+        for data in _chunks(fd):
+            pending += data
+            if len(pending) > number:
+                del pending[:len(pending) - number]
+        output.write(bytes(pending))
+        return
+
+    _copy_rest(fd, output)
+
+
+def last_lines_start(data, number):
+    """
+    Returns the offset in `data` at which its last `number` lines start
+
+    The last line does not need to end with a newline.
+    """
+    if number == 0:
+        return len(data)
+
+    position = len(data)
+    if data.endswith(b'\n'):
+        position -= 1
+    for _ in range(number):
+        position = data.rfind(b'\n', 0, position)
+        if position == -1:
+            return 0
+    return position + 1
+
+
+def _last_lines_seekable(fd, number):
+    """
+    Returns the last `number` lines of a regular file, reading it backwards
+    from the end in growing blocks until enough newlines have been seen
+
+    The cost depends on the length of those lines rather than on the size of
+    the file.
+    """
+    start = fd.tell()
+    fd.seek(0, os.SEEK_END)
+    position = fd.tell()
+    blocks = []
+    newlines = 0
+    block_size = BUFSIZE
+    # One more newline than lines, in case the file ends with one
+    while position > start and newlines <= number:
+        size = min(block_size, position - start)
+        position -= size
+        fd.seek(position)
+        data = fd.read(size)
+        blocks.append(data)
+        newlines += data.count(b'\n')
+        block_size = min(block_size * 2, BLOCK_SIZE)
+
+    data = b''.join(reversed(blocks))
+    fd.seek(0, os.SEEK_END)
+    return data[last_lines_start(data, number):]
+
+
+def _last_lines_stream(fd, number):
+    """
+    Returns the last `number` lines of a stream, keeping only the blocks that
+    may hold them
+    """
+    blocks = []
+    counts = []
+    newlines = 0
+    for data in _chunks(fd):
+        blocks.append(data)
+        counts.append(data.count(b'\n'))
+        newlines += counts[-1]
+        # The oldest block is only needed while the others lack enough newlines
+        while len(blocks) > 1 and newlines - counts[0] > number:
+            newlines -= counts.pop(0)
+            blocks.pop(0)
+
+    data = b''.join(blocks)
+    return data[last_lines_start(data, number):]
+
+
+def _skip_lines(fd, number):
+    """
+    Reads past the first `number` lines of `fd`
+
+    Regular files are left positioned just after them. For streams, any data
+    read beyond them is returned instead.
+    """
+    while number > 0:
+        data = _read_some(fd)
+        if not data:
+            break
+
+        count = data.count(b'\n')
+        if count < number:
+            number -= count
+            continue
+
+        end = -1
+        for _ in range(number):
+            end = data.find(b'\n', end + 1)
+        rest = len(data) - end - 1
+        if rest and _is_regular(fd):
+            fd.seek(-rest, os.SEEK_CUR)
+            break
+        return data[end + 1:]
+
+    return b''
+
+
+def _copy_rest(fd, output):
+    for data in _chunks(fd):
+        output.write(data)
+
+
+def _chunks(fd):
+    while True:
+        data = _read_some(fd)
+        if not data:
+            return
+        yield data
+
+
+def _read_some(fd):
+    # read1 returns whatever is available rather than waiting for a full buffer
+    return getattr(fd, 'read1', fd.read)(BUFSIZE)
+
+
+def _is_regular(fd):
+    try:
+        return stat.S_ISREG(os.fstat(fd.fileno()).st_mode)
+    except (AttributeError, ValueError, EnvironmentError):
+        return False
+
+
+class Output(object):
+    def __init__(self, stream, headers):
+        """
+        Standard output, preceding each file's data with a header when asked
+        to, but only when the data comes from a different file than before
+        """
+        self.stream = stream
+        self.headers = headers
+        self.current = None
+
+    def header(self, filepath):
+        if self.headers and filepath != self.current:
+            self.stream.write('{}==> {} <==\n'.format('' if self.current is None else '\n', filepath).encode('utf-8'))
+        self.current = filepath
+
+
+class Follower(object):
+    def __init__(self, path, filepath, output, by_name=False, retry=False):
+        """
+        A file whose new data is written to `output` as it appears
+
+        :param path: the file to read, or '-' for standard input
+        :param filepath: the name used in headers and diagnostics
+        :param by_name: reopen `path` when it is replaced, eg. by log rotation
+        :param retry: keep trying to open `path` while it is inaccessible
+        """
+        self.path = path
+        self.filepath = filepath
+        self.output = output
+        self.by_name = by_name
+        self.retry = retry
+        self.fd = None
+        self.identity = None
+        self.missing = False
+
+    def open(self):
+        if self.path == '-':
+            self.fd = click.get_binary_stream('stdin')
+        else:
+            self.fd = open(self.path, 'rb')
+        st = os.fstat(self.fd.fileno()) if self.path != '-' else None
+        self.identity = (st.st_dev, st.st_ino) if st else None
+
+    def close(self):
+        if self.fd is not None and self.path != '-':
+            self.fd.close()
+        self.fd = None
+
+    def can_follow(self):
+        """
+        Whether more data can ever appear, which is not the case for pipes
+        """
+        try:
+            return not stat.S_ISFIFO(os.fstat(self.fd.fileno()).st_mode)
+        except (AttributeError, ValueError, EnvironmentError):
+            return False
+
+    def poll(self):
+        """
+        Writes out any new data, returning whether there was some
+        """
+        wrote = False
+        if self.fd is not None:
+            wrote = self._read_new()
+        if self.by_name:
+            wrote = self._check_name() or wrote
+        return wrote
+
+    def _read_new(self):
+        try:
+            if _is_regular(self.fd) and os.fstat(self.fd.fileno()).st_size < self.fd.tell():
+                click.echo('{}: {}: file truncated'.format(COMMAND_NAME, self.filepath), err=True)
+                self.fd.seek(0)
+        except (ValueError, EnvironmentError):
+            pass
+
+        wrote = False
+        for data in _chunks(self.fd):
+            if not wrote:
+                self.output.header(self.filepath)
+                wrote = True
+            self.output.stream.write(data)
+        return wrote
+
+    def _check_name(self):
+        """
+        Notices when the file has been removed or replaced, and follows the
+        one now at `path`
+        """
+        try:
+            st = os.stat(self.path)
+        except EnvironmentError as e:
+            if not self.missing:
+                click.echo("{}: '{}' has become inaccessible: {}".format(COMMAND_NAME, self.filepath, e.strerror), err=True)
+                self.missing = True
+                self.close()
+            return False
+
+        if (st.st_dev, st.st_ino) == self.identity:
+            return False
+
+        # Whatever was written to the old file before it was replaced
+        wrote = False
+        if self.fd is not None:
+            wrote = self._read_new()
+            self.close()
+            message = 'has been replaced'
+        else:
+            message = 'has appeared'
+
+        try:
+            self.open()
+        except EnvironmentError as e:
+            if not self.missing:
+                click.echo("{}: '{}' has become inaccessible: {}".format(COMMAND_NAME, self.filepath, e.strerror), err=True)
+                self.missing = True
+            return wrote
+
+        self.missing = False
+        click.echo("{}: '{}' {};  following new file".format(COMMAND_NAME, self.filepath, message), err=True)
+        return self._read_new() or wrote
+
+    @property
+    def alive(self):
+        return self.fd is not None or self.retry
+
+
+def follow_files(followers, output, sleep_interval, pid=None):
+    """
+    Polls `followers` for new data until killed, or until `pid` exits
+
+    Polling starts fast and backs off while the files are idle, so a growing
+    log is followed closely without busy polling a quiet one.
+    """
+    delay = MIN_SLEEP
+    try:
+        while any(follower.alive for follower in followers):
+            process_gone = pid is not None and not _process_exists(pid)
+
+            wrote = False
+            for follower in followers:
+                wrote = follower.poll() or wrote
+            if wrote:
+                output.stream.flush()
+                delay = MIN_SLEEP
+
+            if process_gone:
+                return
+
+            time.sleep(min(delay, sleep_interval))
+            if not wrote:
+                delay = min(delay * 2, sleep_interval)
+    except KeyboardInterrupt:
+        pass
+
+
+def _process_exists(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError as e:
+        return e.errno == errno.EPERM
+    return True
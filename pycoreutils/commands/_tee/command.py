@@ -1,25 +1,166 @@
+import errno
 import functools
+import sys
+import threading
+
+try:
+    import queue
+except ImportError:
+    # Python 2
+    import Queue as queue
 
 from ...vendor import click
 
 
+COMMAND_NAME = 'tee'
+
+BUFSIZE = 64 * 1024
+
+# The number of chunks a sink may fall behind before the reader waits for it
+QUEUE_DEPTH = 16
+
+OUTPUT_ERROR_MODES = ('warn', 'warn-nopipe', 'exit', 'exit-nopipe')
+
+
 @click.command(
     help='Copy standard input to each FILE and to standard output.',
 )
 @click.help_option('-h', '--help')
 @click.option('-a', '--append', is_flag=True, default=False, help='append to the given FILEs, do not overwrite')
+@click.option('-p', 'nopipe', is_flag=True, default=False, help='diagnose errors writing to non pipes (same as --output-error=warn-nopipe)')
+@click.option('--output-error', metavar='MODE', type=click.Choice(OUTPUT_ERROR_MODES),
+              help='set behavior on write error: {}'.format(', '.join(OUTPUT_ERROR_MODES)))
+@click.option('--buffer-size', metavar='BYTES', type=click.IntRange(min=1), default=BUFSIZE, help='read at most BYTES at a time')
 @click.argument('files', metavar='FILE', required=False, nargs=-1, type=click.Path())
-def subcommand(append, files):
+def subcommand(append, nopipe, output_error, buffer_size, files):
     stdin = click.get_binary_stream('stdin')
 
+    if nopipe and not output_error:
+        output_error = 'warn-nopipe'
+
     if append:
         mode = 'ab'
     else:
         mode = 'wb'
 
-    fds = [open(click.format_filename(f), mode) for f in files]
+    success = True
+    sinks = [Sink('standard output', click.get_binary_stream('stdout'), should_close=False)]
+    for f in files:
+        filepath = click.format_filename(f)
+        try:
+            sinks.append(Sink(filepath, open(filepath, mode)))
+        except IOError as e:
+            click.echo('{}: {}: {}'.format(COMMAND_NAME, filepath, e.strerror), err=True)
+            success = False
+
+    for sink in sinks:
+        sink.start()
+
+    # read1 returns whatever is available rather than waiting for a full buffer
+    read = getattr(stdin, 'read1', stdin.read)
+    try:
+        for data in iter(functools.partial(read, buffer_size), b''):
+            # Each sink writes from its own thread, so a slow sink only holds up
+            # the others once it is QUEUE_DEPTH chunks behind. The chunk itself
+            # is shared, not copied.
+            for sink in sinks:
+                if sink.error is None:
+                    sink.queue.put(data)
+
+            if not handle_errors(sinks, output_error):
+                success = False
+            if all(sink.error is not None for sink in sinks):
+                break
+    except SinkError:
+        success = False
+    finally:
+        for sink in sinks:
+            sink.stop()
+
+    try:
+        if not handle_errors(sinks, output_error):
+            success = False
+    except SinkError:
+        success = False
+
+    if not success:
+        sys.exit(1)
+
+
+class SinkError(Exception):
+    pass
+
+
+class Sink(threading.Thread):
+    def __init__(self, filepath, fd, should_close=True):
+        """
+        An output written to from its own thread through a bounded queue
+
+        :param filepath: the name used in diagnostics
+        :param fd: the binary file object to write to
+        :param should_close: whether to close `fd` when done, rather than only flush it
+        """
+        super(Sink, self).__init__()
+        self.daemon = True
+        self.filepath = filepath
+        self.fd = fd
+        self.should_close = should_close
+        self.queue = queue.Queue(QUEUE_DEPTH)
+        self.error = None
+        self.reported = False
+
+    def run(self):
+        while True:
+            data = self.queue.get()
+            if data is None:
+                break
+
+            # Keep draining the queue after an error so the reader never blocks
+            if self.error is None:
+                try:
+                    self.fd.write(data)
+                    self.fd.flush()
+                except (IOError, OSError) as e:
+                    self.error = e
+
+        try:
+            if self.should_close:
+                self.fd.close()
+            else:
+                self.fd.flush()
+        except (IOError, OSError) as e:
+            if self.error is None:
+                self.error = e
+
+    def stop(self):
+        self.queue.put(None)
+        self.join()
+
+
+def handle_errors(sinks, output_error):
+    """
+    Applies the --output-error policy to any sinks that failed since last time
+
+    Returns False if an error was diagnosed and raises SinkError if tee
+    should stop writing altogether
+    """
+    success = True
+    for sink in sinks:
+        if sink.error is None or sink.reported:
+            continue
+        sink.reported = True
+
+        is_pipe = getattr(sink.error, 'errno', None) == errno.EPIPE
+        if is_pipe and output_error in ('warn-nopipe', 'exit-nopipe'):
+            continue
+
+        if is_pipe and output_error is None:
+            # Behave as if killed by SIGPIPE, like GNU tee
+            raise SinkError()
+
+        click.echo('{}: {}: {}'.format(COMMAND_NAME, sink.filepath, sink.error.strerror or sink.error), err=True)
+        success = False
+        if output_error in ('exit', 'exit-nopipe'):
+            raise SinkError()
 
-    for data in iter(functools.partial(stdin.read, 4096), b''):
-        for fd in fds:
-            fd.write(data)
-        click.echo(data, nl=False)
+    return success
@@ -0,0 +1,308 @@
+import re
+import sys
+
+from ...utils import read_blocks
+from ...vendor import click
+
+
+COMMAND_NAME = 'tr'
+
+ESCAPES = {
+    ord('a'): 7,
+    ord('b'): 8,
+    ord('f'): 12,
+    ord('n'): 10,
+    ord('r'): 13,
+    ord('t'): 9,
+    ord('v'): 11,
+}
+
+OCTAL_DIGITS = bytearray(b'01234567')
+
+# Squeezing this many bytes or fewer repeatedly replaces pairs of each one,
+#  which is a fast substring search. Larger sets use a single regex pass.
+SQUEEZE_REPLACE_LIMIT = 4
+
+
+def _byte_range(first, last):
+    return list(range(ord(first), ord(last) + 1))
+
+
+# The character classes of the C locale, as lists of byte values in ascending order
+CLASSES = {
+    'alnum': _byte_range('0', '9') + _byte_range('A', 'Z') + _byte_range('a', 'z'),
+    'alpha': _byte_range('A', 'Z') + _byte_range('a', 'z'),
+    'blank': [9, 32],
+    'cntrl': list(range(32)) + [127],
+    'digit': _byte_range('0', '9'),
+    'graph': list(range(33, 127)),
+    'lower': _byte_range('a', 'z'),
+    'print': list(range(32, 127)),
+    'punct': [i for i in range(33, 127) if not chr(i).isalnum()],
+    'space': list(range(9, 14)) + [32],
+    'upper': _byte_range('A', 'Z'),
+    'xdigit': _byte_range('0', '9') + _byte_range('A', 'F') + _byte_range('a', 'f'),
+}
+
+
+@click.command(
+    help='Translate, squeeze, and/or delete characters from standard input, writing to standard output. '
+         'SETs are strings of bytes that may contain ranges like "a-z", classes like "[:digit:]", '
+         'equivalence classes like "[=c=]", backslash escapes like "\\n" and "\\NNN" (octal), '
+         'and in SET2 the repeats "[c*]" (as often as needed to match SET1) and "[c*N]" (N times).',
+    short_help='Translate or delete characters',
+)
+@click.help_option('-h', '--help')
+@click.option('-c', '-C', '--complement', is_flag=True, default=False, help='use the complement of SET1')
+@click.option('-d', '--delete', is_flag=True, default=False, help='delete characters in SET1, do not translate')
+@click.option('-s', '--squeeze-repeats', is_flag=True, default=False,
+              help='replace each sequence of a repeated character that is listed in the last specified SET, with a single occurrence of that character')
+@click.option('-t', '--truncate-set1', is_flag=True, default=False, help='first truncate SET1 to length of SET2')
+@click.argument('sets', metavar='SET1 [SET2]', required=False, nargs=-1)
+def subcommand(complement, delete, squeeze_repeats, truncate_set1, sets):
+    if not sets:
+        raise click.UsageError('missing operand')
+
+    translating = len(sets) == 2 and not delete
+    if delete and squeeze_repeats:
+        if len(sets) < 2:
+            raise click.UsageError("missing operand after '{}'\nTwo strings must be given when both deleting and squeezing repeats.".format(sets[0]))
+    elif delete or squeeze_repeats:
+        if len(sets) > 1 and delete:
+            raise click.UsageError("extra operand '{}'\nOnly one string may be given when deleting without squeezing repeats.".format(sets[1]))
+    elif len(sets) < 2:
+        raise click.UsageError("missing operand after '{}'\nTwo strings must be given when translating.".format(sets[0]))
+    if len(sets) > 2:
+        raise click.UsageError("extra operand '{}'".format(sets[2]))
+
+    sets = [click.format_filename(s).encode(sys.getfilesystemencoding()) for s in sets]
+    set1 = expand_set(parse_set(sets[0]), in_set2=False)
+    if complement:
+        members = set(set1)
+        set1 = [i for i in range(256) if i not in members]
+
+    set2 = None
+    if len(sets) == 2:
+        set2 = expand_set(parse_set(sets[1]), in_set2=True, translating=translating, length=len(set1))
+
+    if translating:
+        translator = Translator(table=make_table(set1, set2, truncate_set1), squeeze=set2 if squeeze_repeats else ())
+    elif delete:
+        translator = Translator(delete=set1, squeeze=set2 if squeeze_repeats else ())
+    else:
+        translator = Translator(squeeze=set1)
+
+    stdout = click.get_binary_stream('stdout')
+    for view in read_blocks(click.get_binary_stream('stdin')):
+        data = translator(view.tobytes())
+        if data:
+            stdout.write(data)
+
+
+class Translator(object):
+    def __init__(self, table=None, delete=(), squeeze=()):
+        """
+        Translates, deletes and then squeezes bytes, one block at a time
+
+        All three steps run over whole blocks in C: `bytes.translate` for the
+        first two, and for the third either `bytes.replace` on pairs of each
+        squeezed byte or, for larger sets, a regular expression. Runs of a
+        squeezed byte that span a block boundary are squeezed as well.
+
+        :param table: a 256 byte translation table, or None to keep every byte
+        :param delete: the byte values to delete
+        :param squeeze: the byte values whose repeats are replaced by a single one
+        """
+        self.table = table
+        self.delete = bytes(bytearray(delete))
+        self.squeezed = frozenset(bytes(bytearray([i])) for i in squeeze)
+        self.regex = None
+        if len(self.squeezed) > SQUEEZE_REPLACE_LIMIT:
+            members = ''.join('\\x{:02x}'.format(i) for i in sorted(set(squeeze)))
+            self.regex = re.compile('([{}])\\1+'.format(members).encode('ascii'))
+        self.last = None
+
+    def __call__(self, data):
+        if self.table is not None or self.delete:
+            data = data.translate(self.table, self.delete)
+
+        if self.squeezed and data:
+            data = self._squeeze(data)
+            if self.last is not None and data[:1] == self.last:
+                data = data.lstrip(self.last)
+            if data:
+                last = data[-1:]
+                self.last = last if last in self.squeezed else None
+
+        return data
+
+    def _squeeze(self, data):
+        if self.regex is not None:
+            return self.regex.sub(b'\\1', data)
+
+        for single in self.squeezed:
+            pair = single * 2
+            # Each pass at least halves every run
+            while pair in data:
+                data = data.replace(pair, single)
+        return data
+
+
+def make_table(set1, set2, truncate=False):
+    """
+    Returns the translation table mapping each byte of `set1` to the byte at
+    the same position in `set2`
+
+    Unless truncating `set1` to the length of `set2`, a shorter `set2` is
+    padded with its last byte. Where a byte appears more than once in `set1`,
+    the last mapping wins.
+    """
+    if truncate:
+        set1 = set1[:len(set2)]
+    elif len(set2) < len(set1):
+        if not set2:
+            raise click.UsageError('when not truncating set1, string2 must be non-empty')
+        set2 = set2 + [set2[-1]] * (len(set1) - len(set2))
+
+    table = bytearray(range(256))
+    for source, target in zip(set1, set2):
+        table[source] = target
+    return bytes(table)
+
+
+def parse_set(spec):
+    """
+    Parses a SET given as bytes into a list of items, each one of
+
+    * ('bytes', [values]) for literal bytes, ranges and equivalence classes
+    * ('class', name) for a character class
+    * ('repeat', value, count) for [c*N], where a count of None means [c*]
+    """
+    spec = bytearray(spec)
+    items = []
+    i = 0
+    while i < len(spec):
+        if spec[i] == ord('['):
+            item, end = _parse_bracket(spec, i)
+            if item is not None:
+                items.append(item)
+                i = end
+                continue
+
+        value, i = _parse_char(spec, i)
+        if i + 1 < len(spec) and spec[i] == ord('-'):
+            last, end = _parse_char(spec, i + 1)
+            if last < value:
+                raise click.UsageError("range-endpoints of '{}' are in reverse collating sequence order".format(
+                    _display(spec[:end])))
+            items.append(('bytes', list(range(value, last + 1))))
+            i = end
+        else:
+            items.append(('bytes', [value]))
+
+    return items
+
+
+def _parse_bracket(spec, start):
+    """
+    Parses the [:class:], [=c=] or [c*N] at `start`
+
+    Returns (None, start) if there is none, as a lone '[' is an ordinary character
+    """
+    if start + 1 >= len(spec):
+        return None, start
+
+    if spec[start + 1] in bytearray(b':='):
+        delimiter = spec[start + 1]
+        end = spec.find(bytearray([delimiter, ord(']')]), start + 2)
+        if end == -1:
+            return None, start
+        name = bytes(spec[start + 2:end])
+
+        if delimiter == ord(':'):
+            if name.decode('latin-1') not in CLASSES:
+                raise click.UsageError("invalid character class '{}'".format(_display(name)))
+            return ('class', name.decode('latin-1')), end + 2
+
+        value, value_end = _parse_char(spec, start + 2)
+        if value_end != end:
+            raise click.UsageError('{}: equivalence class operand must be a single character'.format(_display(name)))
+        # Every byte is its own equivalence class in the C locale
+        return ('bytes', [value]), end + 2
+
+    value, i = _parse_char(spec, start + 1)
+    if i >= len(spec) or spec[i] != ord('*'):
+        return None, start
+    end = spec.find(b']', i + 1)
+    if end == -1:
+        return None, start
+
+    digits = bytes(spec[i + 1:end]).decode('latin-1')
+    if not digits:
+        return ('repeat', value, None), end + 1
+    try:
+        # Like GNU tr, a count with a leading zero is octal
+        count = int(digits, 8 if digits.startswith('0') else 10)
+    except ValueError:
+        raise click.UsageError("invalid repeat count '{}' in [c*n] construct".format(digits))
+    return ('repeat', value, count or None), end + 1
+
+
+def _parse_char(spec, i):
+    """
+    Returns the byte value at `i`, decoding any backslash escape, and the index after it
+    """
+    if spec[i] != ord('\\') or i + 1 == len(spec):
+        return spec[i], i + 1
+
+    if spec[i + 1] in OCTAL_DIGITS:
+        end = i + 1
+        while end < len(spec) and end < i + 4 and spec[end] in OCTAL_DIGITS:
+            end += 1
+        value = int(bytes(spec[i + 1:end]).decode('ascii'), 8)
+        if value > 255:
+            # Like GNU tr, \400 is \40 followed by 0
+            end -= 1
+            value = int(bytes(spec[i + 1:end]).decode('ascii'), 8)
+        return value, end
+
+    return ESCAPES.get(spec[i + 1], spec[i + 1]), i + 2
+
+
+def expand_set(items, in_set2, translating=False, length=0):
+    """
+    Returns the byte values of a parsed SET as a list
+
+    :param in_set2: whether this is SET2, the only one where repeats may appear
+    :param translating: whether SET2 is a translation target, where the only
+                        classes allowed are 'upper' and 'lower'
+    :param length: the length of SET1, which a [c*] in SET2 pads up to
+    """
+    values = []
+    fill = None
+    for item in items:
+        if item[0] == 'bytes':
+            values.extend(item[1])
+        elif item[0] == 'class':
+            if translating and item[1] not in ('upper', 'lower'):
+                raise click.UsageError("when translating, the only character classes that may appear in string2 are 'upper' and 'lower'")
+            values.extend(CLASSES[item[1]])
+        else:
+            _, value, count = item
+            if not in_set2:
+                raise click.UsageError('the [c*] repeat construct may not appear in string1')
+            if count is not None:
+                values.extend([value] * count)
+            elif fill is not None:
+                raise click.UsageError('only one [c*] repeat construct may appear in string2')
+            else:
+                fill = (len(values), value)
+
+    if fill is not None:
+        index, value = fill
+        values[index:index] = [value] * max(0, length - len(values))
+    return values
+
+
+def _display(spec):
+    return bytes(spec).decode('latin-1')
@@ -0,0 +1,139 @@
+import hashlib
+import re
+
+from ...vendor import click
+
+
+@click.command(
+    help='Filter adjacent matching lines from INPUT (or standard input), writing to OUTPUT (or standard output). '
+         'With --unsorted, matching lines need not be adjacent.',
+    short_help='Report or omit repeated lines',
+)
+@click.help_option('-h', '--help')
+@click.option('-c', '--count', is_flag=True, default=False, help='prefix lines by the number of occurrences')
+@click.option('-d', '--repeated', is_flag=True, default=False, help='only print duplicate lines, one for each group')
+@click.option('-u', '--unique', is_flag=True, default=False, help='only print unique lines')
+@click.option('-i', '--ignore-case', is_flag=True, default=False, help='ignore differences in case when comparing')
+@click.option('-f', '--skip-fields', metavar='N', type=click.IntRange(min=0), default=0, help='avoid comparing the first N fields')
+@click.option('-s', '--skip-chars', metavar='N', type=click.IntRange(min=0), default=0, help='avoid comparing the first N characters')
+@click.option('-w', '--check-chars', metavar='N', type=click.IntRange(min=0), help='compare no more than N characters in lines')
+@click.option('--unsorted', is_flag=True, default=False,
+              help='also match lines that are not adjacent, keeping every distinct line in memory (not in GNU uniq)')
+@click.argument('input', metavar='INPUT', required=False, default='-', type=click.File('rb'))
+@click.argument('output', metavar='OUTPUT', required=False, default='-', type=click.File('wb'))
+def subcommand(count, repeated, unique, ignore_case, skip_fields, skip_chars, check_chars, unsorted, input, output):
+    key = make_key(skip_fields, skip_chars, check_chars, ignore_case)
+
+    lines = complete_lines(input)
+    if unsorted:
+        groups = hashed_groups(lines, key)
+    else:
+        groups = adjacent_groups(lines, key)
+
+    output.writelines(format_groups(groups, count, repeated, unique))
+
+
+def make_key(skip_fields=0, skip_chars=0, check_chars=None, ignore_case=False):
+    """
+    Returns a function giving the part of a line to compare, as bytes
+
+    Returns None when whole lines are compared, so that callers can use the
+    line itself without any slicing.
+    """
+    if not (skip_fields or skip_chars or check_chars is not None or ignore_case):
+        return None
+
+    # A field is a run of blanks followed by non-blanks
+    fields = re.compile('(?:[ \\t]*[^ \\t\\n]*){{{}}}'.format(skip_fields).encode('ascii'))
+
+    def key(line):
+        start = skip_chars
+        if skip_fields:
+            start += fields.match(line).end()
+
+        # Lines always end with a newline, which is never compared
+        end = len(line) - 1
+        if check_chars is not None:
+            end = min(end, start + check_chars)
+
+        part = line[start:end]
+        if ignore_case:
+            part = part.lower()
+        return part
+
+    return key
+
+
+def complete_lines(fd):
+    """
+    Yields the lines of `fd`, adding a newline to the last one if it lacks one
+    """
+    for line in fd:
+        if not line.endswith(b'\n'):
+            line += b'\n'
+        yield line
+
+
+def adjacent_groups(lines, key=None):
+    """
+    Yields the first line and the size of every run of matching lines
+    """
+    first = None
+    first_key = None
+    size = 0
+    for line in lines:
+        line_key = key(line) if key else line
+        if size and line_key == first_key:
+            size += 1
+            continue
+
+        if size:
+            yield first, size
+        first = line
+        first_key = line_key
+        size = 1
+
+    if size:
+        yield first, size
+
+
+def hashed_groups(lines, key=None):
+    """
+    Yields the first line and the number of matching lines for every distinct
+    line, in order of first appearance
+
+    Keys that differ from the line itself are stored as a 16 byte digest, so
+    apart from each distinct line only a fixed amount of memory is used.
+    """
+    indexes = {}
+    firsts = []
+    sizes = []
+    for line in lines:
+        if key:
+            line_key = hashlib.md5(key(line)).digest()
+        else:
+            line_key = line
+
+        index = indexes.get(line_key)
+        if index is None:
+            indexes[line_key] = len(firsts)
+            firsts.append(line)
+            sizes.append(1)
+        else:
+            sizes[index] += 1
+
+    for first, size in zip(firsts, sizes):
+        yield first, size
+
+
+def format_groups(groups, count=False, repeated=False, unique=False):
+    for line, size in groups:
+        if repeated and size == 1:
+            continue
+        if unique and size > 1:
+            continue
+
+        if count:
+            yield '{:7d} '.format(size).encode('ascii') + line
+        else:
+            yield line
@@ -0,0 +1,161 @@
+import functools
+import os
+import stat
+import sys
+
+from ...utils import BLOCK_SIZE, ordered_imap, read_blocks
+from ...vendor import click
+
+
+COMMAND_NAME = 'wc'
+
+# Maps whitespace to b' ' and printable characters to b'x', so that the words
+#  in a block are the occurrences of b' x' plus one if it starts with a word.
+#  As in GNU wc, other bytes neither start nor end a word, so they are deleted.
+WHITESPACE = bytearray(b' \t\n\v\f\r')
+PRINTABLE = bytearray(range(0x20, 0x7f))
+WORD_TABLE = bytes(bytearray(ord(' ') if i in WHITESPACE else ord('x') for i in range(256)))
+NON_WORD = bytes(bytearray(i for i in range(256) if i not in WHITESPACE and i not in PRINTABLE))
+
+
+@click.command(
+    help='Print newline, word, and byte counts for each FILE, and a total line if more than one FILE is specified. '
+         'A word is a non-zero-length sequence of printable characters delimited by white space.',
+    short_help='Print newline, word, and byte counts for each file',
+)
+@click.help_option('-h', '--help')
+@click.option('-c', '--bytes', 'count_bytes', is_flag=True, default=False, help='print the byte counts')
+@click.option('-l', '--lines', 'count_lines', is_flag=True, default=False, help='print the newline counts')
+@click.option('-w', '--words', 'count_words', is_flag=True, default=False, help='print the word counts')
+@click.option('-j', '--jobs', metavar='N', type=click.IntRange(min=1), default=1, help='count up to N files concurrently')
+@click.argument('files', metavar='FILE', required=False, nargs=-1, type=click.Path(dir_okay=False, allow_dash=True))
+def subcommand(count_bytes, count_lines, count_words, jobs, files):
+    if not (count_bytes or count_lines or count_words):
+        count_bytes = count_lines = count_words = True
+    selected = (count_lines, count_words, count_bytes)
+
+    names = [click.format_filename(f) for f in files]
+    paths = files or ('-',)
+
+    if sum(selected) == 1 and len(paths) == 1:
+        width = 1
+    else:
+        width = number_width(paths)
+
+    counter = functools.partial(count_path, count_lines=count_lines, count_words=count_words)
+    jobs = min(jobs, len(paths))
+    if '-' in paths:
+        # Only this process can read standard input
+        results = ordered_imap(counter, paths, jobs)
+    else:
+        # Counting holds the GIL, so separate processes are needed to use more than one core
+        results = ordered_imap(counter, paths, jobs, processes=True)
+
+    success = True
+    total = [0, 0, 0]
+    for name, (counts, error) in zip(names or [None], results):
+        if error is not None:
+            click.echo('{}: {}: {}'.format(COMMAND_NAME, name or '-', error), err=True)
+            success = False
+            continue
+
+        total = [a + b for a, b in zip(total, counts)]
+        print_counts(counts, selected, width, name)
+
+    if len(paths) > 1:
+        print_counts(total, selected, width, 'total')
+
+    if not success:
+        sys.exit(1)
+
+
+def print_counts(counts, selected, width, name=None):
+    fields = ['{:{}d}'.format(count, width) for count, wanted in zip(counts, selected) if wanted]
+    if name is not None:
+        fields.append(name)
+    click.echo(' '.join(fields))
+
+
+def number_width(paths):
+    """
+    Returns the width GNU wc pads counts to: enough for the combined size of
+    all regular files, and at least 7 if any input is not a regular file
+    """
+    total_size = 0
+    minimum = 1
+    for index, path in enumerate(paths):
+        try:
+            if path == '-':
+                st = os.fstat(click.get_binary_stream('stdin').fileno())
+            else:
+                st = os.stat(path)
+        except (AttributeError, ValueError, EnvironmentError):
+            # Like GNU, give up on padding if the first input is unusable
+            if index == 0:
+                return 1
+            continue
+
+        if stat.S_ISREG(st.st_mode):
+            total_size += st.st_size
+        else:
+            minimum = 7
+
+    return max(len(str(total_size)), minimum)
+
+
+def count_path(path, count_lines=True, count_words=True):
+    """
+    Returns ((lines, words, bytes), None) for `path`, or (None, error) if it
+    cannot be read
+    """
+    try:
+        if path == '-':
+            return count_file(click.get_binary_stream('stdin'), count_lines, count_words), None
+
+        with open(path, 'rb') as fd:
+            return count_file(fd, count_lines, count_words), None
+    except EnvironmentError as e:
+        return None, e.strerror
+
+
+def count_file(fd, count_lines=True, count_words=True, block_size=BLOCK_SIZE):
+    """
+    Returns the (lines, words, bytes) in the rest of `fd`
+
+    Counts that are not asked for are returned as 0. When only the byte count
+    is wanted, regular files are not read at all.
+    """
+    if not (count_lines or count_words):
+        size = _remaining_size(fd)
+        if size is not None:
+            return 0, 0, size
+
+    lines = words = size = 0
+    in_word = False
+    for view in read_blocks(fd, block_size):
+        size += len(view)
+        block = view.tobytes()
+
+        if count_lines:
+            lines += block.count(b'\n')
+
+        if count_words:
+            shape = block.translate(WORD_TABLE, NON_WORD)
+            if shape:
+                words += shape.count(b' x')
+                if not in_word and shape.startswith(b'x'):
+                    words += 1
+                in_word = shape.endswith(b'x')
+
+    return lines, words, size
+
+
+def _remaining_size(fd):
+    try:
+        st = os.fstat(fd.fileno())
+    except (AttributeError, ValueError, EnvironmentError):
+        return None
+
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return max(st.st_size - fd.tell(), 0)
@@ -0,0 +1,39 @@
+import errno
+import sys
+
+from ...utils import BLOCK_SIZE
+from ...vendor import click
+
+
+@click.command(
+    help='Repeatedly output a line with all specified STRING(s), or "y".',
+    short_help='Output a string repeatedly until killed',
+    context_settings=dict(ignore_unknown_options=True),
+)
+@click.help_option('-h', '--help')
+@click.argument('strings', metavar='[STRING]...', nargs=-1)
+def subcommand(strings):
+    encoding = sys.getfilesystemencoding()
+    line = b' '.join(click.format_filename(s).encode(encoding) for s in strings or ('y',)) + b'\n'
+
+    stdout = click.get_binary_stream('stdout')
+    try:
+        for block in repeated_blocks(line):
+            stdout.write(block)
+    except EnvironmentError as e:
+        if e.errno != errno.EPIPE:
+            raise
+        # Behave as if killed by SIGPIPE, like GNU yes
+        sys.exit(1)
+
+
+def repeated_blocks(line, size=BLOCK_SIZE):
+    """
+    Yields the same buffer of copies of `line` forever
+
+    The buffer holds as many whole lines as fit in `size` bytes, at least
+    one, so each write outputs many lines without formatting any of them.
+    """
+    block = line * max(1, size // len(line))
+    while True:
+        yield block
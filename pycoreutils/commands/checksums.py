@@ -0,0 +1,169 @@
+'''
+Checksums that hashlib does not provide, with the same interface as its hashes
+'''
+import hashlib
+import zlib
+
+
+MASK32 = 0xffffffff
+
+# Every byte with the order of its bits reversed
+REVERSED_BITS = bytes(bytearray(int('{:08b}'.format(i)[::-1], 2) for i in range(256)))
+
+
+_rotated_sums = None
+
+
+def _reverse32(value):
+    return int('{:032b}'.format(value)[::-1], 2)
+
+
+def _get_rotated_sums():
+    """
+    Returns every sum of a 16 bit checksum and a byte, wrapped to 16 bits and
+    rotated right by one bit
+
+    The table is built on first use, as it takes longer than the rest of the
+    import and most commands never need it.
+    """
+    global _rotated_sums
+    if _rotated_sums is None:
+        _rotated_sums = [((i & 0xffff) >> 1) | ((i & 1) << 15) for i in range(0x10000 + 0xff)]
+    return _rotated_sums
+
+
+def _tobytes(data):
+    # bytes(memoryview) is its repr on Python 2
+    return memoryview(data).tobytes()
+
+
+class Crc(object):
+    name = 'crc'
+
+    def __init__(self, data=b''):
+        """
+        The POSIX cksum CRC, followed by the size of the data
+
+        The CRC is not reflected and starts at 0, unlike the one in zlib, but
+        reflecting a CRC just reverses the bits of its input bytes and of the
+        register. So the bytes are reversed with a translation table and the
+        register is carried between calls to zlib.crc32, which does the actual
+        work in C.
+        """
+        # The register as zlib sees it, with its bits reversed
+        self.register = 0
+        self.size = 0
+        self.update(data)
+
+    def _feed(self, data):
+        # zlib.crc32 inverts its starting value and its result
+        self.register = ~zlib.crc32(data.translate(REVERSED_BITS), ~self.register & MASK32) & MASK32
+
+    def update(self, data):
+        data = _tobytes(data)
+        self._feed(data)
+        self.size += len(data)
+
+    def copy(self):
+        other = Crc()
+        other.register = self.register
+        other.size = self.size
+        return other
+
+    def crc(self):
+        other = self.copy()
+        # The size is fed too, least significant byte first and without any zero bytes
+        size = bytearray()
+        remaining = self.size
+        while remaining:
+            size.append(remaining & 0xff)
+            remaining >>= 8
+        other._feed(bytes(size))
+        return _reverse32(other.register) ^ MASK32
+
+    def hexdigest(self):
+        return '{} {}'.format(self.crc(), self.size)
+
+
+class BsdSum(object):
+    name = 'bsd'
+
+    def __init__(self, data=b''):
+        """
+        The 16 bit rotating checksum of BSD sum, followed by the size in kibibytes
+
+        Each byte depends on the carries out of the one before, so the bytes
+        can only be summed one at a time. The loop is kept to a table lookup
+        and an addition per byte, with the sum only wrapped to 16 bits by the
+        next lookup, but it is still far slower than GNU sum.
+        """
+        self.checksum = 0
+        self.size = 0
+        self.update(data)
+
+    def update(self, data):
+        data = bytearray(_tobytes(data))
+        rotated_sums = _get_rotated_sums()
+        checksum = self.checksum
+        for byte in data:
+            checksum = rotated_sums[checksum] + byte
+        self.checksum = checksum & 0xffff
+        self.size += len(data)
+
+    def copy(self):
+        other = BsdSum()
+        other.checksum = self.checksum
+        other.size = self.size
+        return other
+
+    def hexdigest(self):
+        return '{:05d} {:5d}'.format(self.checksum, (self.size + 1023) // 1024)
+
+
+class SysvSum(object):
+    name = 'sysv'
+
+    def __init__(self, data=b''):
+        """
+        The System V sum checksum, followed by the size in 512 byte blocks
+        """
+        self.total = 0
+        self.size = 0
+        self.update(data)
+
+    def update(self, data):
+        data = _tobytes(data)
+        self.total = (self.total + sum(bytearray(data))) & MASK32
+        self.size += len(data)
+
+    def copy(self):
+        other = SysvSum()
+        other.total = self.total
+        other.size = self.size
+        return other
+
+    def hexdigest(self):
+        r = (self.total & 0xffff) + (self.total >> 16)
+        checksum = (r & 0xffff) + (r >> 16)
+        return '{} {}'.format(checksum, (self.size + 511) // 512)
+
+
+ALGORITHMS = {
+    'crc': Crc,
+    'bsd': BsdSum,
+    'sysv': SysvSum,
+}
+
+
+def new(algorithm, data=b''):
+    '''
+    Return a new hash object for `algorithm`, like `hashlib.new`
+
+    The checksums of cksum and sum are supported along with every algorithm
+    of hashlib. Their `hexdigest` is the checksum and size, as printed by
+    those commands.
+    '''
+    cls = ALGORITHMS.get(algorithm)
+    if cls is None:
+        return hashlib.new(algorithm, data)
+    return cls(data)
@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+
+from ..vendor import click
+
+
+# Entries beyond this are evicted, least recently used first
+MAX_ENTRIES = 1000000
+
+# Files modified this recently may still be changing within the resolution of
+#  their mtime, so their checksums are never stored
+RACY_SECONDS = 2
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS checksums (
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    algorithm TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    checksum TEXT NOT NULL,
+    used INTEGER NOT NULL,
+    PRIMARY KEY (dev, ino, algorithm)
+);
+CREATE INDEX IF NOT EXISTS checksums_used ON checksums (used);
+'''
+
+
+class ChecksumCache(object):
+    def __init__(self, path, refresh=False, max_entries=MAX_ENTRIES):
+        """
+        An on-disk cache of file checksums
+
+        An entry is only returned when the device, inode, size and mtime of
+        the file all still match the ones it was stored with.
+
+        :param path: the sqlite database holding the cache
+        :param refresh: ignore any stored checksums, but store new ones
+        :param max_entries: the number of entries kept when the cache is closed
+        """
+        # sqlite3 is slow to import and the cache is opt-in, so it is only
+        #  imported once a cache is actually used
+        try:
+            import sqlite3
+        except ImportError:
+            # Some minimal Python builds ship without sqlite
+            raise click.UsageError('checksum caching requires the sqlite3 module')
+
+        self.refresh = refresh
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.generation = int(time.time())
+
+        try:
+            self.db = sqlite3.connect(click.format_filename(path), check_same_thread=False)
+            self.db.executescript(SCHEMA)
+        except sqlite3.Error as e:
+            raise click.FileError(path, hint=str(e))
+
+    @staticmethod
+    def stat_key(file):
+        """
+        Returns the (dev, ino, size, mtime_ns) of an open file
+
+        Returns None if the file should not be cached
+        """
+        try:
+            st = os.fstat(file.fileno())
+        except (AttributeError, ValueError, EnvironmentError):
+            return None
+
+        # Some filesystems don't have stable inode numbers
+        if st.st_ino == 0:
+            return None
+
+        mtime_ns = getattr(st, 'st_mtime_ns', None)
+        if mtime_ns is None:
+            mtime_ns = int(st.st_mtime * 1e9)
+
+        if mtime_ns > (time.time() - RACY_SECONDS) * 1e9:
+            return None
+
+        return st.st_dev, st.st_ino, st.st_size, mtime_ns
+
+    def get(self, key, algorithm):
+        """
+        Returns the cached hexdigest for `key`, or None
+        """
+        if self.refresh:
+            return None
+
+        dev, ino, size, mtime_ns = key
+        with self.lock:
+            row = self.db.execute(
+                'SELECT checksum FROM checksums WHERE dev = ? AND ino = ? AND algorithm = ? AND size = ? AND mtime_ns = ?',
+                (dev, ino, algorithm, size, mtime_ns),
+            ).fetchone()
+            if row is None:
+                return None
+
+            self.db.execute(
+                'UPDATE checksums SET used = ? WHERE dev = ? AND ino = ? AND algorithm = ?',
+                (self.generation, dev, ino, algorithm),
+            )
+
+        return row[0]
+
+    def set(self, key, algorithm, checksum):
+        dev, ino, size, mtime_ns = key
+        with self.lock:
+            self.db.execute(
+                'INSERT OR REPLACE INTO checksums VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (dev, ino, algorithm, size, mtime_ns, checksum, self.generation),
+            )
+
+    def close(self):
+        """
+        Evicts the least recently used entries and writes the cache to disk
+        """
+        with self.lock:
+            (count,) = self.db.execute('SELECT COUNT(*) FROM checksums').fetchone()
+            if count > self.max_entries:
+                self.db.execute(
+                    'DELETE FROM checksums WHERE rowid IN (SELECT rowid FROM checksums ORDER BY used LIMIT ?)',
+                    (count - self.max_entries,),
+                )
+            self.db.commit()
+            self.db.close()
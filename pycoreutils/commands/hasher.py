@@ -1,22 +1,55 @@
-import functools
 import hashlib
 import re
 
+from . import checksums
+from .hashcache import ChecksumCache
+from ..utils import BLOCK_SIZE, ordered_imap, read_blocks, read_full_blocks
 from ..vendor import click
 
 
 class HasherCommand(object):
-    def __init__(self, algorithm, tag=False, quiet=False, status=False):
+    # What separates the checksum from the file name in checksum lines
+    separator = '  '
+
+    def __init__(self, algorithm, tag=False, quiet=False, status=False, jobs=1, block_size=BLOCK_SIZE,
+                 cache_path=None, refresh=False):
         """
         :param algorithm: the hashing algorithm to use (eg. 'sha1', 'md5')
+        :param jobs: the number of files to hash concurrently
+        :param block_size: the number of bytes fed to the hash at a time
+        :param cache_path: a checksum cache used when verifying checksums
+        :param refresh: rehash every file instead of trusting the cache
         """
         self.algorithm = algorithm
         self.tag = tag
         self.quiet = quiet
         self.status = status
+        self.jobs = jobs
+        self.block_size = block_size
+        self.cache_path = cache_path
+        self.refresh = refresh
+        self.cache = None
+
+        self.checksum_line_regex = re.compile('^(?P<checksum>{checksum}){separator}(?P<filepath>.+)$'.format(
+            checksum=self.checksum_pattern(), separator=self.separator).encode('ascii'))
+
+    def new_hash(self):
+        """
+        Returns a new hash object for the class' algorithm
+        """
+        return checksums.new(self.algorithm)
+
+    def checksum_pattern(self):
+        """
+        Returns a regex matching a checksum as printed by `checksum_printer`
+        """
+        return '[a-f0-9]{{{}}}'.format(len(self.new_hash().hexdigest()))
 
-        hashlen = len(hashlib.new(algorithm).hexdigest())
-        self.checksum_line_regex = re.compile('^(?P<checksum>[a-f0-9]{{{hashlen}}})  (?P<filepath>.+)$'.format(hashlen=hashlen).encode('ascii'))
+    def tag_name(self, algorithm=None):
+        """
+        Returns the name of the algorithm in BSD format checksum lines
+        """
+        return (algorithm or self.algorithm).upper()
 
     def process_files(self, files, check=False):
         success = True
@@ -27,20 +60,45 @@ class HasherCommand(object):
         if not check and (self.status or self.quiet):
             raise click.BadOptionUsage('--status is only meaningful when verifying checksums')
 
-        for file in files:
-            if not check:
-                # in testing, BytesIO has not attribute "name"
-                filepath = getattr(file, 'name', '-')
-                checksum = self.checksum_calculator(file)
-                if self.tag:
-                    click.echo('{} ({}) = {}'.format(self.algorithm.upper(), filepath, checksum))
-                else:
-                    click.echo('{}  {}'.format(checksum, filepath))
-            else:
-                success = self.checksum_verifier(file) and success
+        if check:
+            if self.cache_path:
+                self.cache = ChecksumCache(self.cache_path, self.refresh)
+            try:
+                for file in files:
+                    success = self.checksum_verifier(file) and success
+            finally:
+                if self.cache is not None:
+                    self.cache.close()
+                    self.cache = None
+            return success
+
+        for file, checksum in zip(files, self.checksum_iterator(files)):
+            # in testing, BytesIO has not attribute "name"
+            filepath = getattr(file, 'name', '-')
+            self.checksum_printer(filepath, checksum)
 
         return success
 
+    def checksum_printer(self, filepath, checksum, algorithm=None, output=None):
+        """
+        Writes one checksum line in GNU or, with --tag, BSD format
+        """
+        if self.tag:
+            line = '{} ({}) = {}'.format(self.tag_name(algorithm), filepath, checksum)
+        else:
+            line = '{}{}{}'.format(checksum, self.separator, filepath)
+        click.echo(line, file=output)
+
+    def checksum_iterator(self, files):
+        """
+        Yields the checksum of each file in `files`, in the order given
+
+        When more than one job is requested the files are hashed on a thread
+        pool. hashlib releases the GIL while it digests large blocks, so the
+        threads really do run on separate cores.
+        """
+        return ordered_imap(self.checksum_calculator, files, min(self.jobs, len(files)))
+
     def checksum_calculator(self, file):
         """
         Computes a checksum using the class' algorithm
@@ -48,42 +106,91 @@ class HasherCommand(object):
 
         Assumes the file is opened in binary mode
         """
-        h = hashlib.new(self.algorithm)
-        for data in iter(functools.partial(file.read, 4096), b''):
-            h.update(data)
+        h = self.new_hash()
+        for block in read_blocks(file, self.block_size):
+            h.update(block)
         return h.hexdigest()
 
-    def checksum_verifier(self, file):
-        noformat_count = 0
-        nomatch_count = 0
-        noread_count = 0
+    def cached_checksum_calculator(self, file):
+        """
+        Like `checksum_calculator` but consults the checksum cache, if any
+        """
+        if self.cache is None:
+            return self.checksum_calculator(file)
+
+        key = self.cache.stat_key(file)
+        if key is None:
+            return self.checksum_calculator(file)
+
+        checksum = self.cache.get(key, self.algorithm)
+        if checksum is None:
+            checksum = self.checksum_calculator(file)
+            self.cache.set(key, self.algorithm, checksum)
+        return checksum
+
+    def checksum_entries(self, file):
+        """
+        Parses a checksum file line by line
 
+        Yields a (checksum, filepath) tuple per line, or None for a line
+        that is improperly formatted
+        """
         for line in file:
             match = self.checksum_line_regex.match(line)
             if not match:
-                noformat_count += 1
+                yield None
             else:
                 group = match.groupdict()
-                checksum = group['checksum']
-                filepath = click.format_filename(group['filepath'])
-                try:
-                    with click.open_file(filepath, 'rb') as fd:
-                        calculated_checksum = self.checksum_calculator(fd).encode('ascii')
-                except IOError:
-                    noread_count += 1
-                    if not self.status:
-                        click.echo('{}: FAILED open or read'.format(filepath))
-                    continue
-
-                if checksum == calculated_checksum:
-                    output = 'OK'
-                else:
-                    output = 'FAILED'
-                    nomatch_count += 1
+                yield group['checksum'], click.format_filename(group['filepath'])
+
+    def entry_verifier(self, entry):
+        """
+        Verifies a single entry from `checksum_entries`
+
+        Returns None for an improperly formatted entry, otherwise the filepath
+        and True if the checksum matched, False if it didn't or None if the
+        file could not be read
+        """
+        if entry is None:
+            return None
 
+        checksum, filepath = entry
+        try:
+            with click.open_file(filepath, 'rb') as fd:
+                calculated_checksum = self.cached_checksum_calculator(fd).encode('ascii')
+        except IOError:
+            return filepath, None
+
+        return filepath, checksum == calculated_checksum
+
+    def checksum_verifier(self, file):
+        noformat_count = 0
+        nomatch_count = 0
+        noread_count = 0
+
+        # The checksum file is parsed lazily while up to `jobs` listed files
+        # are hashed at once. Results are still reported in the file's order.
+        for result in ordered_imap(self.entry_verifier, self.checksum_entries(file), self.jobs):
+            if result is None:
+                noformat_count += 1
+                continue
+
+            filepath, matched = result
+            if matched is None:
+                noread_count += 1
                 if not self.status:
-                    if not self.quiet or output != 'OK':
-                        click.echo('{}: {}'.format(filepath, output))
+                    click.echo('{}: FAILED open or read'.format(filepath))
+                continue
+
+            if matched:
+                output = 'OK'
+            else:
+                output = 'FAILED'
+                nomatch_count += 1
+
+            if not self.status:
+                if not self.quiet or output != 'OK':
+                    click.echo('{}: {}'.format(filepath, output))
 
         if not self.status:
             if noformat_count == 1:
@@ -100,3 +207,146 @@ class HasherCommand(object):
                 click.echo('WARNING: {} computed checksum did NOT match'.format(nomatch_count), err=True)
 
         return noformat_count + nomatch_count + noread_count == 0
+
+
+class MultiHasherCommand(HasherCommand):
+    def __init__(self, algorithms, tag=False, jobs=1, block_size=BLOCK_SIZE, manifests=None):
+        """
+        Computes several checksums of each file while reading it only once
+
+        :param algorithms: the hashing algorithms to use (eg. ['md5', 'sha1'])
+        :param manifests: optionally, a file per algorithm to write its checksums to
+        """
+        super(MultiHasherCommand, self).__init__(algorithms[0], tag, jobs=jobs, block_size=block_size)
+        self.algorithms = algorithms
+        self.manifests = manifests
+
+    def process_files(self, files, check=False):
+        if check:
+            raise click.BadOptionUsage('checking is not supported with multiple algorithms')
+
+        return super(MultiHasherCommand, self).process_files(files)
+
+    def checksum_printer(self, filepath, checksums):
+        for algorithm, checksum in zip(self.algorithms, checksums):
+            if self.manifests:
+                super(MultiHasherCommand, self).checksum_printer(filepath, checksum, algorithm, self.manifests[algorithm])
+            else:
+                # Without separate manifests only the BSD format says which
+                # algorithm produced each line
+                line = '{} ({}) = {}'.format(algorithm.upper(), filepath, checksum)
+                click.echo(line)
+
+    def checksum_calculator(self, file):
+        """
+        Computes a checksum for each of the class' algorithms
+        Returns a list of unicode hexdigests
+        """
+        hashes = [checksums.new(algorithm) for algorithm in self.algorithms]
+        for block in read_blocks(file, self.block_size):
+            for h in hashes:
+                h.update(block)
+        return [h.hexdigest() for h in hashes]
+
+
+class SumHasherCommand(HasherCommand):
+    # cksum and sum put a single space between the checksum and file name
+    separator = ' '
+
+    def __init__(self, algorithm, *args, **kwargs):
+        """
+        Prints the checksums of cksum and sum, a checksum and a size
+
+        :param print_names: whether to print file names, which are left out
+                            when reading standard input without any FILE
+        """
+        self.print_names = kwargs.pop('print_names', True)
+        super(SumHasherCommand, self).__init__(algorithm, *args, **kwargs)
+
+    def checksum_pattern(self):
+        return '[0-9]+ +[0-9]+'
+
+    def checksum_printer(self, filepath, checksum, algorithm=None, output=None):
+        if not self.print_names and not self.tag:
+            click.echo(checksum, file=output)
+        else:
+            super(SumHasherCommand, self).checksum_printer(filepath, checksum, algorithm, output)
+
+
+class Blake2HasherCommand(HasherCommand):
+    def __init__(self, length=512, leaf_size=None, *args, **kwargs):
+        """
+        Computes BLAKE2b checksums, optionally as a tree
+
+        In tree mode a file is cut into leaves of `leaf_size` bytes, which
+        are hashed on `jobs` threads, and a root node hashes their digests.
+        Files are then hashed one after another, as each is already spread
+        over every job.
+
+        :param length: the length of the digest in bits
+        :param leaf_size: the size of the leaves in tree mode, or None to
+                          hash files sequentially
+        """
+        self.length = length
+        self.leaf_size = leaf_size
+
+        # Digests of different lengths or trees never match, so each gets its
+        #  own name in the checksum cache
+        algorithm = 'blake2b' if length == 512 else 'blake2b-{}'.format(length)
+        if leaf_size is not None:
+            algorithm += '-tree-{}'.format(leaf_size)
+        super(Blake2HasherCommand, self).__init__(algorithm, *args, **kwargs)
+
+    def new_hash(self, **params):
+        return hashlib.blake2b(digest_size=self.length // 8, **params)
+
+    def tree_params(self):
+        """
+        Returns the parameters shared by every node of the tree
+        """
+        # A fanout of 0 lets the root have any number of leaves
+        return dict(fanout=0, depth=2, leaf_size=self.leaf_size, inner_size=self.length // 8)
+
+    def tag_name(self, algorithm=None):
+        return 'BLAKE2b' if self.length == 512 else 'BLAKE2b-{}'.format(self.length)
+
+    def checksum_iterator(self, files):
+        if self.leaf_size is None:
+            return super(Blake2HasherCommand, self).checksum_iterator(files)
+        return (self.checksum_calculator(file) for file in files)
+
+    def checksum_calculator(self, file):
+        if self.leaf_size is None:
+            return super(Blake2HasherCommand, self).checksum_calculator(file)
+
+        root = self.new_hash(node_depth=1, last_node=True, **self.tree_params())
+        digests = ordered_imap(self.leaf_digest, tree_leaves(file, self.leaf_size), self.jobs)
+        for digest in digests:
+            root.update(digest)
+        return root.hexdigest()
+
+    def leaf_digest(self, leaf):
+        """
+        Returns the digest of a leaf from `tree_leaves`
+        """
+        offset, data, last = leaf
+        h = self.new_hash(node_offset=offset, node_depth=0, last_node=last, **self.tree_params())
+        h.update(data)
+        return h.digest()
+
+
+def tree_leaves(file, leaf_size):
+    """
+    Yields (offset, data, last) for each leaf of `file`, where `offset` counts
+    leaves and `last` marks the last one
+
+    An empty file has a single empty leaf.
+    """
+    blocks = read_full_blocks(file, leaf_size)
+    previous = next(blocks, b'')
+    offset = 0
+    for block in blocks:
+        yield offset, previous, False
+        previous = block
+        offset += 1
+    yield offset, previous, True
@@ -0,0 +1,52 @@
+'''
+Generates the command index in pycoreutils/commands/__init__.py
+
+Run this after adding a command or changing its short help:
+
+    $ python -m pycoreutils.commands.indexer
+'''
+import importlib
+import os
+
+
+HEADER = '''\
+# This file is generated by `python -m pycoreutils.commands.indexer`, do not edit
+# It maps every command to its short help, so that commands can be listed and
+#  dispatched without importing every one of them.
+'''
+
+
+def build_index():
+    '''
+    Import every command package and return a dict of name -> short help
+    '''
+    commands_dir = os.path.dirname(os.path.abspath(__file__))
+    result = {}
+    for entry in sorted(os.listdir(commands_dir)):
+        if not entry.startswith('_') or entry.startswith('__'):
+            continue
+        if not os.path.isfile(os.path.join(commands_dir, entry, '__init__.py')):
+            continue
+
+        mod = importlib.import_module('pycoreutils.commands.{}'.format(entry))
+        if hasattr(mod, 'subcommand'):
+            result[entry[1:]] = mod.subcommand.short_help or ''
+
+    return result
+
+
+def write_index():
+    lines = [HEADER, 'index = {']
+    for name, short_help in sorted(build_index().items()):
+        lines.append('    {!r}: {!r},'.format(str(name), str(short_help)))
+    lines.append('}')
+    lines.append('')
+    lines.append('commands = sorted(index)')
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '__init__.py')
+    with open(path, 'w') as fd:
+        fd.write('\n'.join(lines) + '\n')
+
+
+if __name__ == '__main__':
+    write_index()
@@ -1,6 +1,6 @@
 import importlib
 
-from .commands import commands
+from .commands import commands, index
 from .vendor import click
 from .version import __version__
 
@@ -10,6 +10,10 @@ class PycoreutilsMulticommand(click.MultiCommand):
         return commands
 
     def get_command(self, ctx, name):
+        # Only the chosen command is imported, and only if it is known to exist
+        if name not in index:
+            return None
+
         try:
             mod = importlib.import_module(u'pycoreutils.commands._{}'.format(name))
             if hasattr(mod, 'subcommand'):
@@ -19,6 +23,12 @@ class PycoreutilsMulticommand(click.MultiCommand):
 
         return None
 
+    def format_commands(self, ctx, formatter):
+        # Unlike the default implementation this does not import every command
+        rows = [(name, index[name]) for name in self.list_commands(ctx)]
+        with formatter.section('Commands'):
+            formatter.write_dl(rows)
+
 
 @click.command(
     cls=PycoreutilsMulticommand,
@@ -0,0 +1,232 @@
+'''
+A warm process that runs pycoreutils commands on behalf of a thin client
+
+The server imports every command once, then pre-forks workers that accept
+connections on a Unix domain socket. A client sends its argv, working
+directory and environment along with its stdin, stdout and stderr file
+descriptors (using SCM_RIGHTS). The worker forks a child that adopts all of
+those, runs the command and exits, and the worker sends the exit status back.
+Forking an already initialised interpreter is far cheaper than starting one.
+
+The client side lives in scripts/pycoreutils-client. It is deliberately
+standalone so that it never has to import pycoreutils or click, so keep the
+protocol below in sync with it.
+
+Protocol, over a SOCK_STREAM connection:
+
+* client -> server: a 4 byte big-endian length followed by that many bytes of
+  UTF-8 JSON, `{"argv": [...], "cwd": "...", "env": {...}}`. The first
+  message carries the three file descriptors as ancillary data.
+* server -> client: a 4 byte big-endian signed exit status
+'''
+import array
+import errno
+import importlib
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+import tempfile
+import traceback
+
+from .commands import commands
+from .vendor import click
+
+
+HEADER = struct.Struct('!I')
+STATUS = struct.Struct('!i')
+FD_COUNT = 3
+
+
+def default_socket_path():
+    '''
+    Returns the socket used when none is given, private to the current user
+    '''
+    if 'PYCOREUTILS_SOCKET' in os.environ:
+        return os.environ['PYCOREUTILS_SOCKET']
+
+    directory = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(directory, 'pycoreutils-{}.sock'.format(os.getuid()))
+
+
+def is_supported():
+    '''
+    Whether this platform and Python can pass file descriptors over sockets
+    '''
+    return hasattr(socket, 'AF_UNIX') and hasattr(socket.socket, 'recvmsg')
+
+
+def serve(socket_path, workers):
+    '''
+    Listen on `socket_path` with `workers` pre-forked workers until terminated
+    '''
+    # Import every command up front so each request only pays for a fork
+    for name in commands:
+        importlib.import_module('pycoreutils.commands._{}'.format(name))
+
+    if os.path.exists(socket_path):
+        try:
+            socket.socket(socket.AF_UNIX, socket.SOCK_STREAM).connect(socket_path)
+        except socket.error:
+            # Left behind by a server that is no longer running
+            os.unlink(socket_path)
+        else:
+            raise click.UsageError('a server is already listening on {}'.format(socket_path))
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        listener.bind(socket_path)
+    finally:
+        os.umask(old_umask)
+    listener.listen(128)
+
+    pids = set()
+
+    def shutdown(signum, frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, shutdown)
+    try:
+        while True:
+            while len(pids) < workers:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                pid = os.fork()
+                if pid == 0:
+                    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                    _worker(listener)
+                    os._exit(0)
+                pids.add(pid)
+
+            # Replace any worker that dies
+            try:
+                pid, _ = os.wait()
+            except OSError as e:
+                if e.errno == errno.EINTR:
+                    continue
+                raise
+            pids.discard(pid)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass
+        listener.close()
+        os.unlink(socket_path)
+
+
+def _worker(listener):
+    while True:
+        try:
+            conn, _ = listener.accept()
+        except socket.error as e:
+            if e.errno == errno.EINTR:
+                continue
+            raise
+
+        try:
+            _handle(conn)
+        except Exception:
+            traceback.print_exc()
+        finally:
+            conn.close()
+
+
+def _handle(conn):
+    if not _is_same_user(conn):
+        return
+
+    fds = []
+    data, ancdata, _, _ = conn.recvmsg(HEADER.size, socket.CMSG_SPACE(FD_COUNT * array.array('i').itemsize))
+    for level, kind, cmsg_data in ancdata:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            received = array.array('i')
+            received.frombytes(cmsg_data[:len(cmsg_data) - len(cmsg_data) % received.itemsize])
+            fds.extend(received)
+
+    try:
+        data += _recv_exactly(conn, HEADER.size - len(data))
+        (length,) = HEADER.unpack(data)
+        request = json.loads(_recv_exactly(conn, length).decode('utf-8'))
+        if len(fds) != FD_COUNT:
+            return
+
+        pid = os.fork()
+        if pid == 0:
+            conn.close()
+            _run(request, fds)
+
+        _, status = os.waitpid(pid, 0)
+    finally:
+        for fd in fds:
+            os.close(fd)
+
+    if os.WIFSIGNALED(status):
+        # The same status a shell reports for a process killed by a signal
+        exit_code = 128 + os.WTERMSIG(status)
+    else:
+        exit_code = os.WEXITSTATUS(status)
+    conn.sendall(STATUS.pack(exit_code))
+
+
+def _run(request, fds):
+    '''
+    Runs a request in a freshly forked child. Never returns.
+    '''
+    exit_code = 1
+    try:
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+            os.close(fd)
+
+        os.chdir(request['cwd'])
+        os.environ.clear()
+        os.environ.update(request['env'])
+
+        from .main import cli
+        cli.main(args=request['argv'], prog_name='pycoreutils')
+        exit_code = 0
+    except SystemExit as e:
+        if e.code is None:
+            exit_code = 0
+        elif isinstance(e.code, int):
+            exit_code = e.code
+        else:
+            sys.stderr.write('{}\n'.format(e.code))
+    except Exception:
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(exit_code)
+
+
+def _is_same_user(conn):
+    '''
+    Only serve clients running as the same user, where the platform can tell
+    '''
+    if not hasattr(socket, 'SO_PEERCRED'):
+        return True
+
+    creds = struct.Struct('3i')
+    pid, uid, gid = creds.unpack(conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, creds.size))
+    return uid == os.getuid()
+
+
+def _recv_exactly(conn, size):
+    chunks = []
+    while size > 0:
+        chunk = conn.recv(size)
+        if not chunk:
+            raise EOFError('connection closed by the client')
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
@@ -1,6 +1,22 @@
+import collections
+import functools
+import math
+import mmap
 import os
+import re
 import signal
 import stat
+import sys
+
+
+# Large enough that per-block interpreter overhead is negligible next to the
+#  actual work, small enough to stay comfortably within the CPU caches
+BLOCK_SIZE = 1024 * 1024
+
+# Lines joined into a single write by `write_lines`
+LINE_BATCH_SIZE = 4096
+
+HUMAN_UNITS = 'KMGTPEZY'
 
 
 def getsignals():
@@ -21,6 +37,101 @@ def getsignals():
     return signals
 
 
+def ordered_imap(func, iterable, jobs=1, backlog=4, processes=False):
+    '''
+    Yield func(item) for each item of `iterable`, in order, using `jobs` threads
+
+    At most `backlog` items per thread are in flight, so `iterable` is
+    consumed lazily and may be arbitrarily long. Exceptions raised by `func`
+    are re-raised when their result is reached.
+
+    With `processes` a pool of processes is used instead, for work that holds
+    the GIL. `func` and the items must then be picklable.
+    '''
+    if jobs <= 1:
+        for item in iterable:
+            yield func(item)
+        return
+
+    # multiprocessing is slow to import, so only pay for it when it's used
+    if processes:
+        from multiprocessing import Pool
+    else:
+        from multiprocessing.pool import ThreadPool as Pool
+
+    pool = Pool(jobs)
+    pending = collections.deque()
+    try:
+        for item in iterable:
+            pending.append(pool.apply_async(func, (item,)))
+            if len(pending) >= jobs * backlog:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+    finally:
+        pool.terminate()
+
+
+class ReadyResult(object):
+    def __init__(self, value):
+        '''
+        Stands in for the AsyncResult of a pool when work is done without one
+        '''
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+def parse_size(value, default_unit=''):
+    '''
+    Convert a size like '10', '64K', '2M' or '1GB' to a number of bytes
+
+    The suffixes K, M, G, T, P and E are powers of 1024 while KB, MB, etc.
+    are powers of 1000, as in GNU coreutils. `default_unit` is the suffix
+    assumed when there is none. Raises ValueError for anything else.
+
+    >>> parse_size('64K')
+    65536
+    '''
+    match = re.match(r'^(\d+)([KMGTPE]?)(B?)$', value.strip(), re.IGNORECASE)
+    if not match:
+        raise ValueError('invalid size: {}'.format(value))
+
+    number, unit, decimal = match.groups()
+    if not unit and not decimal:
+        unit = default_unit
+    if not unit:
+        return int(number)
+
+    power = 'KMGTPE'.find(unit.upper()) + 1
+    return int(number) * (1000 if decimal else 1024) ** power
+
+
+def human_size(size):
+    '''
+    Format a number of bytes like the -h option of GNU ls and du
+
+    Sizes are rounded up, to one decimal below 10.
+
+    >>> human_size(1536)
+    '1.5K'
+    '''
+    if size < 1024:
+        return str(size)
+
+    value = float(size)
+    for unit in HUMAN_UNITS:
+        value /= 1024
+        if value < 10:
+            rounded = math.ceil(value * 10) / 10
+            if rounded < 10:
+                return '{:.1f}{}'.format(rounded, unit)
+        rounded = int(math.ceil(value))
+        if rounded < 1024 or unit == HUMAN_UNITS[-1]:
+            return '{}{}'.format(rounded, unit)
+
+
 def getuserhome():
     '''
     Returns the home-directory of the current user
@@ -31,85 +142,183 @@ def getuserhome():
         return os.environ['HOMEPATH']  # Windows
 
 
+def _permission_string(bits):
+    """
+    Returns the nine rwx characters of the permission `bits`, including the
+    setuid, setgid and sticky bits
+    """
+    chars = []
+    for read, write, execute, special, set_char in (
+        (stat.S_IRUSR, stat.S_IWUSR, stat.S_IXUSR, stat.S_ISUID, 's'),
+        (stat.S_IRGRP, stat.S_IWGRP, stat.S_IXGRP, stat.S_ISGID, 's'),
+        (stat.S_IROTH, stat.S_IWOTH, stat.S_IXOTH, stat.S_ISVTX, 't'),
+    ):
+        chars.append('r' if bits & read else '-')
+        chars.append('w' if bits & write else '-')
+        if bits & special:
+            chars.append(set_char if bits & execute else set_char.upper())
+        else:
+            chars.append('x' if bits & execute else '-')
+    return ''.join(chars)
+
+
+# Every possible permission string, indexed by the lower 12 bits of a mode
+_PERMISSION_STRINGS = tuple(_permission_string(bits) for bits in range(0o10000))
+
+_TYPE_CHARS = {
+    stat.S_IFREG: '-',
+    stat.S_IFDIR: 'd',
+    stat.S_IFCHR: 'c',
+    stat.S_IFBLK: 'b',
+    stat.S_IFLNK: 'l',
+    stat.S_IFIFO: 'p',
+    stat.S_IFSOCK: 's',
+}
+
+
 def mode2string(mode):
     '''
     Convert mode-integer to string
 
-    >>> from pycoreutils.lib import mode2string
+    The permissions are looked up in a precomputed table, so this is cheap
+    enough to call for every entry of a huge directory.
+
+    >>> from pycoreutils.utils import mode2string
     >>> mode2string(33261)
     '-rwxr-xr-x'
     >>> mode2string(33024)
     '-r--------'
+    >>> mode2string(0o41777)
+    'drwxrwxrwt'
     '''
-    if stat.S_ISREG(mode):
-        s = '-'
-    elif stat.S_ISDIR(mode):
-        s = 'd'
-    elif stat.S_ISCHR(mode):
-        s = 'c'
-    elif stat.S_ISBLK(mode):
-        s = 'b'
-    elif stat.S_ISLNK(mode):
-        s = 'l'
-    elif stat.S_ISFIFO(mode):
-        s = 'p'
-    elif stat.S_ISSOCK(mode):
-        s = 's'
-    else:
-        s = '-'
+    return _TYPE_CHARS.get(stat.S_IFMT(mode), '-') + _PERMISSION_STRINGS[mode & 0o7777]
 
-    # User Read
-    if bool(mode & stat.S_IRUSR):
-        s += 'r'
-    else:
-        s += '-'
 
-    # User Write
-    if bool(mode & stat.S_IWUSR):
-        s += 'w'
-    else:
-        s += '-'
+def read_blocks(fd, block_size=BLOCK_SIZE):
+    '''
+    Yield the remaining contents of the binary file object `fd` as memoryviews
 
-    # User Execute
-    if bool(mode & stat.S_IXUSR):
-        s += 'x'
-    else:
-        s += '-'
+    Regular files are memory mapped, so the yielded views point straight at
+    the page cache. Anything else (pipes, terminals, BytesIO) is read with
+    `readinto` into a single reused buffer. Either way every view is only
+    valid until the next one is requested.
+    '''
+    mapped = _mmap_file(fd)
+    if mapped is not None:
+        view = memoryview(mapped)
+        for offset in range(fd.tell(), len(mapped), block_size):
+            yield view[offset:offset + block_size]
+        fd.seek(0, os.SEEK_END)
+        return
 
-    # Group Read
-    if bool(mode & stat.S_IRGRP):
-        s += 'r'
-    else:
-        s += '-'
+    if not hasattr(fd, 'readinto'):
+        # eg. cStringIO on Python 2
+        for data in iter(functools.partial(fd.read, block_size), b''):
+            yield memoryview(data)
+        return
 
-    # Group Write
-    if bool(mode & stat.S_IWGRP):
-        s += 'w'
-    else:
-        s += '-'
+    buf = bytearray(block_size)
+    view = memoryview(buf)
+    while True:
+        size = fd.readinto(buf)
+        if not size:
+            break
+        yield view[:size]
 
-    # Group Execute
-    if bool(mode & stat.S_IXGRP):
-        s += 'x'
-    else:
-        s += '-'
 
-    # Other Read
-    if bool(mode & stat.S_IROTH):
-        s += 'r'
-    else:
-        s += '-'
+def read_full_blocks(fd, block_size=BLOCK_SIZE):
+    '''
+    Yield the remaining contents of the binary file object `fd` as bytes
 
-    # Other Write
-    if bool(mode & stat.S_IWOTH):
-        s += 'w'
-    else:
-        s += '-'
+    Every block is exactly `block_size` bytes except possibly the last, even
+    when reading from a pipe that returns short reads. Unlike `read_blocks`
+    the blocks are independent objects that can be kept or handed to other
+    threads.
+    '''
+    while True:
+        block = fd.read(block_size)
+        if not block:
+            break
 
-    # Other Execute
-    if bool(mode & stat.S_IXOTH):
-        s += 'x'
-    else:
-        s += '-'
+        while len(block) < block_size:
+            more = fd.read(block_size - len(block))
+            if not more:
+                break
+            block += more
+
+        yield block
+
+
+def read_records(fd, separator=b'\n', block_size=BLOCK_SIZE):
+    '''
+    Yield the lines of the binary file object `fd` without their separators
+
+    The file is read `block_size` bytes at a time and each block is split at
+    once, so there is a single read buffer per file however it is opened.
+    The pieces of a line spanning blocks are only joined once it ends, so a
+    long line is not copied over and over. `separator` is a single byte.
+    A last line without a separator is yielded as well.
+    '''
+    pending = []
+    while True:
+        block = fd.read(block_size)
+        if not block:
+            break
+        records = block.split(separator)
+        if len(records) == 1:
+            pending.append(block)
+            continue
+        if pending:
+            pending.append(records[0])
+            records[0] = b''.join(pending)
+        pending = [records.pop()]
+        for record in records:
+            yield record
+    last = b''.join(pending)
+    if last:
+        yield last
+
+
+def write_lines(fd, lines, separator=b'\n', batch_size=LINE_BATCH_SIZE):
+    '''
+    Write each of `lines` followed by `separator` to `fd`, a batch at a time
+
+    The lines already made are still written if making the next one fails,
+    eg. on finding unsorted input.
+    '''
+    batch = []
+    try:
+        for line in lines:
+            batch.append(line)
+            if len(batch) >= batch_size:
+                batch.append(b'')
+                fd.write(separator.join(batch))
+                batch = []
+    finally:
+        if batch:
+            batch.append(b'')
+            fd.write(separator.join(batch))
+
+
+def _mmap_file(fd):
+    '''
+    Memory map `fd` read-only if it is a non-empty regular file
+
+    Returns None when the file cannot be mapped. Python 2 mmap objects do not
+    support memoryview, so they are never mapped there.
+    '''
+    if sys.version_info < (3, 0):
+        return None
+
+    try:
+        fileno = fd.fileno()
+        st = os.fstat(fileno)
+        if not stat.S_ISREG(st.st_mode) or st.st_size == 0:
+            return None
+        mapped = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    except (AttributeError, ValueError, EnvironmentError, mmap.error):
+        return None
 
-    return s
+    if hasattr(mapped, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+        mapped.madvise(mmap.MADV_SEQUENTIAL)
+    return mapped
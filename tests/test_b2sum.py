@@ -0,0 +1,44 @@
+from __future__ import unicode_literals
+
+import hashlib
+import unittest
+
+from .base import PycoreutilsBaseTest
+
+
+@unittest.skipUnless(hasattr(hashlib, 'blake2b'), 'BLAKE2 requires Python 3.6')
+class TestB2Sum(PycoreutilsBaseTest):
+    def test_b2sum(self):
+        result = self.runner.invoke(self.cli, ['b2sum', '-'], input=b'test')
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, '{}  -\n'.format(hashlib.blake2b(b'test').hexdigest()))
+
+        result = self.runner.invoke(self.cli, ['b2sum', '-l', '256', '--tag', '-'], input=b'test')
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, 'BLAKE2b-256 (-) = 928b20366943e2afd11ebc0eae2e53a93bf177a4fcf35bcc64d503704e65e202\n')
+
+        result = self.runner.invoke(self.cli, ['b2sum', '-l', '12', '-'], input=b'test')
+        self.assertEqual(result.exit_code, 2)
+
+    def test_b2sum_tree(self):
+        data = bytes(bytearray(range(256))) * 100
+        params = dict(digest_size=64, fanout=0, depth=2, leaf_size=4096, inner_size=64)
+        leaves = [data[i:i + 4096] for i in range(0, len(data), 4096)]
+        root = hashlib.blake2b(node_depth=1, last_node=True, **params)
+        for offset, leaf in enumerate(leaves):
+            root.update(hashlib.blake2b(leaf, node_offset=offset, last_node=offset == len(leaves) - 1, **params).digest())
+        expected = '{}  -\n'.format(root.hexdigest())
+
+        for jobs in ('1', '3'):
+            result = self.runner.invoke(self.cli, ['b2sum', '--leaf-size', '4K', '-j', jobs, '-'], input=data)
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(result.output, expected)
+
+        with self.runner.isolated_filesystem():
+            with open('data', 'wb') as f:
+                f.write(data)
+            with open('checksum.txt', 'w') as f:
+                f.write(expected.replace('-', 'data'))
+            result = self.runner.invoke(self.cli, ['b2sum', '-c', '--leaf-size', '4K', 'checksum.txt'])
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(result.output, 'data: OK\n')
@@ -1,5 +1,7 @@
 from __future__ import unicode_literals
 
+import base64
+
 from .base import PycoreutilsBaseTest
 
 
@@ -28,6 +30,25 @@ class TestBase64(PycoreutilsBaseTest):
         self.assertEqual(result.exit_code, 0)
         self.assertEqual(result.output, 'TG9M' * 4096)
 
+    def test_base64_large_encode(self):
+        decoded = bytes(bytearray(range(256))) * 10000
+        encoded = base64.b64encode(decoded).decode('ascii')
+        for wrap in (76, 5):
+            expected = ''.join(encoded[i:i + wrap] + '\n' for i in range(0, len(encoded), wrap))
+            for jobs in ('1', '3'):
+                result = self.runner.invoke(self.cli, ['base64', '-w', str(wrap), '-j', jobs], input=decoded)
+                self.assertEqual(result.exit_code, 0)
+                self.assertEqual(result.output, expected)
+
+    def test_base64_ignore_garbage(self):
+        encoded = b'SGF2ZSBh*IGxvdCBv\nZiBmdW4u!Li4K\r\n'
+        result = self.runner.invoke(self.cli, ['base64', '-d', '-i'], input=encoded)
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, 'Have a lot of fun...\n')
+
+        result = self.runner.invoke(self.cli, ['base64', '-d'], input=encoded)
+        self.assertEqual(result.exit_code, 1)
+
     def test_invalid_b64(self):
         encoded = b'*234'
         result = self.runner.invoke(self.cli, ['base64', '-d'], input=encoded)
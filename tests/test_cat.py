@@ -0,0 +1,56 @@
+from __future__ import unicode_literals
+
+from .base import PycoreutilsBaseTest
+from pycoreutils.commands._cat.command import cat_file
+
+
+class TestCat(PycoreutilsBaseTest):
+    def test_cat(self):
+        result = self.runner.invoke(self.cli, ['cat'], input=b'hello\nworld')
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, 'hello\nworld')
+
+    def test_cat_options(self):
+        data = b'a\tb\n\n\n\nc\x01\x7f\xff\n'
+        cases = (
+            (['-n'], b'     1\ta\tb\n     2\t\n     3\t\n     4\t\n     5\tc\x01\x7f\xff\n'),
+            (['-b', '-s'], b'     1\ta\tb\n\n     2\tc\x01\x7f\xff\n'),
+            (['-A'], b'a^Ib$\n$\n$\n$\nc^A^?M-^?$\n'),
+            (['-e'], b'a\tb$\n$\n$\n$\nc^A^?M-^?$\n'),
+            (['-sT'], b'a^Ib\n\nc\x01\x7f\xff\n'),
+        )
+        for args, expected in cases:
+            result = self.runner.invoke(self.cli, ['cat'] + args, input=data)
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(result.output_bytes, expected, args)
+
+    def test_cat_files(self):
+        with self.runner.isolated_filesystem():
+            with open('a.txt', 'wb') as f:
+                f.write(b'one\ntwo')
+            with open('b.txt', 'wb') as f:
+                f.write(b'\nthree\n')
+
+            # A last line without a newline carries on into the next file
+            result = self.runner.invoke(self.cli, ['cat', '-n', 'missing.txt', 'a.txt', 'b.txt'])
+            self.assertEqual(result.exit_code, 1)
+            self.assertEqual(result.output, 'cat: missing.txt: No such file or directory\n     1\tone\n     2\ttwo\n     3\tthree\n')
+
+    def test_cat_file_descriptors(self):
+        # Real files take the system call path rather than the CliRunner streams
+        with self.runner.isolated_filesystem():
+            data = bytes(bytearray(range(256))) * 1000
+            with open('input.bin', 'wb') as f:
+                f.write(data)
+
+            with open('input.bin', 'rb') as fd, open('output.bin', 'wb') as output:
+                output.write(b'head')
+                fd.seek(10)
+                cat_file(fd, output)
+                cat_file(fd, output)
+
+            with open('output.bin', 'rb') as f:
+                self.assertEqual(f.read(), b'head' + data[10:])
+
+            with open('output.bin', 'rb') as fd, open('output.bin', 'ab') as output:
+                self.assertRaises(IOError, cat_file, fd, output)
@@ -0,0 +1,32 @@
+from __future__ import unicode_literals
+
+from .base import PycoreutilsBaseTest
+
+
+class TestCksum(PycoreutilsBaseTest):
+    def test_cksum_stdin(self):
+        for data, expected in ((b'', '4294967295 0\n'), (b'test', '3076352578 4\n'), (b'x' * 300, '3786917833 300\n')):
+            result = self.runner.invoke(self.cli, ['cksum'], input=data)
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(result.output, expected)
+
+    def test_cksum_check(self):
+        with self.runner.isolated_filesystem():
+            with open('hello.txt', 'w') as f:
+                f.write('test')
+
+            result = self.runner.invoke(self.cli, ['cksum', 'hello.txt'])
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(result.output, '3076352578 4 hello.txt\n')
+
+            with open('checksum.txt', 'w') as f:
+                f.write(result.output)
+            result = self.runner.invoke(self.cli, ['cksum', '-c', 'checksum.txt'])
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(result.output, 'hello.txt: OK\n')
+
+            with open('hello.txt', 'w') as f:
+                f.write('tests')
+            result = self.runner.invoke(self.cli, ['cksum', '-c', 'checksum.txt'])
+            self.assertEqual(result.exit_code, 1)
+            self.assertEqual(result.output, 'hello.txt: FAILED\nWARNING: 1 computed checksum did NOT match\n')
@@ -0,0 +1,60 @@
+from __future__ import unicode_literals
+
+from .base import PycoreutilsBaseTest
+
+
+class TestComm(PycoreutilsBaseTest):
+    def setUp(self):
+        super(TestComm, self).setUp()
+        self.filesystem = self.runner.isolated_filesystem()
+        self.filesystem.__enter__()
+
+        with open('one', 'wb') as f:
+            f.write(b'a\nb\nd\ne')
+        with open('two', 'wb') as f:
+            f.write(b'a\nc\ne\nf\n')
+        with open('unsorted', 'wb') as f:
+            f.write(b'a\nc\nb\n')
+
+    def tearDown(self):
+        self.filesystem.__exit__(None, None, None)
+
+    def test_comm(self):
+        result = self.runner.invoke(self.cli, ['comm', 'one', 'two'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, '\t\ta\nb\n\tc\nd\n\t\te\n\tf\n')
+
+    def test_comm_options(self):
+        cases = (
+            (['-12'], 'a\ne\n'),
+            (['-3'], 'b\n\tc\nd\n\tf\n'),
+            (['-1', '--output-delimiter', '::'], '::a\nc\n::e\nf\n'),
+            (['--total', '-123'], '2\t2\t2\ttotal\n'),
+        )
+        for args, expected in cases:
+            result = self.runner.invoke(self.cli, ['comm'] + args + ['one', 'two'])
+            self.assertEqual(result.exit_code, 0, args)
+            self.assertEqual(result.output, expected, args)
+
+        result = self.runner.invoke(self.cli, ['comm', '-z', '-3', '-', 'two'], input=b'a\x00b\x00')
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, 'a\x00\ta\nc\ne\nf\n\x00b\x00')
+
+    def test_comm_order(self):
+        result = self.runner.invoke(self.cli, ['comm', 'unsorted', 'unsorted'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, '\t\ta\n\t\tc\n\t\tb\n')
+
+        result = self.runner.invoke(self.cli, ['comm', 'unsorted', 'two'])
+        self.assertEqual(result.exit_code, 1)
+        self.assertEqual(
+            result.output,
+            '\t\ta\n\t\tc\nb\n\te\n\tf\ncomm: file 1 is not in sorted order\ncomm: input is not in sorted order\n',
+        )
+
+        result = self.runner.invoke(self.cli, ['comm', '--check-order', 'unsorted', 'two'])
+        self.assertEqual(result.exit_code, 1)
+        self.assertEqual(result.output, '\t\ta\n\t\tc\ncomm: file 1 is not in sorted order\n')
+
+        result = self.runner.invoke(self.cli, ['comm', '--nocheck-order', 'unsorted', 'two'])
+        self.assertEqual(result.exit_code, 0)
@@ -0,0 +1,112 @@
+from __future__ import unicode_literals
+
+import os
+import stat
+
+from .base import PycoreutilsBaseTest
+
+
+class TestCp(PycoreutilsBaseTest):
+    def test_cp(self):
+        with self.runner.isolated_filesystem():
+            with open('a.txt', 'wb') as f:
+                f.write(b'hello\n')
+            os.mkdir('dir')
+
+            result = self.runner.invoke(self.cli, ['cp', 'a.txt', 'b.txt'])
+            self.assertEqual(result.exit_code, 0)
+            result = self.runner.invoke(self.cli, ['cp', '-v', 'a.txt', 'b.txt', 'dir'])
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(result.output, "'a.txt' -> 'dir/a.txt' (-rw-r--r--)\n'b.txt' -> 'dir/b.txt' (-rw-r--r--)\n")
+
+            for path in ('b.txt', 'dir/a.txt', 'dir/b.txt'):
+                with open(path, 'rb') as f:
+                    self.assertEqual(f.read(), b'hello\n')
+
+    def test_cp_errors(self):
+        with self.runner.isolated_filesystem():
+            os.mkdir('dir')
+            with open('a.txt', 'wb') as f:
+                f.write(b'hello\n')
+
+            cases = (
+                (['dir', 'copy'], "cp: -r not specified; omitting directory 'dir'\n"),
+                (['missing.txt', 'copy'], "cp: cannot stat 'missing.txt': No such file or directory\n"),
+                (['a.txt', 'a.txt'], "cp: 'a.txt' and 'a.txt' are the same file\n"),
+                (['a.txt', 'a.txt', 'b.txt'], "cp: target 'b.txt' is not a directory\n"),
+                (['-r', 'dir', 'dir'], "cp: cannot copy a directory, 'dir', into itself, 'dir/dir'\n"),
+            )
+            for args, expected in cases:
+                result = self.runner.invoke(self.cli, ['cp'] + args)
+                self.assertEqual(result.exit_code, 1)
+                self.assertEqual(result.output, expected)
+
+    def test_cp_tree(self):
+        with self.runner.isolated_filesystem():
+            os.makedirs('tree/sub/deep')
+            for i in range(100):
+                with open('tree/sub/file{}'.format(i), 'wb') as f:
+                    f.write('{}\n'.format(i).encode('ascii'))
+            os.symlink('file1', 'tree/sub/link')
+            os.chmod('tree/sub', 0o750)
+            os.chmod('tree/sub/file2', 0o400)
+            os.utime('tree/sub/file3', (1000000000, 1000000000))
+
+            for args in (['-a', '-j', '1'], ['-a', '-j', '4'], ['-r']):
+                result = self.runner.invoke(self.cli, ['cp'] + args + ['tree', 'copy'])
+                self.assertEqual(result.exit_code, 0)
+
+                self.assertEqual(sorted(os.listdir('copy/sub')), sorted(os.listdir('tree/sub')))
+                self.assertEqual(os.readlink('copy/sub/link'), 'file1')
+                with open('copy/sub/file42', 'rb') as f:
+                    self.assertEqual(f.read(), b'42\n')
+                self.assertEqual(stat.S_IMODE(os.stat('copy/sub').st_mode), 0o750)
+                self.assertEqual(stat.S_IMODE(os.stat('copy/sub/file2').st_mode), 0o400)
+                if '-a' in args:
+                    self.assertEqual(int(os.stat('copy/sub/file3').st_mtime), 1000000000)
+
+                os.chmod('copy/sub/file2', 0o600)
+                for root, dirs, files in os.walk('copy', topdown=False):
+                    for name in files:
+                        os.unlink(os.path.join(root, name))
+                    for name in dirs:
+                        path = os.path.join(root, name)
+                        if os.path.islink(path):
+                            os.unlink(path)
+                        else:
+                            os.rmdir(path)
+                os.rmdir('copy')
+
+    def test_cp_sparse(self):
+        with self.runner.isolated_filesystem():
+            with open('sparse.img', 'wb') as f:
+                f.seek(3 * 1024 * 1024)
+                f.write(b'data')
+                f.seek(6 * 1024 * 1024)
+                f.truncate()
+            with open('zeros.bin', 'wb') as f:
+                f.write(b'\0' * 200000 + b'x')
+
+            for mode in ('auto', 'always', 'never'):
+                for source in ('sparse.img', 'zeros.bin'):
+                    result = self.runner.invoke(self.cli, ['cp', '--sparse', mode, source, 'copy'])
+                    self.assertEqual(result.exit_code, 0)
+                    with open(source, 'rb') as f, open('copy', 'rb') as g:
+                        self.assertEqual(f.read(), g.read())
+                    os.unlink('copy')
+
+    def test_cp_pipe(self):
+        # Small enough to sit in the pipe before cp reads it
+        data = b'\0' * 30000 + b'hello\n'
+        with self.runner.isolated_filesystem():
+            for mode in ('auto', 'always', 'never'):
+                read_fd, write_fd = os.pipe()
+                self.addCleanup(os.close, read_fd)
+                os.write(write_fd, data)
+                os.close(write_fd)
+
+                result = self.runner.invoke(self.cli, ['cp', '--sparse', mode, '/dev/fd/{}'.format(read_fd), 'copy'])
+                self.assertEqual(result.exit_code, 0, mode)
+                with open('copy', 'rb') as f:
+                    self.assertEqual(f.read(), data, mode)
+                os.unlink('copy')
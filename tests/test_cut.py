@@ -0,0 +1,56 @@
+from __future__ import unicode_literals
+
+from .base import PycoreutilsBaseTest
+
+
+class TestCut(PycoreutilsBaseTest):
+    def test_cut(self):
+        result = self.runner.invoke(self.cli, ['cut', '-f', '2'], input=b'a\tb\tc\nd\te\n')
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, 'b\ne\n')
+
+    def test_cut_fields(self):
+        data = b'a\tb\tc\td\nnodelim\none\ttwo\n\nlast\tline'
+        cases = (
+            (['-f', '2-'], 'b\tc\td\nnodelim\ntwo\n\nline\n'),
+            (['-f', '3,1'], 'a\tc\nnodelim\none\n\nlast\n'),
+            (['-f', '1-2,2-3', '-s'], 'a\tb\tc\none\ttwo\nlast\tline\n'),
+            (['-f', '-2,4', '--output-delimiter', ', '], 'a, b, d\nnodelim\none, two\n\nlast, line\n'),
+            (['-f', '2', '--complement'], 'a\tc\td\nnodelim\none\n\nlast\n'),
+            (['-f', '1-', '--complement'], '\nnodelim\n\n\n\n'),
+            (['-f', '1-', '--complement', '-s'], '\n\n\n'),
+            (['-f', '5', '-s'], '\n\n\n'),
+            (['-d', 'e', '-f', '1', '-s'], 'nod\non\nlast\tlin\n'),
+        )
+        for args, expected in cases:
+            result = self.runner.invoke(self.cli, ['cut'] + args, input=data)
+            self.assertEqual(result.exit_code, 0, args)
+            self.assertEqual(result.output, expected, args)
+
+    def test_cut_bytes(self):
+        data = b'abcdef\nab\n'
+        cases = (
+            (['-b', '2-'], 'bcdef\nb\n'),
+            (['-c', '-2,4'], 'abd\nab\n'),
+            (['-b', '1-2,3-4', '--output-delimiter', ':'], 'ab:cd\nab\n'),
+            (['-b', '6,3-4,1-2', '--output-delimiter', ':'], 'ab:cd:f\nab\n'),
+            (['-b', '1-3,2-4', '--output-delimiter', ':'], 'abcd\nab\n'),
+            (['-b', '2-3', '--complement'], 'adef\na\n'),
+        )
+        for args, expected in cases:
+            result = self.runner.invoke(self.cli, ['cut'] + args, input=data)
+            self.assertEqual(result.exit_code, 0, args)
+            self.assertEqual(result.output, expected, args)
+
+    def test_cut_invalid(self):
+        for args in ([], ['-b', '0'], ['-f', '3-1'], ['-f', 'x'], ['-b', '-'], ['-b', '1', '-f', '1'], ['-d', ',', '-b', '1'], ['-d', ',,', '-f', '1']):
+            result = self.runner.invoke(self.cli, ['cut'] + args, input=b'abc\n')
+            self.assertEqual(result.exit_code, 2, args)
+
+    def test_cut_missing_file(self):
+        with self.runner.isolated_filesystem():
+            with open('data.txt', 'wb') as f:
+                f.write(b'a,b\n')
+            result = self.runner.invoke(self.cli, ['cut', '-d', ',', '-f', '2', 'missing', 'data.txt'])
+            self.assertEqual(result.exit_code, 1)
+            self.assertEqual(result.output, 'cut: missing: No such file or directory\nb\n')
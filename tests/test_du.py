@@ -0,0 +1,94 @@
+from __future__ import unicode_literals
+
+import os
+
+from .base import PycoreutilsBaseTest
+from pycoreutils.commands._du import command
+
+
+class TestDu(PycoreutilsBaseTest):
+    def setUp(self):
+        super(TestDu, self).setUp()
+        self.filesystem = self.runner.isolated_filesystem()
+        self.filesystem.__enter__()
+
+        os.makedirs('tree/sub/deep')
+        for path, size in (('tree/a', 3000), ('tree/sub/b', 100), ('tree/sub/deep/c', 5000)):
+            with open(path, 'wb') as f:
+                f.write(b'x' * size)
+        os.link('tree/sub/b', 'tree/sub/hardlink')
+
+    def tearDown(self):
+        self.filesystem.__exit__(None, None, None)
+
+    def apparent_sizes(self, args):
+        result = self.runner.invoke(self.cli, ['du', '-b'] + args)
+        self.assertEqual(result.exit_code, 0)
+        return [tuple(line.split('\t')) for line in result.output.splitlines()]
+
+    def test_du(self):
+        directory = os.stat('tree').st_size
+        expected = [
+            (str(directory + 5000), 'tree/sub/deep'),
+            (str(2 * directory + 5100), 'tree/sub'),
+            (str(3 * directory + 8100), 'tree'),
+        ]
+        for jobs in ('1', '4'):
+            self.assertEqual(self.apparent_sizes(['-j', jobs, 'tree']), expected)
+
+        self.assertEqual(self.apparent_sizes(['-s', 'tree']), expected[-1:])
+        self.assertEqual(self.apparent_sizes(['-d', '1', 'tree']), expected[1:])
+
+        # The hard link is only counted, and listed, once
+        all_files = self.apparent_sizes(['-a', 'tree'])
+        self.assertEqual(sorted(path for size, path in all_files),
+                         ['tree', 'tree/a', 'tree/sub', 'tree/sub/b', 'tree/sub/deep', 'tree/sub/deep/c'])
+        self.assertEqual(all_files[-1], expected[-1])
+
+    def test_du_overlapping_arguments(self):
+        directory = os.stat('tree').st_size
+        self.assertEqual(self.apparent_sizes(['-s', '-c', 'tree/sub', 'tree']), [
+            (str(2 * directory + 5100), 'tree/sub'),
+            (str(directory + 3000), 'tree'),
+            (str(3 * directory + 8100), 'total'),
+        ])
+
+        # Skipping the already counted tree/sub does not mix up the scans of
+        #  its siblings, whichever order they are listed in
+        others = ['tree/other{}'.format(n) for n in range(8)]
+        for n, other in enumerate(others):
+            os.makedirs(other + '/deeper')
+            with open(other + '/deeper/d', 'wb') as f:
+                f.write(b'x' * n)
+        expected = [
+            (str(directory + 5000), 'tree/sub/deep'),
+            (str(2 * directory + 5100), 'tree/sub'),
+            (str(17 * directory + 3028), 'tree'),
+        ]
+        for n, other in enumerate(others):
+            expected.append((str(directory + n), other + '/deeper'))
+            expected.append((str(2 * directory + n), other))
+        for jobs in ('1', '4'):
+            self.assertEqual(sorted(self.apparent_sizes(['-j', jobs, 'tree/sub', 'tree'])), sorted(expected))
+
+    def test_du_errors(self):
+        result = self.runner.invoke(self.cli, ['du', '-s', 'missing', 'tree/a'])
+        self.assertEqual(result.exit_code, 1)
+        self.assertEqual(result.output, "du: cannot access 'missing': No such file or directory\n4\ttree/a\n")
+
+        result = self.runner.invoke(self.cli, ['du', '-s', '-a', 'tree'])
+        self.assertEqual(result.exit_code, 2)
+
+    def test_inode_set(self):
+        pending = command.PENDING_INODES
+        command.PENDING_INODES = 4
+        try:
+            inodes = command.InodeSet()
+            for ino in range(100, 0, -3):
+                self.assertTrue(inodes.add(1, ino))
+            self.assertTrue(inodes.add(2, 100))
+            for ino in range(100, 0, -1):
+                self.assertEqual(inodes.add(1, ino), ino % 3 != 1)
+            self.assertEqual(len(inodes), 101)
+        finally:
+            command.PENDING_INODES = pending
@@ -0,0 +1,42 @@
+from __future__ import unicode_literals
+
+import os
+
+from .base import PycoreutilsBaseTest
+
+
+class TestHashSum(PycoreutilsBaseTest):
+    def test_hashsum_stdin(self):
+        result = self.runner.invoke(self.cli, ['hashsum', '-a', 'md5,sha1'], input=b'test')
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, (
+            'MD5 (-) = 098f6bcd4621d373cade4e832627b4f6\n'
+            'SHA1 (-) = a94a8fe5ccb19ba61c4c0873d391e987982fbbd3\n'
+        ))
+
+    def test_hashsum_manifests(self):
+        with self.runner.isolated_filesystem():
+            with open('hello.txt', 'w') as f:
+                f.write('test')
+            os.mkdir('out')
+
+            result = self.runner.invoke(self.cli, ['hashsum', '-a', 'md5,sha1', '-o', 'out', 'hello.txt'])
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(result.output, '')
+
+            with open(os.path.join('out', 'MD5SUMS')) as f:
+                self.assertEqual(f.read(), '098f6bcd4621d373cade4e832627b4f6  hello.txt\n')
+
+            result = self.runner.invoke(self.cli, ['sha1sum', '--check', os.path.join('out', 'SHA1SUMS')])
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(result.output, 'hello.txt: OK\n')
+
+    def test_hashsum_invalid_algorithm(self):
+        for algorithms in ('md5,nosuchhash', 'shake_128', ','):
+            result = self.runner.invoke(self.cli, ['hashsum', '-a', algorithms], input=b'test')
+            self.assertEqual(result.exit_code, 2, algorithms)
+
+    def test_hashsum_duplicate_algorithms(self):
+        result = self.runner.invoke(self.cli, ['hashsum', '-a', 'md5,MD5, md5'], input=b'test')
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, 'MD5 (-) = 098f6bcd4621d373cade4e832627b4f6\n')
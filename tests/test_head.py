@@ -0,0 +1,83 @@
+from __future__ import unicode_literals
+
+import io
+import os
+import subprocess
+import sys
+
+from .base import PycoreutilsBaseTest
+from pycoreutils.commands._head.command import head_lines
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestHead(PycoreutilsBaseTest):
+    def test_head(self):
+        data = ''.join('{}\n'.format(i) for i in range(1, 21)).encode('ascii')
+        result = self.runner.invoke(self.cli, ['head'], input=data)
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, ''.join('{}\n'.format(i) for i in range(1, 11)))
+
+    def test_head_options(self):
+        data = b'one\ntwo\nthree\nfour'
+        cases = (
+            (['-n', '2'], 'one\ntwo\n'),
+            (['-n', '0'], ''),
+            (['-n', '10'], 'one\ntwo\nthree\nfour'),
+            (['-n', '-3'], 'one\n'),
+            (['-n', '+3'], 'one\ntwo\nthree\n'),
+            (['-c', '5'], 'one\nt'),
+            (['-c', '-5'], 'one\ntwo\nthree'),
+            (['-c', '+5'], 'one\nt'),
+        )
+        for args, expected in cases:
+            result = self.runner.invoke(self.cli, ['head'] + args, input=data)
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(result.output, expected, args)
+
+    def test_head_files(self):
+        with self.runner.isolated_filesystem():
+            with open('a.txt', 'wb') as f:
+                f.write(b'a1\na2\n')
+            with open('b.txt', 'wb') as f:
+                f.write(b'b1\nb2\n')
+
+            result = self.runner.invoke(self.cli, ['head', '-n', '1', 'missing.txt', 'a.txt', 'b.txt'])
+            self.assertEqual(result.exit_code, 1)
+            self.assertEqual(
+                result.output,
+                "head: cannot open 'missing.txt' for reading: No such file or directory\n==> a.txt <==\na1\n\n==> b.txt <==\nb1\n",
+            )
+
+    def test_head_stops_early(self):
+        with self.runner.isolated_filesystem():
+            with open('a.txt', 'wb') as f:
+                f.write(b'a1\na2\na3\n')
+
+            # The rest of a regular file is left for whoever reads it next
+            output = io.BytesIO()
+            with open('a.txt', 'rb') as f:
+                head_lines(f, output, 1)
+                self.assertEqual(output.getvalue(), b'a1\n')
+                self.assertEqual(f.read(), b'a2\na3\n')
+
+    def test_head_closed_output(self):
+        with self.runner.isolated_filesystem():
+            with open('nums', 'wb') as f:
+                f.write(b''.join('{}\n'.format(i).encode('ascii') for i in range(100000)))
+
+            # Nothing is read from the pipe, so writing to it soon fails
+            env = dict(os.environ, PYTHONPATH=ROOT)
+            process = subprocess.Popen(
+                [sys.executable, '-W', 'ignore', '-c', 'import pycoreutils; pycoreutils.cli()', 'head', '-n', '50000', 'nums', 'nums'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=env,
+            )
+            process.stdout.close()
+            stderr = process.stderr.read()
+            process.wait()
+            process.stderr.close()
+            self.assertEqual(process.returncode, 1)
+            self.assertEqual(stderr, b'')
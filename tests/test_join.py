@@ -0,0 +1,93 @@
+from __future__ import unicode_literals
+
+from .base import PycoreutilsBaseTest
+
+
+class TestJoin(PycoreutilsBaseTest):
+    def setUp(self):
+        super(TestJoin, self).setUp()
+        self.filesystem = self.runner.isolated_filesystem()
+        self.filesystem.__enter__()
+
+        with open('one', 'wb') as f:
+            f.write(b'a 1 x\nb 2\nb 3\nd 4\n')
+        with open('two', 'wb') as f:
+            f.write(b'a A\nb B\nb C\nc D\n')
+        with open('unsorted', 'wb') as f:
+            f.write(b'b B\nz Z\na A\n')
+
+    def tearDown(self):
+        self.filesystem.__exit__(None, None, None)
+
+    def test_join(self):
+        result = self.runner.invoke(self.cli, ['join', 'one', 'two'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, 'a 1 x A\nb 2 B\nb 2 C\nb 3 B\nb 3 C\n')
+
+    def test_join_options(self):
+        cases = (
+            (['-a', '1', '-a', '2'], 'a 1 x A\nb 2 B\nb 2 C\nb 3 B\nb 3 C\nc D\nd 4\n'),
+            (['-v', '2'], 'c D\n'),
+            (['-v', '1', '-v', '2'], 'c D\nd 4\n'),
+            (['-o', '0,2.2,1.3', '-e', '-', '-a', '1'], 'a A x\nb B -\nb C -\nb B -\nb C -\nd - -\n'),
+            (['-1', '2', '-2', '1'], ''),
+            (['-t', ' ', '-o', '1.2 2.2'], '1 A\n2 B\n2 C\n3 B\n3 C\n'),
+        )
+        for args, expected in cases:
+            result = self.runner.invoke(self.cli, ['join'] + args + ['one', 'two'])
+            self.assertEqual(result.exit_code, 0, args)
+            self.assertEqual(result.output, expected, args)
+
+        with open('commas', 'wb') as f:
+            f.write(b'a,x,y\nb\nc,z\n')
+        result = self.runner.invoke(self.cli, ['join', '-t', ',', '-i', '-', 'commas'], input=b'A,1\nB,2\nC\n')
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, 'A,1,x,y\nB,2\nC,z\n')
+
+        # -e also stands in for fields that are there but empty
+        with open('empty1', 'wb') as f:
+            f.write(b',q\na,,1\n')
+        with open('empty2', 'wb') as f:
+            f.write(b',r\na,x,\n')
+        for args, expected in ((['-e', 'E'], 'E,q,r\na,E,1,x,E\n'), (['-e', 'E', '-o', '1.2,2.3,0'], 'q,E,E\nE,E,a\n')):
+            result = self.runner.invoke(self.cli, ['join', '-t', ','] + args + ['empty1', 'empty2'])
+            self.assertEqual(result.exit_code, 0, args)
+            self.assertEqual(result.output, expected, args)
+
+    def test_join_order(self):
+        result = self.runner.invoke(self.cli, ['join', 'two', 'unsorted'])
+        self.assertEqual(result.exit_code, 1)
+        self.assertEqual(result.output, 'b B B\nb C B\njoin: unsorted:3: is not sorted: a A\njoin: input is not in sorted order\n')
+
+        result = self.runner.invoke(self.cli, ['join', '--check-order', 'two', 'unsorted'])
+        self.assertEqual(result.exit_code, 1)
+        self.assertEqual(result.output, 'b B B\nb C B\njoin: unsorted:3: is not sorted: a A\n')
+
+        result = self.runner.invoke(self.cli, ['join', '--nocheck-order', 'two', 'unsorted'])
+        self.assertEqual(result.exit_code, 0)
+
+        # The rest of a file is still read to check its order, but only matters
+        #  if a line was unpairable before it
+        with open('tail', 'wb') as f:
+            f.write(b'b\nd\nc\n')
+        result = self.runner.invoke(self.cli, ['join', '-', 'tail'], input=b'a\n')
+        self.assertEqual(result.exit_code, 1)
+        self.assertEqual(result.output, 'join: tail:3: is not sorted: c\njoin: input is not in sorted order\n')
+
+        result = self.runner.invoke(self.cli, ['join', '-', 'tail'], input=b'b\n')
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, 'b\n')
+
+    def test_join_hash(self):
+        result = self.runner.invoke(self.cli, ['join', '--hash', 'two', 'unsorted'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(sorted(result.output.splitlines()), ['a A A', 'b B B', 'b C B'])
+
+        result = self.runner.invoke(self.cli, ['join', '--hash', '-a', '1', '-a', '2', '-', 'two'], input=b'z Z\nb B\na A\n')
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(sorted(result.output.splitlines()), ['a A A', 'b B B', 'b B C', 'c D', 'z Z'])
+
+    def test_join_invalid(self):
+        for args in (['-o', '3.1'], ['-o', '1.0'], ['-t', 'ab'], ['-a', '3'], ['-j', '1', '-1', '2']):
+            result = self.runner.invoke(self.cli, ['join'] + args + ['one', 'two'])
+            self.assertEqual(result.exit_code, 2, args)
@@ -0,0 +1,79 @@
+from __future__ import unicode_literals
+
+import os
+import time
+
+from .base import PycoreutilsBaseTest
+from pycoreutils.commands._ls.command import columns, human_size
+
+
+class TestLs(PycoreutilsBaseTest):
+    def setUp(self):
+        super(TestLs, self).setUp()
+        self.filesystem = self.runner.isolated_filesystem()
+        self.filesystem.__enter__()
+
+        os.makedirs('tree/sub/deep')
+        os.mkdir('tree/.hidden')
+        for path, size in (('tree/b.txt', 10), ('tree/a.txt', 300), ('tree/sub/c.txt', 0), ('tree/sub/deep/d.txt', 0)):
+            with open(path, 'wb') as f:
+                f.write(b'x' * size)
+        os.symlink('a.txt', 'tree/link')
+        os.chmod('tree/a.txt', 0o4755)
+        os.utime('tree/b.txt', (1000040000, 1000040000))
+
+    def tearDown(self):
+        self.filesystem.__exit__(None, None, None)
+
+    def test_ls(self):
+        cases = (
+            (['tree'], 'a.txt\nb.txt\nlink\nsub\n'),
+            (['-a', 'tree'], '.\n..\n.hidden\na.txt\nb.txt\nlink\nsub\n'),
+            (['-A', '-r', 'tree'], 'sub\nlink\nb.txt\na.txt\n.hidden\n'),
+            (['-S', 'tree'], 'sub\na.txt\nb.txt\nlink\n'),
+            (['-d', 'tree'], 'tree\n'),
+            (['tree/b.txt', 'tree/sub'], 'tree/b.txt\n\ntree/sub:\nc.txt\ndeep\n'),
+            (['-C', '-w', '20', 'tree'], 'a.txt  link\nb.txt  sub\n'),
+        )
+        for args, expected in cases:
+            result = self.runner.invoke(self.cli, ['ls'] + args)
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(result.output, expected, args)
+
+    def test_ls_recursive(self):
+        expected = 'tree:\na.txt\nb.txt\nlink\nsub\n\ntree/sub:\nc.txt\ndeep\n\ntree/sub/deep:\nd.txt\n'
+        for jobs in ('1', '4'):
+            result = self.runner.invoke(self.cli, ['ls', '-R', '-j', jobs, 'tree'])
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(result.output, expected)
+
+    def test_ls_long(self):
+        result = self.runner.invoke(self.cli, ['ls', '-ln', 'tree'])
+        self.assertEqual(result.exit_code, 0)
+
+        lines = result.output.splitlines()
+        self.assertTrue(lines[0].startswith('total '))
+        self.assertEqual(len(lines), 5)
+        self.assertTrue(lines[1].startswith('-rwsr-xr-x 1 '))
+        self.assertEqual(lines[1].split()[4], '300')
+        self.assertIn(' 10 {} b.txt'.format(time.strftime('%b %e  %Y', time.localtime(1000040000))), lines[2])
+        self.assertTrue(lines[3].startswith('l'))
+        self.assertTrue(lines[3].endswith('link -> a.txt'))
+        self.assertTrue(lines[4].startswith('d'))
+
+    def test_ls_missing(self):
+        result = self.runner.invoke(self.cli, ['ls', 'missing', 'tree/sub'])
+        self.assertEqual(result.exit_code, 2)
+        self.assertEqual(result.output, "ls: cannot access 'missing': No such file or directory\ntree/sub:\nc.txt\ndeep\n")
+
+    def test_columns(self):
+        names = ['alpha', 'b', 'cc', 'dddd', 'eeeeeeeeeee', 'f', 'g']
+        self.assertEqual(columns(names, 80), ['alpha  b  cc  dddd  eeeeeeeeeee  f  g'])
+        self.assertEqual(columns(names, 20), ['alpha  eeeeeeeeeee', 'b      f', 'cc     g', 'dddd'])
+        self.assertEqual(columns(names, 5), names)
+
+    def test_human_size(self):
+        cases = ((0, '0'), (1023, '1023'), (1024, '1.0K'), (1025, '1.1K'), (10 * 1024, '10K'), (10 * 1024 + 1, '11K'),
+                 (1024 * 1024 - 1, '1.0M'), (5 * 1024 ** 3, '5.0G'))
+        for size, expected in cases:
+            self.assertEqual(human_size(size), expected, size)
@@ -2,6 +2,9 @@ from __future__ import unicode_literals
 
 from .base import PycoreutilsBaseTest
 
+from pycoreutils.commands import index
+from pycoreutils.commands.indexer import build_index
+
 
 class TestMain(PycoreutilsBaseTest):
     def test_noargs(self):
@@ -18,3 +21,13 @@ class TestMain(PycoreutilsBaseTest):
         result = self.runner.invoke(self.cli, ['invalidsubcommand'])
         self.assertEqual(result.exit_code, 2)
         self.assertTrue('Error: No such command' in result.output, result.output)
+
+    def test_command_index(self):
+        # If this fails, regenerate the index with `python -m pycoreutils.commands.indexer`
+        self.assertEqual(index, build_index())
+
+    def test_list_commands(self):
+        result = self.runner.invoke(self.cli, ['--help'])
+        self.assertEqual(result.exit_code, 0)
+        for name in index:
+            self.assertTrue('  {} '.format(name) in result.output, name)
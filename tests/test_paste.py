@@ -0,0 +1,69 @@
+from __future__ import unicode_literals
+
+from .base import PycoreutilsBaseTest
+from pycoreutils.commands._paste import command
+
+
+class TestPaste(PycoreutilsBaseTest):
+    def setUp(self):
+        super(TestPaste, self).setUp()
+        self.filesystem = self.runner.isolated_filesystem()
+        self.filesystem.__enter__()
+
+        with open('one', 'wb') as f:
+            f.write(b'a\nb\nc')
+        with open('two', 'wb') as f:
+            f.write(b'1\n2\n')
+
+    def tearDown(self):
+        self.filesystem.__exit__(None, None, None)
+
+    def test_paste(self):
+        result = self.runner.invoke(self.cli, ['paste', 'one', 'two'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, 'a\t1\nb\t2\nc\t\n')
+
+    def test_paste_options(self):
+        cases = (
+            (['-d', ',;', 'one', 'two', 'one'], 'a,1;a\nb,2;b\nc,;c\n'),
+            (['-d', '\\0', 'two', 'one'], '1a\n2b\nc\n'),
+            (['-s', 'one', 'two'], 'a\tb\tc\n1\t2\n'),
+            (['-s', '-d', '\\n,', 'one'], 'a\nb,c\n'),
+            (['-z', 'one'], 'a\nb\nc\x00'),
+        )
+        for args, expected in cases:
+            result = self.runner.invoke(self.cli, ['paste'] + args)
+            self.assertEqual(result.exit_code, 0, args)
+            self.assertEqual(result.output, expected, args)
+
+        result = self.runner.invoke(self.cli, ['paste', '-', 'two', '-'], input=b'x\ny\nz\n')
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, 'x\t1\ty\nz\t2\t\n')
+
+        result = self.runner.invoke(self.cli, ['paste', '-d', 'ab\\'])
+        self.assertEqual(result.exit_code, 2)
+
+    def test_paste_batches(self):
+        self.addCleanup(setattr, command, 'LINE_BATCH_SIZE', command.LINE_BATCH_SIZE)
+        command.LINE_BATCH_SIZE = 2
+
+        data = b''.join('{}\n'.format(i).encode('ascii') for i in range(7))
+        result = self.runner.invoke(self.cli, ['paste', '-d', ',', '-', '-', 'one'], input=data)
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, '0,1,a\n2,3,b\n4,5,c\n6,,\n')
+
+        result = self.runner.invoke(self.cli, ['paste', '-s', '-d', ',;', '-'], input=data)
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, '0,1;2,3;4,5;6\n')
+
+    def test_paste_long_lines(self):
+        self.addCleanup(setattr, command, 'BLOCK_SIZE', command.BLOCK_SIZE)
+        self.addCleanup(setattr, command, 'MIN_BUFFER_SIZE', command.MIN_BUFFER_SIZE)
+        command.BLOCK_SIZE = command.MIN_BUFFER_SIZE = size = 16
+
+        # Lines spanning many read blocks, including one ending exactly on a block boundary
+        with open('long', 'wb') as f:
+            f.write(b'x' * (5 * size) + b'\n' + b'y' * (size - 1) + b'\n' + b'z' * (3 * size + 7))
+        result = self.runner.invoke(self.cli, ['paste', 'long', 'two'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, 'x' * (5 * size) + '\t1\n' + 'y' * (size - 1) + '\t2\n' + 'z' * (3 * size + 7) + '\t\n')
@@ -0,0 +1,40 @@
+from __future__ import unicode_literals
+
+from .base import PycoreutilsBaseTest
+
+
+class TestSeq(PycoreutilsBaseTest):
+    def test_seq(self):
+        result = self.runner.invoke(self.cli, ['seq', '3'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, '1\n2\n3\n')
+
+    def test_seq_options(self):
+        cases = (
+            (['5', '1'], ''),
+            (['10', '-3', '1'], '10\n7\n4\n1\n'),
+            (['-w', '-2', '2', '10'], '-2\n00\n02\n04\n06\n08\n10\n'),
+            (['-s', ', ', '3'], '1, 2, 3\n'),
+            (['1', '0.5', '3'], '1.0\n1.5\n2.0\n2.5\n3.0\n'),
+            (['0.1', '0.1', '0.35'], '0.1\n0.2\n0.3\n'),
+            (['0.1', '0.1', '0.3'], '0.1\n0.2\n0.3\n'),
+            (['-w', '0.9', '0.1', '1.1'], '0.9\n1.0\n1.1\n'),
+            (['-f', '%.2e', '1', '3'], '1.00e+00\n2.00e+00\n3.00e+00\n'),
+            (['-f', 'n=%g%%', '2'], 'n=1%\nn=2%\n'),
+            (['-f', '\u20ac%g', '1', '2'], '\u20ac1\n\u20ac2\n'),
+            (['1e1', '1e1'], '10\n'),
+        )
+        for args, expected in cases:
+            result = self.runner.invoke(self.cli, ['seq'] + args)
+            self.assertEqual(result.exit_code, 0, args)
+            self.assertEqual(result.output, expected, args)
+
+    def test_seq_batches(self):
+        result = self.runner.invoke(self.cli, ['seq', '-s', ' ', '200000'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, ' '.join(str(i) for i in range(1, 200001)) + '\n')
+
+    def test_seq_invalid(self):
+        for args in ([], ['x'], ['1', '0', '2'], ['1', '2', '3', '4'], ['-f', '%d', '1'], ['-f', '%g', '-w', '1']):
+            result = self.runner.invoke(self.cli, ['seq'] + args)
+            self.assertEqual(result.exit_code, 2, args)
@@ -0,0 +1,64 @@
+from __future__ import unicode_literals
+
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from .base import PycoreutilsBaseTest
+
+from pycoreutils import server
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLIENT = os.path.join(ROOT, 'scripts', 'pycoreutils-client')
+
+
+@unittest.skipUnless(server.is_supported(), 'passing file descriptors is not supported')
+class TestServe(PycoreutilsBaseTest):
+    def setUp(self):
+        super(TestServe, self).setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        self.env = dict(os.environ)
+        self.env['PYTHONPATH'] = ROOT
+        self.env['PYCOREUTILS_SOCKET'] = os.path.join(self.tmpdir, 'pycoreutils.sock')
+
+        self.server = subprocess.Popen(
+            [sys.executable, '-c', 'import pycoreutils; pycoreutils.cli()', 'serve', '--workers', '2'],
+            env=self.env,
+        )
+        for _ in range(100):
+            if os.path.exists(self.env['PYCOREUTILS_SOCKET']):
+                break
+            time.sleep(0.05)
+
+    def tearDown(self):
+        self.server.send_signal(signal.SIGTERM)
+        self.server.wait()
+        shutil.rmtree(self.tmpdir)
+
+    def run_client(self, args, input=b''):
+        client = subprocess.Popen(
+            [sys.executable, CLIENT] + args,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=self.tmpdir,
+            env=self.env,
+        )
+        output, _ = client.communicate(input)
+        return client.returncode, output
+
+    def test_serve(self):
+        self.assertEqual(self.run_client(['tee'], b'test'), (0, b'test'))
+        self.assertEqual(self.run_client(['basename', '/path/to/file.c']), (0, b'file.c\n'))
+        self.assertEqual(self.run_client(['false']), (1, b''))
+
+    def test_serve_cwd(self):
+        with open(os.path.join(self.tmpdir, 'hello.txt'), 'w') as f:
+            f.write('test')
+
+        self.assertEqual(self.run_client(['sha1sum', 'hello.txt']), (0, b'a94a8fe5ccb19ba61c4c0873d391e987982fbbd3  hello.txt\n'))
@@ -1,5 +1,8 @@
 from __future__ import unicode_literals
 
+import hashlib
+import os
+
 from .base import PycoreutilsBaseTest
 
 
@@ -88,3 +91,98 @@ class TestSha1Sum(PycoreutilsBaseTest):
             self.assertTrue(result.exit_code != 0)
             self.assertTrue('hello2.txt: FAILED' in result.output)
             self.assertTrue('WARNING: 1 computed checksum did NOT match' in result.output)
+
+    def test_sha1_jobs(self):
+        with self.runner.isolated_filesystem():
+            filenames = ['file{}.txt'.format(i) for i in range(20)]
+            for i, filename in enumerate(filenames):
+                with open(filename, 'w') as f:
+                    f.write('test' * i)
+
+            result = self.runner.invoke(self.cli, ['sha1sum'] + filenames)
+            self.assertEqual(result.exit_code, 0)
+
+            parallel_result = self.runner.invoke(self.cli, ['sha1sum', '--jobs', '4'] + filenames)
+            self.assertEqual(parallel_result.exit_code, 0)
+            self.assertEqual(parallel_result.output, result.output)
+
+            result = self.runner.invoke(self.cli, ['sha1sum', '--jobs', '0', 'file1.txt'])
+            self.assertEqual(result.exit_code, 2)
+
+    def test_sha1_block_size(self):
+        data = b''.join(str(i).encode('ascii') for i in range(10000))
+        expected = '{}  {}\n'
+
+        with self.runner.isolated_filesystem():
+            with open('data.bin', 'wb') as f:
+                f.write(data)
+
+            for block_size in ('7', '4096', '1048576'):
+                result = self.runner.invoke(self.cli, ['sha1sum', '--block-size', block_size, 'data.bin'])
+                self.assertEqual(result.exit_code, 0)
+                self.assertEqual(result.output, expected.format(hashlib.sha1(data).hexdigest(), 'data.bin'))
+
+                result = self.runner.invoke(self.cli, ['sha1sum', '--block-size', block_size], input=data)
+                self.assertEqual(result.exit_code, 0)
+                self.assertEqual(result.output, expected.format(hashlib.sha1(data).hexdigest(), '-'))
+
+    def test_sha1_check_cache(self):
+        checksums = 'a94a8fe5ccb19ba61c4c0873d391e987982fbbd3  hello.txt\n'
+
+        with self.runner.isolated_filesystem():
+            with open('hello.txt', 'w') as f:
+                f.write('test')
+            os.utime('hello.txt', (1000000000, 1000000000))
+
+            with open('checksum.txt', 'w') as f:
+                f.write(checksums)
+
+            result = self.runner.invoke(self.cli, ['sha1sum', '--check', '--cache', 'cache.db', 'checksum.txt'])
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(result.output, 'hello.txt: OK\n')
+
+            # Change the contents but not the size or mtime, so only a
+            # cache hit still reports the old checksum
+            with open('hello.txt', 'w') as f:
+                f.write('TEST')
+            os.utime('hello.txt', (1000000000, 1000000000))
+
+            result = self.runner.invoke(self.cli, ['sha1sum', '--check', '--cache', 'cache.db', 'checksum.txt'])
+            self.assertEqual(result.exit_code, 0)
+
+            result = self.runner.invoke(self.cli, ['sha1sum', '--check', '--cache', 'cache.db', '--no-cache', 'checksum.txt'])
+            self.assertTrue(result.exit_code != 0)
+
+            result = self.runner.invoke(self.cli, ['sha1sum', '--check', '--cache', 'cache.db', '--refresh', 'checksum.txt'])
+            self.assertTrue(result.exit_code != 0)
+
+            result = self.runner.invoke(self.cli, ['sha1sum', '--check', '--cache', 'cache.db', 'checksum.txt'])
+            self.assertTrue(result.exit_code != 0)
+            self.assertTrue('hello.txt: FAILED' in result.output)
+
+    def test_sha1_check_jobs(self):
+        checksums = ''.join(
+            'a94a8fe5ccb19ba61c4c0873d391e987982fbbd3  file{}.txt\n'.format(i) for i in range(50)
+        ) + 'not a checksum line\n'
+
+        with self.runner.isolated_filesystem():
+            for i in range(50):
+                # file7.txt is missing and file3.txt has the wrong contents
+                if i != 7:
+                    with open('file{}.txt'.format(i), 'w') as f:
+                        f.write('test' if i != 3 else 'TEST')
+
+            with open('checksum.txt', 'w') as f:
+                f.write(checksums)
+
+            result = self.runner.invoke(self.cli, ['sha1sum', '--check', 'checksum.txt'])
+            self.assertEqual(result.exit_code, 1)
+            self.assertTrue('WARNING: 1 line is improperly formatted' in result.output)
+            self.assertTrue('WARNING: 1 listed file could not be read' in result.output)
+            self.assertTrue('WARNING: 1 computed checksum did NOT match' in result.output)
+
+            for args in (['--jobs', '4'], ['--jobs', '4', '--quiet'], ['--jobs', '4', '--status']):
+                expected = self.runner.invoke(self.cli, ['sha1sum', '--check', 'checksum.txt'] + args[2:])
+                parallel_result = self.runner.invoke(self.cli, ['sha1sum', '--check', 'checksum.txt'] + args)
+                self.assertEqual(parallel_result.exit_code, 1)
+                self.assertEqual(parallel_result.output, expected.output)
@@ -0,0 +1,93 @@
+from __future__ import unicode_literals
+
+import random
+
+from .base import PycoreutilsBaseTest
+from pycoreutils.commands._shuf.command import reservoir_sample
+
+
+class TestShuf(PycoreutilsBaseTest):
+    def test_shuf(self):
+        data = ''.join('{}\n'.format(i) for i in range(1000))
+        result = self.runner.invoke(self.cli, ['shuf'], input=data.encode('ascii'))
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(sorted(result.output.splitlines()), sorted(data.splitlines()))
+        self.assertNotEqual(result.output, data)
+
+    def test_shuf_file(self):
+        with self.runner.isolated_filesystem():
+            with open('data.txt', 'wb') as f:
+                f.write(b'a\nb\nc\nd')
+
+            result = self.runner.invoke(self.cli, ['shuf', 'data.txt'])
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(sorted(result.output.splitlines(True)), ['a\n', 'b\n', 'c\n', 'd\n'])
+
+            result = self.runner.invoke(self.cli, ['shuf', '-n', '2', 'data.txt'])
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(len(set(result.output.splitlines())), 2)
+
+            result = self.runner.invoke(self.cli, ['shuf', '-o', 'data.txt', 'data.txt'])
+            self.assertEqual(result.exit_code, 0)
+            with open('data.txt', 'rb') as f:
+                self.assertEqual(sorted(f.read().splitlines()), [b'a', b'b', b'c', b'd'])
+
+    def test_shuf_options(self):
+        cases = (
+            (['-e', 'a', 'b', 'c'], ['a', 'b', 'c']),
+            (['-i', '5-9'], ['5', '6', '7', '8', '9']),
+            (['-i', '5-4'], []),
+            (['-n', '0', '-e', 'a'], []),
+        )
+        for args, expected in cases:
+            result = self.runner.invoke(self.cli, ['shuf'] + args)
+            self.assertEqual(result.exit_code, 0, args)
+            self.assertEqual(sorted(result.output.splitlines()), expected, args)
+
+        result = self.runner.invoke(self.cli, ['shuf', '-z'], input=b'a\x00b\nc\x00')
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(sorted(result.output.split('\x00')), ['', 'a', 'b\nc'])
+
+        result = self.runner.invoke(self.cli, ['shuf', '-r', '-n', '50', '-i', '1-3'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(len(result.output.splitlines()), 50)
+        self.assertEqual(set(result.output.splitlines()), {'1', '2', '3'})
+
+    def test_shuf_sample(self):
+        data = ''.join('{}\n'.format(i) for i in range(10000)).encode('ascii')
+        result = self.runner.invoke(self.cli, ['shuf', '-n', '10'], input=data)
+        self.assertEqual(result.exit_code, 0)
+        lines = result.output.splitlines()
+        self.assertEqual(len(set(lines)), 10)
+        self.assertTrue(all(0 <= int(line) < 10000 for line in lines))
+
+        # Every item is about equally likely to be picked
+        rng = random.Random(0)
+        counts = [0] * 10
+        for _ in range(2000):
+            for item in reservoir_sample(range(10), 3, rng):
+                counts[item] += 1
+        self.assertTrue(all(500 < c < 700 for c in counts), counts)
+        self.assertEqual(sorted(reservoir_sample(range(2), 3, rng)), [0, 1])
+
+    def test_shuf_random_source(self):
+        with self.runner.isolated_filesystem():
+            with open('random', 'wb') as f:
+                f.write(bytes(bytearray(range(256))))
+            outputs = [self.runner.invoke(self.cli, ['shuf', '-i', '1-20', '--random-source', 'random']).output for _ in range(2)]
+            self.assertEqual(outputs[0], outputs[1])
+
+            with open('random', 'wb') as f:
+                f.write(b'x')
+            result = self.runner.invoke(self.cli, ['shuf', '-i', '1-20', '--random-source', 'random'])
+            self.assertEqual(result.exit_code, 1)
+            self.assertEqual(result.output, 'shuf: random: end of file\n')
+
+    def test_shuf_invalid(self):
+        for args in (['-e', '-i', '1-2'], ['-i', '3-1'], ['-i', 'x'], ['a', 'b'], ['-i', '1-2', 'a']):
+            result = self.runner.invoke(self.cli, ['shuf'] + args)
+            self.assertEqual(result.exit_code, 2, args)
+
+        result = self.runner.invoke(self.cli, ['shuf', '-r'], input=b'')
+        self.assertEqual(result.exit_code, 1)
+        self.assertEqual(result.output, 'shuf: no lines to repeat\n')
@@ -0,0 +1,48 @@
+from __future__ import unicode_literals
+
+from .base import PycoreutilsBaseTest
+
+
+class TestSort(PycoreutilsBaseTest):
+    def test_sort(self):
+        result = self.runner.invoke(self.cli, ['sort'], input=b'banana\napple\ncherry')
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, 'apple\nbanana\ncherry\n')
+
+    def test_sort_options(self):
+        data = b'b\t10\nA\t9\na\t10\nb\t2\n'
+        cases = (
+            (['-n', '-t', '\t', '-k2,2'], 'b\t2\nA\t9\na\t10\nb\t10\n'),
+            (['-t', '\t', '-k2,2n', '-k1,1r'], 'b\t2\nA\t9\nb\t10\na\t10\n'),
+            (['-r'], 'b\t2\nb\t10\na\t10\nA\t9\n'),
+            (['-f', '-u', '-k1,1'], 'A\t9\nb\t10\n'),
+            (['-s', '-t', '\t', '-k2,2'], 'b\t10\na\t10\nb\t2\nA\t9\n'),
+        )
+        for args, expected in cases:
+            result = self.runner.invoke(self.cli, ['sort'] + args, input=data)
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(result.output, expected, args)
+
+    def test_sort_external(self):
+        numbers = [(i * 7919) % 5000 for i in range(5000)]
+        data = ''.join('{}\n'.format(n) for n in numbers).encode('ascii')
+        expected = ''.join('{}\n'.format(n) for n in sorted(numbers, reverse=True))
+
+        for args in (['-S', '1K'], ['-S', '4K', '--parallel', '2']):
+            result = self.runner.invoke(self.cli, ['sort', '-n', '-r'] + args, input=data)
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(result.output, expected)
+
+    def test_sort_output_is_input(self):
+        with self.runner.isolated_filesystem():
+            with open('data.txt', 'wb') as f:
+                f.write(b'b\na\n')
+
+            result = self.runner.invoke(self.cli, ['sort', '-o', 'data.txt', 'data.txt'])
+            self.assertEqual(result.exit_code, 0)
+            with open('data.txt', 'rb') as f:
+                self.assertEqual(f.read(), b'a\nb\n')
+
+    def test_sort_invalid_key(self):
+        result = self.runner.invoke(self.cli, ['sort', '-k', '0,1'], input=b'')
+        self.assertEqual(result.exit_code, 2)
@@ -0,0 +1,107 @@
+from __future__ import unicode_literals
+
+import itertools
+import os
+
+from .base import PycoreutilsBaseTest
+from pycoreutils.commands._split.command import suffixes
+
+
+class TestSplit(PycoreutilsBaseTest):
+    def setUp(self):
+        super(TestSplit, self).setUp()
+        self.filesystem = self.runner.isolated_filesystem()
+        self.filesystem.__enter__()
+
+        with open('small', 'wb') as f:
+            f.write(b'a\nbb\nccc\ndddd\neeeee\nf\n')
+
+    def tearDown(self):
+        self.filesystem.__exit__(None, None, None)
+
+    def pieces(self):
+        pieces = []
+        for name in sorted(os.listdir('.')):
+            if name.startswith('x'):
+                with open(name, 'rb') as f:
+                    pieces.append(f.read())
+                os.remove(name)
+        return pieces
+
+    def test_split(self):
+        data = b''.join('{}\n'.format(i).encode('ascii') for i in range(2500))
+        result = self.runner.invoke(self.cli, ['split'], input=data)
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(sorted(os.listdir('.')), ['small', 'xaa', 'xab', 'xac'])
+        self.assertEqual([piece.count(b'\n') for piece in self.pieces()], [1000, 1000, 500])
+
+    def test_split_options(self):
+        cases = (
+            (['-b', '4'], [b'a\nbb', b'\nccc', b'\nddd', b'd\nee', b'eee\n', b'f\n']),
+            (['-l', '2'], [b'a\nbb\n', b'ccc\ndddd\n', b'eeeee\nf\n']),
+            (['-C', '4'], [b'a\n', b'bb\n', b'ccc\n', b'dddd', b'\n', b'eeee', b'e\nf\n']),
+            (['-C', '6'], [b'a\nbb\n', b'ccc\n', b'dddd\n', b'eeeee\n', b'f\n']),
+        )
+        for args, expected in cases:
+            # Both the kernel copies of a regular file and the copies of a stream
+            result = self.runner.invoke(self.cli, ['split'] + args + ['small'])
+            self.assertEqual(result.exit_code, 0, args)
+            self.assertEqual(self.pieces(), expected, args)
+
+            with open('small', 'rb') as f:
+                result = self.runner.invoke(self.cli, ['split'] + args, input=f.read())
+            self.assertEqual(result.exit_code, 0, args)
+            self.assertEqual(self.pieces(), expected, args)
+
+    def test_split_chunks(self):
+        cases = (
+            (['-n', '3'], [b'a\nbb\ncc', b'c\ndddd\n', b'eeeee\nf\n']),
+            (['-n', 'l/3'], [b'a\nbb\nccc\n', b'dddd\n', b'eeeee\nf\n']),
+            (['-n', 'l/7'], [b'a\nbb\n', b'ccc\n', b'', b'dddd\n', b'eeeee\n', b'', b'f\n']),
+            (['-e', '-n', 'l/7'], [b'a\nbb\n', b'ccc\n', b'dddd\n', b'eeeee\n', b'f\n']),
+            (['-n', 'r/4'], [b'a\neeeee\n', b'bb\nf\n', b'ccc\n', b'dddd\n']),
+            (['-e', '-n', 'r/8'], [b'a\n', b'bb\n', b'ccc\n', b'dddd\n', b'eeeee\n', b'f\n']),
+        )
+        for args, expected in cases:
+            result = self.runner.invoke(self.cli, ['split'] + args + ['small'])
+            self.assertEqual(result.exit_code, 0, args)
+            self.assertEqual(self.pieces(), expected, args)
+
+        for args, expected in ((['-n', '2/3'], 'c\ndddd\n'), (['-n', 'l/2/3'], 'dddd\n'), (['-n', 'r/1/4'], 'a\neeeee\n')):
+            result = self.runner.invoke(self.cli, ['split'] + args + ['small'])
+            self.assertEqual(result.exit_code, 0, args)
+            self.assertEqual(result.output, expected, args)
+
+        result = self.runner.invoke(self.cli, ['split', '-n', '2'], input=b'a\n')
+        self.assertEqual(result.exit_code, 1)
+        self.assertEqual(result.output, 'split: -: cannot determine file size\n')
+
+    def test_split_names(self):
+        result = self.runner.invoke(self.cli, ['split', '-l', '2', '-d', '-a', '3', 'small', 'part-'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(sorted(os.listdir('.')), ['part-000', 'part-001', 'part-002', 'small'])
+
+        result = self.runner.invoke(self.cli, ['split', '-l', '1', '-a', '1', '-d', 'small'], input=b'1\n' * 11)
+        self.assertEqual(result.exit_code, 0)
+        result = self.runner.invoke(self.cli, ['split', '-l', '1', '-a', '1', '-d'], input=b'1\n' * 11)
+        self.assertEqual(result.exit_code, 1)
+        self.assertEqual(result.output, 'split: output file suffixes exhausted\n')
+
+        self.assertEqual(len(list(suffixes('abc', 2))), 9)
+        names = list(itertools.islice(suffixes('abc', 1, widen=True), 9))
+        self.assertEqual(names, ['a', 'b', 'caa', 'cab', 'cac', 'cba', 'cbb', 'cbc', 'ccaaa'])
+
+    def test_split_filter(self):
+        result = self.runner.invoke(self.cli, ['split', '-l', '3', '--filter', 'cat > $FILE.out', 'small'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(sorted(os.listdir('.')), ['small', 'xaa.out', 'xab.out'])
+
+        result = self.runner.invoke(self.cli, ['split', '--filter', 'exit 3', 'small'])
+        self.assertEqual(result.exit_code, 1)
+        self.assertEqual(result.output, 'split: with FILE=xaa, exit 3 from command: exit 3\n')
+
+    def test_split_overwrite_input(self):
+        os.rename('small', 'xab')
+        result = self.runner.invoke(self.cli, ['split', '-l', '3', 'xab'])
+        self.assertEqual(result.exit_code, 1)
+        self.assertEqual(result.output, "split: 'xab' would overwrite input; aborting\n")
@@ -0,0 +1,32 @@
+from __future__ import unicode_literals
+
+from .base import PycoreutilsBaseTest
+
+
+class TestSum(PycoreutilsBaseTest):
+    def test_sum(self):
+        data = b''.join('{}\n'.format(i).encode('ascii') for i in range(1000))
+        cases = (
+            ([], '25694     3\n'),
+            (['-r'], '25694     3\n'),
+            (['-s'], '58487 6\n'),
+        )
+        for args, expected in cases:
+            result = self.runner.invoke(self.cli, ['sum'] + args, input=data[:3000])
+            self.assertEqual(result.exit_code, 0, args)
+            self.assertEqual(result.output, expected, args)
+
+    def test_sum_file(self):
+        with self.runner.isolated_filesystem():
+            with open('hello.txt', 'w') as f:
+                f.write('test')
+
+            result = self.runner.invoke(self.cli, ['sum', 'hello.txt'])
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(result.output, '16597     1 hello.txt\n')
+
+            with open('checksum.txt', 'w') as f:
+                f.write(result.output)
+            result = self.runner.invoke(self.cli, ['sum', '-c', 'checksum.txt'])
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(result.output, 'hello.txt: OK\n')
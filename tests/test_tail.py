@@ -0,0 +1,85 @@
+from __future__ import unicode_literals
+
+import io
+import os
+import sys
+
+from .base import PycoreutilsBaseTest
+from pycoreutils.commands._tail.command import Follower, Output
+
+
+class TestTail(PycoreutilsBaseTest):
+    def test_tail(self):
+        data = ''.join('{}\n'.format(i) for i in range(1, 21)).encode('ascii')
+        result = self.runner.invoke(self.cli, ['tail'], input=data)
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, ''.join('{}\n'.format(i) for i in range(11, 21)))
+
+    def test_tail_options(self):
+        data = b'one\ntwo\nthree\nfour'
+        cases = (
+            (['-n', '2'], 'three\nfour'),
+            (['-n', '0'], ''),
+            (['-n', '10'], 'one\ntwo\nthree\nfour'),
+            (['-n', '+3'], 'three\nfour'),
+            (['-c', '5'], '\nfour'),
+            (['-c', '+5'], 'two\nthree\nfour'),
+        )
+        for args, expected in cases:
+            result = self.runner.invoke(self.cli, ['tail'] + args, input=data)
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(result.output, expected, args)
+
+    def test_tail_seekable(self):
+        # Long enough to need several backwards reads
+        lines = ['{}'.format(i) * 1000 + '\n' for i in range(100)]
+        with self.runner.isolated_filesystem():
+            with open('a.txt', 'wb') as f:
+                f.write(''.join(lines).encode('ascii'))
+
+            for number in (0, 1, 10, 99, 100, 1000):
+                result = self.runner.invoke(self.cli, ['tail', '-n', str(number), 'a.txt'])
+                self.assertEqual(result.exit_code, 0)
+                self.assertEqual(result.output, ''.join(lines[len(lines) - number:] if number else []))
+
+            result = self.runner.invoke(self.cli, ['tail', '-n', '+50', 'a.txt'])
+            self.assertEqual(result.output, ''.join(lines[49:]))
+
+    def test_tail_follow_name(self):
+        with self.runner.isolated_filesystem():
+            with open('log', 'wb') as f:
+                f.write(b'one\n')
+
+            # The follower's diagnostics go to stderr, which isolation captures
+            with self.runner.isolation() as messages:
+                stream = io.BytesIO()
+                follower = Follower('log', 'log', Output(stream, headers=False), by_name=True, retry=True)
+                follower.open()
+                follower.fd.seek(0, os.SEEK_END)
+
+                with open('log', 'ab') as f:
+                    f.write(b'two\n')
+                self.assertTrue(follower.poll())
+
+                # Rotated, with a last line written to the old file
+                os.rename('log', 'log.1')
+                with open('log.1', 'ab') as f:
+                    f.write(b'three\n')
+                with open('log', 'wb') as f:
+                    f.write(b'four\n')
+                self.assertTrue(follower.poll())
+                self.assertFalse(follower.poll())
+
+                # Truncated in place
+                with open('log', 'wb') as f:
+                    f.write(b'5\n')
+                self.assertTrue(follower.poll())
+                follower.close()
+
+                sys.stderr.flush()
+
+            self.assertEqual(stream.getvalue(), b'two\nthree\nfour\n5\n')
+            self.assertEqual(messages.getvalue(), (
+                b"tail: 'log' has been replaced;  following new file\n"
+                b'tail: log: file truncated\n'
+            ))
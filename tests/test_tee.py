@@ -1,10 +1,103 @@
 from __future__ import unicode_literals
 
+import os
+import subprocess
+import sys
+import unittest
+
 from .base import PycoreutilsBaseTest
 
 
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
 class TestTee(PycoreutilsBaseTest):
     def test_tee(self):
         result = self.runner.invoke(self.cli, ['tee'], input=b'test')
         self.assertEqual(result.exit_code, 0)
         self.assertEqual(result.output, 'test')
+
+    def test_tee_files(self):
+        data = b'test\n' * 100000
+        with self.runner.isolated_filesystem():
+            with open('existing.txt', 'wb') as f:
+                f.write(b'existing\n')
+
+            result = self.runner.invoke(self.cli, ['tee', '--buffer-size', '1000', 'new.txt', 'existing.txt'], input=data)
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(result.output, data.decode('ascii'))
+            for filename in ('new.txt', 'existing.txt'):
+                with open(filename, 'rb') as f:
+                    self.assertEqual(f.read(), data)
+
+            result = self.runner.invoke(self.cli, ['tee', '-a', 'existing.txt'], input=b'test')
+            self.assertEqual(result.exit_code, 0)
+            with open('existing.txt', 'rb') as f:
+                self.assertEqual(f.read(), data + b'test')
+
+    def test_tee_unwritable(self):
+        with self.runner.isolated_filesystem():
+            os.mkdir('directory')
+
+            result = self.runner.invoke(self.cli, ['tee', 'directory', 'file.txt'], input=b'test')
+            self.assertEqual(result.exit_code, 1)
+            self.assertTrue(result.output.startswith('tee: directory: '), result.output)
+            self.assertTrue(result.output.endswith('test'), result.output)
+            with open('file.txt', 'rb') as f:
+                self.assertEqual(f.read(), b'test')
+
+    @unittest.skipUnless(os.path.exists('/dev/full'), 'needs /dev/full')
+    def test_tee_output_error(self):
+        data = b'test\n' * 10000
+        with self.runner.isolated_filesystem():
+            # The other outputs still get everything
+            result = self.runner.invoke(self.cli, ['tee', '--output-error', 'warn', '--buffer-size', '1000', '/dev/full', 'file.txt'],
+                                        input=data)
+            self.assertEqual(result.exit_code, 1)
+            self.assertEqual(result.output.count('tee: /dev/full: No space left on device\n'), 1)
+            self.assertEqual(result.output.replace('tee: /dev/full: No space left on device\n', ''), data.decode('ascii'))
+            with open('file.txt', 'rb') as f:
+                self.assertEqual(f.read(), data)
+
+            # Writing stops, though whatever was already read may have been written
+            result = self.runner.invoke(self.cli, ['tee', '--output-error', 'exit', '--buffer-size', '1000', '/dev/full', 'file.txt'],
+                                        input=data)
+            self.assertEqual(result.exit_code, 1)
+            self.assertEqual(result.output.count('tee: /dev/full: No space left on device\n'), 1)
+            self.assertEqual(result.output.count('tee: '), 1)
+            with open('file.txt', 'rb') as f:
+                self.assertTrue(data.startswith(f.read()))
+
+        result = self.runner.invoke(self.cli, ['tee', '--output-error', 'invalid'], input=b'test')
+        self.assertEqual(result.exit_code, 2)
+
+    def tee_to_closed_pipe(self, args, data):
+        # Standard output is a pipe that nobody reads from
+        read_fd, write_fd = os.pipe()
+        env = dict(os.environ, PYTHONPATH=ROOT)
+        process = subprocess.Popen(
+            [sys.executable, '-W', 'ignore', '-c', 'import pycoreutils; pycoreutils.cli()', 'tee'] + args,
+            stdin=subprocess.PIPE,
+            stdout=write_fd,
+            stderr=subprocess.PIPE,
+            env=env,
+        )
+        os.close(write_fd)
+        os.close(read_fd)
+        _, stderr = process.communicate(data)
+        return process.returncode, stderr
+
+    def test_tee_closed_pipe(self):
+        data = b'test\n' * 100000
+        with self.runner.isolated_filesystem():
+            # Like GNU tee, the pipe is given up on quietly and the file still gets everything
+            returncode, stderr = self.tee_to_closed_pipe(['-p', 'file.txt'], data)
+            self.assertEqual(returncode, 0)
+            self.assertEqual(stderr, b'')
+            with open('file.txt', 'rb') as f:
+                self.assertEqual(f.read(), data)
+
+            # Otherwise tee exits as if killed by SIGPIPE
+            returncode, stderr = self.tee_to_closed_pipe(['file.txt'], data)
+            self.assertEqual(returncode, 1)
+            self.assertEqual(stderr, b'')
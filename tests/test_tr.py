@@ -0,0 +1,42 @@
+from __future__ import unicode_literals
+
+from .base import PycoreutilsBaseTest
+from pycoreutils.commands._tr.command import Translator
+
+
+class TestTr(PycoreutilsBaseTest):
+    def test_tr(self):
+        result = self.runner.invoke(self.cli, ['tr', 'a-z', 'A-Z'], input=b'Hello, World!\n')
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, 'HELLO, WORLD!\n')
+
+    def test_tr_options(self):
+        data = b'aAbBc  cd\n\nHello  World\n'
+        cases = (
+            (['abcd', 'xy'], b'xAyBy  yy\n\nHello  Worly\n'),
+            (['-t', 'abcd', 'xy'], b'xAyBc  cd\n\nHello  World\n'),
+            (['aa', 'xy'], b'yAbBc  cd\n\nHello  World\n'),
+            (['a-f', '[x*2]y'], b'xAxBy  yy\n\nHyllo  Worly\n'),
+            (['[:upper:]', '[:lower:]'], b'aabbc  cd\n\nhello  world\n'),
+            (['-d', '[:lower:]'], b'AB  \n\nH  W\n'),
+            (['-d', '\\141-\\143[=d=]'], b'AB  \n\nHello  Worl\n'),
+            (['-s', ' \\n'], b'aAbBc cd\nHello World\n'),
+            (['-cs', '[:alpha:]', '\\n'], b'aAbBc\ncd\nHello\nWorld\n'),
+            (['-c', 'a-z', '_'], b'a_b_c__cd___ello___orld_'),
+            (['-ds', 'l', 'o'], b'aAbBc  cd\n\nHeo  Word\n'),
+        )
+        for args, expected in cases:
+            result = self.runner.invoke(self.cli, ['tr'] + args, input=data)
+            self.assertEqual(result.exit_code, 0, args)
+            self.assertEqual(result.output_bytes, expected, args)
+
+    def test_tr_invalid(self):
+        for args in (['a'], ['-d'], ['-ds', 'a'], ['-d', 'a', 'b'], ['z-a', 'b'], ['a', ''], ['a-z', '[:digit:]'], ['[a*]', 'b']):
+            result = self.runner.invoke(self.cli, ['tr'] + args, input=b'abc\n')
+            self.assertEqual(result.exit_code, 2, args)
+
+    def test_translator_squeezes_across_blocks(self):
+        for squeeze in (b' ', b' abcdef'):
+            translator = Translator(squeeze=bytearray(squeeze))
+            blocks = [translator(block) for block in (b'a  ', b'  ', b'', b' b   c', b'cc  ')]
+            self.assertEqual(b''.join(blocks), b'a b c ' if len(squeeze) > 1 else b'a b ccc ')
@@ -0,0 +1,48 @@
+from __future__ import unicode_literals
+
+from .base import PycoreutilsBaseTest
+
+
+class TestUniq(PycoreutilsBaseTest):
+    def test_uniq(self):
+        result = self.runner.invoke(self.cli, ['uniq'], input=b'a\na\nb\na\na')
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, 'a\nb\na\n')
+
+    def test_uniq_options(self):
+        data = b'x apple\ny apple\ny Apple\nz banana\nz band\n'
+        cases = (
+            (['-c'], '      1 x apple\n      1 y apple\n      1 y Apple\n      1 z banana\n      1 z band\n'),
+            (['-f', '1'], 'x apple\ny Apple\nz banana\nz band\n'),
+            (['-f', '1', '-i', '-c'], '      3 x apple\n      1 z banana\n      1 z band\n'),
+            (['-s', '2', '-w', '3'], 'x apple\ny Apple\nz banana\n'),
+            (['-s', '2', '-w', '3', '-d'], 'x apple\nz banana\n'),
+            (['-s', '2', '-w', '3', '-u'], 'y Apple\n'),
+            (['-d', '-u'], ''),
+        )
+        for args, expected in cases:
+            result = self.runner.invoke(self.cli, ['uniq'] + args, input=data)
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(result.output, expected, args)
+
+    def test_uniq_unsorted(self):
+        data = b'b\na\nB\nb\nc\na\n'
+        cases = (
+            (['-c'], '      2 b\n      2 a\n      1 B\n      1 c\n'),
+            (['-c', '-i'], '      3 b\n      2 a\n      1 c\n'),
+            (['-d'], 'b\na\n'),
+            (['-u', '-i'], 'c\n'),
+        )
+        for args, expected in cases:
+            result = self.runner.invoke(self.cli, ['uniq', '--unsorted'] + args, input=data)
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(result.output, expected, args)
+
+    def test_uniq_files(self):
+        with self.runner.isolated_filesystem():
+            with open('input.txt', 'wb') as f:
+                f.write(b'a\na\nb\n')
+            result = self.runner.invoke(self.cli, ['uniq', 'input.txt', 'output.txt'])
+            self.assertEqual(result.exit_code, 0)
+            with open('output.txt', 'rb') as f:
+                self.assertEqual(f.read(), b'a\nb\n')
@@ -0,0 +1,53 @@
+from __future__ import unicode_literals
+
+import io
+
+from .base import PycoreutilsBaseTest
+from pycoreutils.commands._wc.command import count_file
+
+
+class TestWc(PycoreutilsBaseTest):
+    def test_wc(self):
+        result = self.runner.invoke(self.cli, ['wc'], input=b'hello world\nfoo\n')
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, '2 3 16\n')
+
+    def test_wc_words(self):
+        cases = (
+            (b'', 0),
+            (b'  one\ttwo\r\nthree  ', 3),
+            (b'a\x00 \x00b', 2),
+            (b'\x00\x01 \xff', 0),
+        )
+        for data, expected in cases:
+            result = self.runner.invoke(self.cli, ['wc', '-w'], input=data)
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(result.output, '{}\n'.format(expected))
+
+    def test_wc_block_boundaries(self):
+        data = b'one two\x00 three\n\n fo\x01ur  five\tsix\n'
+        expected = count_file(io.BytesIO(data))
+        self.assertEqual(expected, (3, 6, len(data)))
+        for block_size in (1, 2, 3, 5):
+            self.assertEqual(count_file(io.BytesIO(data), block_size=block_size), expected)
+
+    def test_wc_files(self):
+        with self.runner.isolated_filesystem():
+            with open('a.txt', 'wb') as f:
+                f.write(b'hello world\nfoo\n')
+            with open('b.txt', 'wb') as f:
+                f.write(b'x')
+
+            result = self.runner.invoke(self.cli, ['wc', '-l', 'a.txt'])
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(result.output, '2 a.txt\n')
+
+            expected = ' 2  3 16 a.txt\n 0  1  1 b.txt\n 2  4 17 total\n'
+            for args in ([], ['-j', '2']):
+                result = self.runner.invoke(self.cli, ['wc', 'a.txt', 'b.txt'] + args)
+                self.assertEqual(result.exit_code, 0)
+                self.assertEqual(result.output, expected)
+
+            result = self.runner.invoke(self.cli, ['wc', '-c', 'a.txt', 'missing.txt'])
+            self.assertEqual(result.exit_code, 1)
+            self.assertEqual(result.output, '16 a.txt\nwc: missing.txt: No such file or directory\n16 total\n')
@@ -0,0 +1,38 @@
+from __future__ import unicode_literals
+
+import os
+import subprocess
+import sys
+
+from .base import PycoreutilsBaseTest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestYes(PycoreutilsBaseTest):
+    def yes(self, args, size):
+        env = dict(os.environ, PYTHONPATH=ROOT)
+        process = subprocess.Popen(
+            # Warnings about other modules would otherwise end up on stderr
+            [sys.executable, '-W', 'ignore', '-c', 'import pycoreutils; pycoreutils.cli()', 'yes'] + args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+        )
+        output = process.stdout.read(size)
+        process.stdout.close()
+        stderr = process.stderr.read()
+        process.wait()
+        process.stderr.close()
+        return output, stderr
+
+    def test_yes(self):
+        output, stderr = self.yes([], 300000)
+        self.assertEqual(output, b'y\n' * 150000)
+        self.assertEqual(stderr, b'')
+
+    def test_yes_strings(self):
+        output, stderr = self.yes(['a', '-b', 'c'], 70000)
+        self.assertEqual(output, b'a -b c\n' * 10000)
+        self.assertEqual(stderr, b'')